@@ -0,0 +1,75 @@
+import copy
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from .utils.lru import TTLCache
+
+# Decoded access tokens, keyed by the raw token bytes
+_token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+# Authenticated users, keyed by str(user id)
+_user_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+
+
+def invalidate_cached_user(user_id):
+    """Forget a cached user so the next request reloads it."""
+    _user_cache.pop(str(user_id))
+
+
+def get_cached_user(user_id):
+    """
+    Return the active user with ``user_id``, or None if there is none.
+
+    Shares the cache used to authenticate requests, so checking a user on
+    token refresh usually costs no query. Inactive users are never cached:
+    a hit in ``get_user`` skips the ``is_active`` check.
+    """
+    user = _user_cache.get(str(user_id))
+    if user is None:
+        user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            return None
+        _user_cache.set(str(user_id), user)
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that remembers decoded tokens and loaded users.
+
+    Access tokens live for 15 minutes and user rows rarely change, so both
+    are kept in a short-TTL LRU. That saves the signature check and the
+    ``users`` primary-key query on every API call. Saving or deleting a
+    User drops its entry via a signal handler; AUTH_CACHE_TTL bounds how
+    long another worker may keep serving the old row.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = _token_cache.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            # Never keep a token past its own expiry
+            remaining = token.get('exp', 0) - time.time()
+            _token_cache.set(raw_token, token, ttl=remaining)
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = _user_cache.get(str(user_id))
+        if user is None:
+            user = super().get_user(validated_token)
+            _user_cache.set(str(user_id), user)
+        elif api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        # Views may modify request.user; never hand out the shared instance
+        return copy.copy(user)
@@ -0,0 +1,260 @@
+"""
+Cache backends used by the CACHES setting.
+
+Every backend here counts hits and misses per namespace (the alias's
+KEY_PREFIX) so cache effectiveness can be read from /health.
+
+``SQLiteCache`` is the default when no REDIS_URL is configured: one SQLite
+file in WAL mode shared by every worker process on the host, so
+throttles, version counters and the refresh revocation set agree across
+gunicorn workers without running Redis. Read-modify-write operations
+(``add``, ``incr``, ``gcra_acquire``) run inside ``BEGIN IMMEDIATE``
+transactions, which SQLite serializes across processes.
+"""
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+try:
+    from django.core.cache.backends.redis import RedisCache
+except ImportError:  # pragma: no cover - Django < 4.0
+    RedisCache = None
+
+_stats = defaultdict(Counter)
+_MISSING = object()
+
+
+def cache_stats():
+    """Per-namespace hit/miss counters for this process."""
+    result = {}
+    for namespace, counts in sorted(_stats.items()):
+        lookups = counts['hits'] + counts['misses']
+        result[namespace] = {
+            'hits': counts['hits'],
+            'misses': counts['misses'],
+            'hit_rate': round(counts['hits'] / lookups, 4) if lookups else None,
+        }
+    return result
+
+
+def reset_cache_stats():
+    _stats.clear()
+
+
+class CacheStatsMixin:
+    """Count hits and misses on ``get``/``get_many``, keyed by KEY_PREFIX."""
+
+    @property
+    def namespace(self):
+        return self.key_prefix or 'default'
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        counts = _stats[self.namespace]
+        if value is _MISSING:
+            counts['misses'] += 1
+            return default
+        counts['hits'] += 1
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = self._get_many_uncounted(keys, version)
+        counts = _stats[self.namespace]
+        counts['hits'] += len(found)
+        counts['misses'] += len(keys) - len(found)
+        return found
+
+    def _get_many_uncounted(self, keys, version):
+        return super().get_many(keys, version=version)
+
+
+class InstrumentedLocMemCache(CacheStatsMixin, LocMemCache):
+    """Per-process memory cache; only suitable for tests and single workers."""
+
+    def _get_many_uncounted(self, keys, version):
+        # BaseCache.get_many goes through self.get, which would count twice
+        found = {}
+        for key in keys:
+            value = LocMemCache.get(self, key, _MISSING, version=version)
+            if value is not _MISSING:
+                found[key] = value
+        return found
+
+
+if RedisCache is not None:
+    class InstrumentedRedisCache(CacheStatsMixin, RedisCache):
+        """Django's Redis backend with hit/miss counters."""
+
+
+class _SQLiteBackend(BaseCache):
+    """
+    Cache stored in a local SQLite file, shared by all processes on a host.
+
+    Each thread keeps its own connection (re-opened after a fork). Expired
+    rows are ignored on read and removed by an occasional cull on write,
+    which also trims the table back under MAX_ENTRIES.
+    """
+
+    # One write in this many triggers a cull
+    CULL_EVERY = 100
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(location))
+        os.makedirs(directory, exist_ok=True)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _write(self):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _live(expires, now=None):
+        return expires is None or expires > (time.time() if now is None else now)
+
+    def _fetch(self, conn, key):
+        row = conn.execute('SELECT value, expires FROM cache_entries WHERE key = ?', (key,)).fetchone()
+        if row is None or not self._live(row[1]):
+            return _MISSING
+        return pickle.loads(row[0])
+
+    @staticmethod
+    def _store(conn, key, value, expires):
+        conn.execute(
+            'INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires',
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires),
+        )
+
+    def _maybe_cull(self, conn):
+        if random.randrange(self.CULL_EVERY):
+            return
+        conn.execute('DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+        count = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count > self._max_entries:
+            # Drop the entries closest to expiry (persistent ones last)
+            excess = count - self._max_entries + self._max_entries // self._cull_frequency
+            conn.execute(
+                'DELETE FROM cache_entries WHERE key IN ('
+                'SELECT key FROM cache_entries ORDER BY expires IS NULL, expires LIMIT ?)',
+                (excess,),
+            )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            if self._fetch(conn, key) is not _MISSING:
+                return False
+            self._store(conn, key, value, self.get_backend_timeout(timeout))
+            self._maybe_cull(conn)
+        return True
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        value = self._fetch(self._connection(), key)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        made = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not made:
+            return {}
+        placeholders = ', '.join('?' * len(made))
+        rows = self._connection().execute(
+            f'SELECT key, value, expires FROM cache_entries WHERE key IN ({placeholders})',
+            list(made),
+        ).fetchall()
+        now = time.time()
+        return {made[key]: pickle.loads(value) for key, value, expires in rows if self._live(expires, now)}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            self._store(conn, key, value, self.get_backend_timeout(timeout))
+            self._maybe_cull(conn)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            updated = conn.execute(
+                'UPDATE cache_entries SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (self.get_backend_timeout(timeout), key, time.time()),
+            ).rowcount
+        return bool(updated)
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            deleted = conn.execute('DELETE FROM cache_entries WHERE key = ?', (key,)).rowcount
+        return bool(deleted)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._fetch(self._connection(), key) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            row = conn.execute('SELECT value, expires FROM cache_entries WHERE key = ?', (key,)).fetchone()
+            if row is None or not self._live(row[1]):
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            conn.execute(
+                'UPDATE cache_entries SET value = ? WHERE key = ?',
+                (pickle.dumps(value, pickle.HIGHEST_PROTOCOL), key),
+            )
+        return value
+
+    def clear(self):
+        with self._write() as conn:
+            conn.execute('DELETE FROM cache_entries')
+
+    def close(self, **kwargs):
+        # Connections are per thread and reused across requests
+        pass
+
+    def gcra_acquire(self, key, now, interval, window):
+        """Atomic GCRA step; see ``api.throttling.gcra_acquire``."""
+        key = self.make_and_validate_key(key)
+        with self._write() as conn:
+            tat = self._fetch(conn, key)
+            tat = now if tat is _MISSING else max(tat, now)
+            new_tat = tat + interval
+            if new_tat - now > window:
+                return False, new_tat - now - window
+            self._store(conn, key, new_tat, time.time() + (new_tat - now))
+        return True, 0.0
+
+
+class SQLiteCache(CacheStatsMixin, _SQLiteBackend):
+    """SQLite-file cache with hit/miss counters (the default backend)."""
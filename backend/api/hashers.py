@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 hasher whose cost parameters come from settings.
+
+    The algorithm name is unchanged, so hashes made by Django's stock
+    Argon2 hasher still verify. When the configured costs change,
+    ``must_update`` reports stored hashes as outdated and
+    ``User.check_password`` re-hashes them on the next successful login.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
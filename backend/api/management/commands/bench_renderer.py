@@ -0,0 +1,88 @@
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from django.core.management.base import BaseCommand, CommandError
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer as StockRenderer
+from api.renderers import CamelCaseJSONRenderer, orjson
+
+
+def course_row(i):
+    scraped = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=i)
+    return {
+        'id': str(uuid.uuid4()),
+        'title': f'Complete Python Bootcamp {i}: Go from zero to hero',
+        'provider_name': 'Udemy',
+        'provider_slug': 'udemy',
+        'url': f'https://www.udemy.com/course/complete-python-bootcamp-{i}/',
+        'price': f'{(i * 37) % 5000}.00' if i % 7 else None,
+        'currency': 'INR',
+        'rating': f'{(i % 50) / 10:.2f}',
+        'duration': f'{i % 40} hours',
+        'categories': ['python', 'programming', f'tag-{i % 13}'],
+        'thumbnail_url': f'https://img-c.udemycdn.com/course/240x135/{i}.jpg',
+        'description': 'Learn Python like a professional. Start from the basics and go all the way to creating your own applications.',
+        'scraped_at': scraped.isoformat().replace('+00:00', 'Z'),
+        'updated_at': scraped.isoformat().replace('+00:00', 'Z'),
+    }
+
+
+def expense_row(i):
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=i)
+    return {
+        'id': str(uuid.uuid4()),
+        'item_name': f'Item {i % 50}',
+        'amount': f'{(i * 13) % 9000}.50',
+        'currency': 'INR',
+        'category': 'Food & Drinks' if i % 2 else 'Transport',
+        'description': None if i % 3 else 'Lunch with the team',
+        'date': (date(2024, 1, 1) + timedelta(days=i % 365)).isoformat(),
+        'created_at': created.isoformat().replace('+00:00', 'Z'),
+        'updated_at': created.isoformat().replace('+00:00', 'Z'),
+    }
+
+
+# (label, payload) shaped like the real endpoints' responses
+PAYLOADS = [
+    ('courses (20)', lambda: {'courses': [course_row(i) for i in range(20)], 'total': 60, 'limit': 20, 'offset': 0}),
+    ('saved (100)', lambda: {'courses': [course_row(i) for i in range(100)], 'total': 100}),
+    ('expenses (500)', lambda: {'expenses': [expense_row(i) for i in range(500)], 'total': 123456.5, 'count': 500}),
+    ('expenses (5000)', lambda: {'expenses': [expense_row(i) for i in range(5000)], 'total': 9876543.25, 'count': 5000}),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare the stock and memoized camelCase JSON renderers on realistic payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Timed runs per payload; the median is reported (default: 20)')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        stock = StockRenderer()
+        fast = CamelCaseJSONRenderer()
+
+        self.stdout.write(f"orjson: {'yes' if orjson is not None else 'no (stdlib json)'}")
+        self.stdout.write(f"{'payload':<16} {'bytes':>9} {'stock ms':>9} {'new ms':>8} {'speedup':>8}")
+        for label, build in PAYLOADS:
+            data = build()
+            expected = stock.render(data)
+            if fast.render(data) != expected:
+                raise CommandError(f'{label}: output differs from the stock renderer')
+
+            stock_time = self.time(lambda: stock.render(data), repeat)
+            fast_time = self.time(lambda: fast.render(data), repeat)
+            self.stdout.write(
+                f'{label:<16} {len(expected):>9} {stock_time * 1000:>9.2f} {fast_time * 1000:>8.2f} '
+                f'{stock_time / fast_time:>7.1f}x'
+            )
+
+    @staticmethod
+    def time(func, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
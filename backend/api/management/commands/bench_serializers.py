@@ -0,0 +1,100 @@
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from api.models import Course, Expense, User
+from api.serializers import CourseSerializer, ExpenseSerializer, course_values, expense_values
+from api.utils.http_cache import render_json
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF ModelSerializer and values() serialization of course and expense lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000],
+                            help='List sizes to benchmark (default: 100 1000 10000)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per measurement; the median is reported (default: 5)')
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['rows'])
+        repeat = options['repeat']
+
+        # Fixture rows are created in a transaction that is always rolled back
+        try:
+            with transaction.atomic():
+                self.run(sizes, repeat)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, sizes, repeat):
+        largest = sizes[-1]
+        user = User.objects.create_user(email=f'bench-{uuid.uuid4().hex}@example.com', name='Bench')
+        now = timezone.now()
+        Course.objects.bulk_create([
+            Course(
+                title=f'Benchmark Course {i}', provider_name='Udemy', provider_slug='udemy',
+                url=f'https://example.com/bench/{i}', price=Decimal(i % 5000) / 3 if i % 7 else None,
+                currency='INR', rating=Decimal(i % 500) / 100, duration=f'{i % 40} hours',
+                categories=['python', 'programming', f'tag-{i % 13}'],
+                thumbnail_url=f'https://img.example.com/{i}.jpg',
+                description='Learn by building real projects. ' * 4,
+                source_hash=f'bench-{uuid.uuid4().hex}', scraped_at=now - timedelta(minutes=i),
+            )
+            for i in range(largest)
+        ], batch_size=1000)
+        Expense.objects.bulk_create([
+            Expense(
+                user=user, item_name=f'Item {i % 50}', amount=Decimal(i % 9000) / 7,
+                category='Food & Drinks' if i % 2 else 'Transport',
+                description=None if i % 3 else 'Lunch with the team',
+                date=date(2024, 1, 1) + timedelta(days=i % 365), created_at=now,
+            )
+            for i in range(largest)
+        ], batch_size=1000)
+
+        # Query + serialize is timed for each path; rendering the (identical)
+        # result to JSON is timed separately since both paths share it
+        self.stdout.write(
+            f"{'list':<8} {'rows':>7} {'drf ms':>10} {'values ms':>10} {'speedup':>8} {'render ms':>10}"
+        )
+        for size in sizes:
+            courses = Course.objects.order_by('-rating', '-scraped_at')[:size]
+            expenses = Expense.objects.filter(user=user)[:size]
+            for label, queryset, serializer_class, fast in (
+                ('courses', courses, CourseSerializer, course_values),
+                ('expenses', expenses, ExpenseSerializer, expense_values),
+            ):
+                slow_body = render_json(serializer_class(queryset, many=True).data)
+                fast_body = render_json(fast.serialize(queryset))
+                if slow_body != fast_body:
+                    raise CommandError(f'{label}: values() output differs from {serializer_class.__name__}')
+
+                # .all() gives each run a fresh queryset, so neither path
+                # benefits from the other's result cache
+                drf = self.time(lambda: serializer_class(queryset.all(), many=True).data, repeat)
+                values = self.time(lambda: fast.serialize(queryset.all()), repeat)
+                data = fast.serialize(queryset)
+                render = self.time(lambda: render_json(data), repeat)
+                self.stdout.write(
+                    f'{label:<8} {size:>7} {drf * 1000:>10.1f} {values * 1000:>10.1f} '
+                    f'{drf / values:>7.1f}x {render * 1000:>10.1f}'
+                )
+
+    @staticmethod
+    def time(func, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
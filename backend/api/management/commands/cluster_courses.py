@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from api.models import Course
+from api.utils.near_duplicates import assign_clusters, simhash
+from api.utils.response_cache import COURSES_VERSION
+from api.utils.versions import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Compute SimHash signatures and near-duplicate clusters for existing courses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Courses signed and clustered per transaction (default: 1000)')
+        parser.add_argument('--all', action='store_true',
+                            help='Recompute every course, not only those without a signature')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Course.objects.order_by('scraped_at', 'id')
+        if not options['all']:
+            queryset = queryset.filter(simhash__isnull=True)
+        started = time.perf_counter()
+
+        done = 0
+        clusters = set()
+        # Oldest first, so each cluster is named after its earliest listing
+        ids = list(queryset.values_list('id', flat=True))
+        for start in range(0, len(ids), batch_size):
+            with transaction.atomic():
+                courses = list(
+                    Course.objects.filter(id__in=ids[start:start + batch_size])
+                    .order_by('scraped_at', 'id')
+                    .only('id', 'title', 'description', 'simhash', 'cluster_id')
+                )
+                for course in courses:
+                    course.simhash = simhash(course.title, course.description)
+                Course.objects.bulk_update(courses, ['simhash'])
+                assign_clusters(courses)
+            done += len(courses)
+            clusters.update(course.cluster_id for course in courses)
+            self.stdout.write(f'Clustered {done}/{len(ids)} courses')
+
+        if done:
+            bump_version(COURSES_VERSION)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Signed {done} courses into {len(clusters)} clusters in {elapsed:.1f}s'
+            )
+        )
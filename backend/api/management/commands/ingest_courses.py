@@ -0,0 +1,42 @@
+import json
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from api.utils.ingest import CourseSink
+
+
+class Command(BaseCommand):
+    help = 'Upsert crawler output (JSON Lines, one course per line) into the courses table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSON Lines file written by crawler.py --output, or '-' for stdin")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Courses upserted per statement (default: 500)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        sink = CourseSink(batch_size=options['batch_size'])
+        started = time.perf_counter()
+
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        try:
+            for line_number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    sink.add(json.loads(line))
+                except (ValueError, KeyError) as e:
+                    raise CommandError(f'Line {line_number}: invalid course record ({e})')
+            sink.flush()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.perf_counter() - started
+        rate = (sink.written + sink.unchanged) / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Upserted {sink.written} courses in {sink.batches} batches ({rate:.0f} rows/s), '
+                f'{sink.unchanged} unchanged'
+            )
+        )
@@ -0,0 +1,47 @@
+import time
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.models import RefreshToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired refresh tokens in bounded batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows deleted per statement (default: 1000)')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Stop after this many batches (default: until done)')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches to ease lock pressure')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        max_batches = options['max_batches']
+        pause = options['pause']
+        cutoff = timezone.now()
+
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            # Walk the expires_at index oldest-first; each DELETE touches at
+            # most batch_size rows so locks and undo stay small
+            ids = list(
+                RefreshToken.objects.filter(expires_at__lt=cutoff)
+                .order_by('expires_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            count, _ = RefreshToken.objects.filter(id__in=ids).delete()
+            deleted += count
+            batches += 1
+            self.stdout.write(f'Batch {batches}: deleted {count} expired tokens')
+
+            if pause:
+                time.sleep(pause)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} expired refresh tokens in {batches} batches')
+        )
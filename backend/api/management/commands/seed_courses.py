@@ -1,8 +1,8 @@
 from django.core.management.base import BaseCommand
 from api.models import Course
+from api.utils.ingest import source_hash
 from decimal import Decimal
 from datetime import datetime
-import hashlib
 
 
 class Command(BaseCommand):
@@ -358,9 +358,6 @@ class Command(BaseCommand):
         # Create courses
         created_count = 0
         for course_data in courses_data:
-            # Generate source hash from URL
-            source_hash = hashlib.sha256(course_data['url'].encode()).hexdigest()
-            
             course = Course.objects.create(
                 title=course_data['title'],
                 provider_name=course_data['provider_name'],
@@ -373,7 +370,7 @@ class Command(BaseCommand):
                 thumbnail_url=course_data.get('thumbnail_url'),
                 description=course_data.get('description'),
                 categories=course_data.get('categories', []),
-                source_hash=source_hash,
+                source_hash=source_hash(course_data['provider_slug'], course_data['url']),
                 scraped_at=datetime.now()
             )
             created_count += 1
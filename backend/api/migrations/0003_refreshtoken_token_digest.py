@@ -0,0 +1,37 @@
+import hashlib
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def digest_existing_tokens(apps, schema_editor):
+    RefreshToken = apps.get_model('api', 'RefreshToken')
+    RefreshToken.objects.filter(expires_at__lt=timezone.now()).delete()
+    for token in RefreshToken.objects.only('id', 'token').iterator():
+        token.token_digest = hashlib.sha256(token.token.encode()).hexdigest()
+        token.save(update_fields=['token_digest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_remove_user_password_hash_alter_user_password'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refreshtoken',
+            name='token_digest',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(digest_existing_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='refreshtoken',
+            name='token',
+        ),
+        migrations.AlterField(
+            model_name='refreshtoken',
+            name='token_digest',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
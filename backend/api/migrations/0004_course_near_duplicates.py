@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_refreshtoken_token_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='cluster_id',
+            field=models.UUIDField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='simhash',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='CourseSimhashBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.IntegerField(db_index=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='simhash_buckets', to='api.course')),
+            ],
+            options={
+                'db_table': 'course_simhash_buckets',
+            },
+        ),
+    ]
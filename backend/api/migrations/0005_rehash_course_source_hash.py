@@ -0,0 +1,59 @@
+import hashlib
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def source_hash(provider_slug, url):
+    # Frozen copy of api.utils.ingest.source_hash
+    return hashlib.sha256(f'{provider_slug}_{url}'.encode()).hexdigest()
+
+
+def rehash_courses(apps, schema_editor):
+    """
+    Rewrite source_hash with the shared recipe, so crawls and ingests
+    upsert into existing rows instead of inserting a second copy.
+
+    Rows that map to the same new hash are one course stored twice (for
+    example seeded and crawled): the most recently updated row is kept, and
+    the others' saves and cluster memberships move to it before they are
+    deleted.
+    """
+    Course = apps.get_model('api', 'Course')
+    UserSavedCourse = apps.get_model('api', 'UserSavedCourse')
+
+    groups = defaultdict(list)
+    courses = Course.objects.only('id', 'provider_slug', 'url', 'source_hash').order_by('-updated_at', '-id')
+    for course in courses.iterator():
+        groups[source_hash(course.provider_slug, course.url)].append(course)
+
+    changed = []
+    for new_hash, (keeper, *duplicates) in groups.items():
+        if duplicates:
+            duplicate_ids = [course.id for course in duplicates]
+            saved_by = set(UserSavedCourse.objects.filter(course_id=keeper.id).values_list('user_id', flat=True))
+            for saved in UserSavedCourse.objects.filter(course_id__in=duplicate_ids).order_by('added_at'):
+                if saved.user_id in saved_by:
+                    saved.delete()
+                else:
+                    saved.course_id = keeper.id
+                    saved.save(update_fields=['course'])
+                    saved_by.add(saved.user_id)
+            Course.objects.filter(cluster_id__in=duplicate_ids).update(cluster_id=keeper.id)
+            # Delete before renaming: a duplicate may already hold the new hash
+            Course.objects.filter(id__in=duplicate_ids).delete()
+        if keeper.source_hash != new_hash:
+            keeper.source_hash = new_hash
+            changed.append(keeper)
+    Course.objects.bulk_update(changed, ['source_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_course_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.RunPython(rehash_courses, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,4 @@
+import hashlib
 import uuid
 from decimal import Decimal
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
@@ -93,6 +94,10 @@ class Course(models.Model):
     thumbnail_url = models.URLField(max_length=1000, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     source_hash = models.CharField(max_length=64, unique=True)
+    # SimHash of the normalized title and description (signed 64-bit), and
+    # the id of the near-duplicate cluster it belongs to; set at ingest
+    simhash = models.BigIntegerField(null=True, blank=True)
+    cluster_id = models.UUIDField(null=True, blank=True, db_index=True)
     scraped_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -108,6 +113,15 @@ class Course(models.Model):
         return self.title
 
 
+class CourseSimhashBucket(models.Model):
+    """LSH bucket of a course's SimHash: one row per band (see api.utils.near_duplicates)."""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='simhash_buckets')
+    key = models.IntegerField(db_index=True)
+
+    class Meta:
+        db_table = 'course_simhash_buckets'
+
+
 class UserSavedCourse(models.Model):
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_courses')
@@ -128,7 +142,8 @@ class UserSavedCourse(models.Model):
 
 class RefreshToken(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    token = models.CharField(max_length=500, unique=True, db_index=True)
+    # SHA-256 hex digest of the refresh JWT; the token itself is never stored
+    token_digest = models.CharField(max_length=64, unique=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='refresh_tokens')
     expires_at = models.DateTimeField()
     created_at = models.DateTimeField(default=timezone.now)
@@ -143,6 +158,10 @@ class RefreshToken(models.Model):
     def __str__(self):
         return f"{self.user.email} - Token"
 
+    @staticmethod
+    def digest(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
 
 class Expense(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
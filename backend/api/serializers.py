@@ -1,4 +1,8 @@
-from rest_framework import serializers
+import decimal
+from django.utils import timezone
+from djangorestframework_camel_case.util import camel_to_underscore
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from .models import User, Interest, UserInterest, Course, UserSavedCourse, Expense
 
 
@@ -11,7 +15,13 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'email', 'created_at']
     
     def get_interests(self, obj):
-        user_interests = UserInterest.objects.filter(user=obj).select_related('interest')
+        # Use prefetch_related('user_interests__interest') results when present
+        # so serializing many users doesn't cost a query per user
+        prefetched = getattr(obj, '_prefetched_objects_cache', {})
+        if 'user_interests' in prefetched:
+            user_interests = prefetched['user_interests']
+        else:
+            user_interests = UserInterest.objects.filter(user=obj).select_related('interest')
         return [InterestSerializer(ui.interest).data for ui in user_interests]
 
 
@@ -52,6 +62,151 @@ class ExpenseSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+def _decimal_converter(field):
+    """
+    DecimalField.to_representation with the quantize exponent and context
+    built once instead of on every value.
+    """
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or field.localize or not coerce_to_string:
+        return field.to_representation
+
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    rounding = field.rounding
+    context = decimal.Context(prec=field.max_digits or decimal.DefaultContext.prec)
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return '{:f}'.format(value.quantize(exponent, rounding=rounding, context=context))
+
+    return convert
+
+
+class _DateTimeConverter:
+    """
+    DateTimeField.to_representation for ISO 8601 output with the field's
+    timezone looked up once per list rather than once per value.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def bind(self):
+        field = self.field
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+            return field.to_representation
+
+        def convert(value):
+            if isinstance(value, str) or not timezone.is_aware(value):
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+
+        return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    return lambda value: value if isinstance(value, str) else value.isoformat()
+
+
+def _compile_field(field):
+    """Return a converter for one field's raw values, or None to pass through."""
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+        return str
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _DateTimeConverter(field)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field)
+    if isinstance(field, (serializers.CharField, serializers.JSONField)):
+        # Values already come back from the database as str / parsed JSON
+        return None
+    if isinstance(field, (serializers.IntegerField, serializers.BooleanField)):
+        return None
+    raise TypeError(f'{type(field).__name__} {field.field_name!r} has no values() fast path')
+
+
+class ValuesSerializer:
+    """
+    Render ``values()`` rows exactly as a ModelSerializer renders instances.
+
+    The serializer's fields are inspected once and reduced to a plan of
+    ``(output name, source column, converter)``, so a row costs one dict
+    build instead of model instantiation plus a field object call per
+    attribute. Only flat model fields are supported.
+    """
+
+    def __init__(self, serializer_class):
+        fields = [field for field in serializer_class().fields.values() if not field.write_only]
+        self.plan = [(field.field_name, field.source, _compile_field(field)) for field in fields]
+        self.field_names = tuple(name for name, _, _ in self.plan)
+        self._plans = {('', None): self.plan}
+
+    def parse_fields(self, raw):
+        """
+        Validate a ``?fields=`` value: comma separated, camelCase or
+        snake_case. Returns the names in serializer order, or None when no
+        fields were given. Raises ValueError listing unknown names.
+        """
+        requested = {camel_to_underscore(name.strip()) for name in (raw or '').split(',') if name.strip()}
+        if not requested:
+            return None
+        unknown = requested.difference(self.field_names)
+        if unknown:
+            raise ValueError(', '.join(sorted(unknown)))
+        return tuple(name for name in self.field_names if name in requested)
+
+    def _plan_for(self, prefix, fields):
+        plan = self._plans.get((prefix, fields))
+        if plan is None:
+            plan = [
+                (name, prefix + source, convert) for name, source, convert in self.plan
+                if fields is None or name in fields
+            ]
+            self._plans[(prefix, fields)] = plan
+        return plan
+
+    def values(self, queryset, prefix='', fields=None, extra=()):
+        """
+        Raw rows for ``queryset``, selecting only the columns behind
+        ``fields`` (all fields when None) plus any ``extra`` columns. With
+        ``prefix`` (e.g. ``'course__'``) the fields are read through a
+        relation of the queryset's model.
+        """
+        columns = [column for _, column, _ in self._plan_for(prefix, fields)]
+        return queryset.values(*columns, *extra)
+
+    def to_representation(self, rows, prefix='', fields=None):
+        plan = [
+            (name, column, convert.bind() if isinstance(convert, _DateTimeConverter) else convert)
+            for name, column, convert in self._plan_for(prefix, fields)
+        ]
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in plan:
+                value = row[column]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+    def serialize(self, queryset, prefix='', fields=None):
+        return self.to_representation(self.values(queryset, prefix, fields), prefix, fields)
+
+
+course_values = ValuesSerializer(CourseSerializer)
+expense_values = ValuesSerializer(ExpenseSerializer)
+
+
 class SignupSerializer(serializers.Serializer):
     name = serializers.CharField(min_length=2, max_length=100)
     email = serializers.EmailField()
@@ -0,0 +1,97 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .authentication import invalidate_cached_user
+from .models import Course, Expense, Interest, User, UserInterest, UserSavedCourse
+from .utils.response_cache import COURSES_VERSION, bump_user_generation
+from .utils.saved_courses import invalidate_saved_course_ids
+from .utils.typeahead import typeahead
+from .utils.versions import bump_version
+from .views.interests import INTERESTS_VERSION
+
+
+@receiver([post_save, post_delete], sender=Interest)
+def invalidate_interests_catalog(sender, **kwargs):
+    """Drop the cached public interests catalog whenever an interest changes."""
+    bump_version(INTERESTS_VERSION)
+
+
+@receiver(post_save, sender=Interest)
+def index_interest(sender, instance, **kwargs):
+    typeahead.interest_saved(instance)
+
+
+@receiver(post_save, sender=Course)
+def index_course(sender, instance, **kwargs):
+    typeahead.course_saved(instance)
+
+
+@receiver(post_delete, sender=Interest)
+def unindex_interest(sender, instance, **kwargs):
+    typeahead.item_deleted('interest', instance.pk)
+
+
+@receiver(post_delete, sender=Course)
+def unindex_course(sender, instance, **kwargs):
+    typeahead.item_deleted('course', instance.pk)
+
+
+@receiver(post_save, sender=UserInterest)
+def rank_interest_up(sender, instance, created, **kwargs):
+    if created:
+        typeahead.popularity_changed('interest', instance.interest_id, 1)
+
+
+@receiver(post_delete, sender=UserInterest)
+def rank_interest_down(sender, instance, **kwargs):
+    typeahead.popularity_changed('interest', instance.interest_id, -1)
+
+
+@receiver(post_save, sender=UserSavedCourse)
+def rank_course_up(sender, instance, created, **kwargs):
+    if created:
+        typeahead.popularity_changed('course', instance.course_id, 1)
+
+
+@receiver(post_delete, sender=UserSavedCourse)
+def rank_course_down(sender, instance, **kwargs):
+    typeahead.popularity_changed('course', instance.course_id, -1)
+
+
+@receiver(post_save, sender=Expense)
+def index_expense_item(sender, instance, created, **kwargs):
+    typeahead.expense_saved(instance, created)
+
+
+@receiver(post_delete, sender=Expense)
+def unindex_expense_item(sender, instance, **kwargs):
+    typeahead.expense_deleted(instance)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Expense)
+@receiver([post_save, post_delete], sender=UserSavedCourse)
+@receiver([post_save, post_delete], sender=UserInterest)
+def invalidate_user_responses(sender, instance, **kwargs):
+    """Retire the owner's cached /api/expenses, /api/courses/saved, /api/interests/me and /api/me."""
+    bump_user_generation(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_own_responses(sender, instance, **kwargs):
+    bump_user_generation(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_course_responses(sender, **kwargs):
+    """Saved-course lists embed course details, so any course edit retires them."""
+    bump_version(COURSES_VERSION)
+
+
+@receiver([post_save, post_delete], sender=UserSavedCourse)
+def invalidate_saved_ids(sender, instance, **kwargs):
+    """Keep the isSaved lookup set in step with saves and unsaves."""
+    invalidate_saved_course_ids(instance.user_id)
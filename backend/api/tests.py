@@ -1,4 +1,1156 @@
 # Django tests
-from django.test import TestCase
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import date
+from decimal import Decimal
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+from django.apps import apps
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.hashers import make_password
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from .models import Course, Expense, Interest, RefreshToken, User, UserInterest, UserSavedCourse
+from .authentication import _token_cache, _user_cache
+from .renderers import CamelCaseJSONRenderer
+from .cache_backends import InstrumentedLocMemCache, SQLiteCache, cache_stats, reset_cache_stats
+from .serializers import CourseSerializer, ExpenseSerializer, UserSerializer, course_values, expense_values
+from .throttling import AnonGCRAThrottle, gcra_acquire
+from .views import auth_async
+from .views.auth import generate_tokens_for_user
+from .utils.google_oauth import cache_lifetime, cert_cache
+from .utils.http_cache import render_json
+from .utils.ingest import CourseSink, source_hash
+from .utils.near_duplicates import distance, simhash
+from .utils.response_cache import COURSES_VERSION
+from .utils.versions import get_version
+from .utils.typeahead import PrefixIndex, TypeaheadService
 
-# Create your tests here.
+
+class InterestsCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        Interest.objects.create(name='Python', slug='python')
+        Interest.objects.create(name='Design', slug='design')
+
+    def test_catalog_is_served_without_database_after_first_hit(self):
+        with self.assertNumQueries(1):
+            first = self.client.get('/api/interests')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/interests')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual([i['name'] for i in json.loads(first.content)], ['Design', 'Python'])
+        self.assertIn('createdAt', json.loads(first.content)[0])
+        self.assertIn('max-age=', first['Cache-Control'])
+
+    def test_etag_revalidation_returns_not_modified(self):
+        etag = self.client.get('/api/interests')['ETag']
+        response = self.client.get('/api/interests', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_gzip_body_is_sent_when_accepted(self):
+        plain = self.client.get('/api/interests')
+        compressed = self.client.get('/api/interests', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+    def test_gzip_refused_with_zero_quality(self):
+        for header in ('gzip;q=0, br', 'br, gzip; q=0.0', '*;q=0', 'identity'):
+            response = self.client.get('/api/interests', HTTP_ACCEPT_ENCODING=header)
+            self.assertNotIn('Content-Encoding', response, header)
+        wildcard = self.client.get('/api/interests', HTTP_ACCEPT_ENCODING='br;q=1, *;q=0.5')
+        self.assertEqual(wildcard['Content-Encoding'], 'gzip')
+
+    def test_interest_write_invalidates_catalog(self):
+        etag = self.client.get('/api/interests')['ETag']
+        Interest.objects.create(name='Music', slug='music')
+
+        response = self.client.get('/api/interests', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Music', [i['name'] for i in json.loads(response.content)])
+
+
+class PrefixIndexTests(TestCase):
+    def test_matches_any_word_start_ranked_by_weight(self):
+        index = PrefixIndex()
+        index.set(('course', 1), 'React - The Complete Guide', 2, 'course')
+        index.set(('course', 2), 'Complete Python Bootcamp', 5, 'course')
+        index.set(('course', 3), 'Compilers', 1, 'course')
+
+        self.assertEqual(
+            [text for text, _ in index.search('comp', 10)],
+            ['Complete Python Bootcamp', 'React - The Complete Guide', 'Compilers'],
+        )
+        self.assertEqual(index.search('the comp', 10), [('React - The Complete Guide', 'course')])
+
+    def test_rename_and_discard_update_keys(self):
+        index = PrefixIndex()
+        index.set(('interest', 1), 'Music', 1, 'interest')
+        index.set(('interest', 1), 'Photography', 1, 'interest')
+        self.assertEqual(index.search('mu', 5), [])
+        self.assertEqual(index.search('photo', 5), [('Photography', 'interest')])
+
+        index.discard(('interest', 1))
+        self.assertEqual(index.search('photo', 5), [])
+        self.assertEqual(len(index), 0)
+
+    def test_build_matches_incremental_inserts(self):
+        items = [
+            (('course', 1), 'Intro to Data Science', 3, 'course'),
+            (('course', 2), 'Data Structures', 4, 'course'),
+            (('interest', 1), 'Data', 1, 'interest'),
+        ]
+        built = PrefixIndex.build(items)
+        incremental = PrefixIndex()
+        for item in reversed(items):
+            incremental.set(*item)
+
+        for prefix in ('data', 'd', 'sci', 'intro to', 'x'):
+            self.assertEqual(built.search(prefix, 10), incremental.search(prefix, 10))
+        self.assertEqual(list(built._keys), sorted(built._keys, key=built._suffix))
+
+
+class TypeaheadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='ta@example.com', password='password123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Interest.objects.create(name='Python', slug='python')
+        Course.objects.create(
+            title='Python for Data Science', provider_name='Udemy', provider_slug='udemy',
+            url='https://example.com/py', source_hash='py-ds',
+        )
+
+    def _add_expense(self, item_name, user=None):
+        return Expense.objects.create(
+            user=user or self.user, item_name=item_name, amount=10, category='Food & Drinks', date='2024-01-01',
+        )
+
+    def test_suggestions_cover_interests_courses_and_own_expenses(self):
+        self._add_expense('Pizza')
+        self._add_expense('Pizza')
+        self._add_expense('Pens')
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        self._add_expense('Pie', user=other)
+
+        response = self.client.get('/api/typeahead', {'q': 'p'})
+        self.assertEqual(response.status_code, 200)
+        suggestions = response.json()['suggestions']
+        self.assertIn({'text': 'Python', 'type': 'interest'}, suggestions)
+        self.assertIn({'text': 'Python for Data Science', 'type': 'course'}, suggestions)
+        expense_texts = [s['text'] for s in suggestions if s['type'] == 'expense']
+        self.assertEqual(expense_texts, ['Pizza', 'Pens'])
+
+    def test_writes_update_index_without_rebuilding(self):
+        self.client.get('/api/typeahead', {'q': 'py'})
+        Interest.objects.create(name='Pytorch', slug='pytorch')
+        self._add_expense('Pyjamas')
+
+        # Both writes were patched into the in-memory indexes; nothing is rebuilt
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/typeahead', {'q': 'py', 'types': 'interests,expenses'})
+        texts = [s['text'] for s in response.json()['suggestions']]
+        self.assertIn('Pytorch', texts)
+        self.assertIn('Pyjamas', texts)
+
+    def test_popularity_reorders_interests(self):
+        pandas = Interest.objects.create(name='Pandas', slug='pandas')
+        self.client.get('/api/typeahead', {'q': 'p'})
+        UserInterest.objects.create(user=self.user, interest=pandas)
+
+        response = self.client.get('/api/typeahead', {'q': 'p', 'types': 'interests'})
+        self.assertEqual(response.json()['suggestions'][0]['text'], 'Pandas')
+
+    def test_popularity_change_keeps_the_index_current(self):
+        service = TypeaheadService()
+        index = service.global_index()
+        python = Interest.objects.get(slug='python')
+        version = get_version(TypeaheadService.GLOBAL_VERSION)
+
+        service.popularity_changed('interest', python.pk, 5)
+        self.assertEqual(get_version(TypeaheadService.GLOBAL_VERSION), version)
+        self.assertIs(service.global_index(), index)
+        self.assertEqual(index.weight(('interest', python.pk)), 6)
+
+    def test_popularity_is_refreshed_from_the_database(self):
+        service = TypeaheadService(popularity_ttl=0)
+        index = service.global_index()
+        python = Interest.objects.get(slug='python')
+        # Saved through another worker: this process never saw the change
+        UserInterest.objects.bulk_create([UserInterest(user=self.user, interest=python)])
+
+        self.assertIs(service.global_index(), index)
+        self.assertEqual(index.weight(('interest', python.pk)), 2)
+
+    def test_unknown_type_is_rejected(self):
+        response = self.client.get('/api/typeahead', {'q': 'p', 'types': 'videos'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_user_indexes_are_bounded(self):
+        service = TypeaheadService(max_users=2, max_user_items=10)
+        users = [User.objects.create_user(email=f'u{i}@example.com') for i in range(3)]
+        for user in users:
+            service.user_index(user.id)
+        self.assertEqual(list(service._users), [users[1].id, users[2].id])
+
+
+class BootstrapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='boot@example.com', password='password123', name='Boot')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        for name in ('Python', 'Design'):
+            interest = Interest.objects.create(name=name, slug=name.lower())
+            UserInterest.objects.create(user=self.user, interest=interest)
+        self.course = Course.objects.create(
+            title='Course', provider_name='Udemy', provider_slug='udemy',
+            url='https://example.com/c', source_hash='boot-course',
+        )
+        UserSavedCourse.objects.create(user=self.user, course=self.course)
+
+        today = timezone.localdate()
+        for amount, category in ((100, 'Food & Drinks'), (50, 'Food & Drinks'), (30, 'Transport')):
+            Expense.objects.create(user=self.user, item_name='x', amount=amount, category=category, date=today)
+        Expense.objects.create(user=self.user, item_name='old', amount=999, category='Shopping', date=date(2000, 1, 1))
+
+    def test_bootstrap_uses_fixed_query_count(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/bootstrap')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['profile']['email'], 'boot@example.com')
+        self.assertIn('budgetAmount', data['profile'])
+        self.assertEqual(sorted(i['name'] for i in data['interests']), ['Design', 'Python'])
+        self.assertEqual(data['savedCourseIds'], [str(self.course.id)])
+
+        summary = data['expenseSummary']
+        self.assertEqual(summary['total'], 180.0)
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(summary['byCategory'][0], {'category': 'Food & Drinks', 'total': 150.0, 'count': 2})
+
+    def test_query_count_does_not_grow_with_data(self):
+        for i in range(5):
+            course = Course.objects.create(
+                title=f'Course {i}', provider_name='Udemy', provider_slug='udemy',
+                url=f'https://example.com/{i}', source_hash=f'boot-{i}',
+            )
+            UserSavedCourse.objects.create(user=self.user, course=course)
+        with self.assertNumQueries(3):
+            self.client.get('/api/bootstrap')
+
+    def test_bootstrap_revalidates_by_etag(self):
+        etag = self.client.get('/api/bootstrap')['ETag']
+        self.assertEqual(self.client.get('/api/bootstrap', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Expense.objects.create(
+            user=self.user, item_name='y', amount=5, category='Transport', date=timezone.localdate(),
+        )
+        self.assertEqual(self.client.get('/api/bootstrap', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_user_serializer_uses_prefetched_interests(self):
+        other = User.objects.create_user(email='other@example.com')
+        UserInterest.objects.create(user=other, interest=Interest.objects.get(slug='python'))
+
+        users = User.objects.prefetch_related('user_interests__interest')
+        with self.assertNumQueries(3):
+            data = UserSerializer(users, many=True).data
+        self.assertEqual(len(data), 2)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='cached@example.com', password='password123', name='Cached')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.course = Course.objects.create(
+            title='Cached Course', provider_name='Udemy', provider_slug='udemy',
+            url='https://example.com/cached', source_hash='cached-course',
+        )
+        UserSavedCourse.objects.create(user=self.user, course=self.course)
+        Expense.objects.create(user=self.user, item_name='Tea', amount=10, category='Food & Drinks', date=date(2024, 1, 5))
+
+    def test_repeat_reads_skip_the_database(self):
+        for url in ('/api/expenses', '/api/courses/saved', '/api/interests/me', '/api/me'):
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.content, second.content)
+
+    def test_cached_body_matches_uncached_render(self):
+        response = self.client.get('/api/expenses')
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['expenses'][0]['itemName'], 'Tea')
+
+    def test_writes_bump_the_generation(self):
+        self.assertEqual(self.client.get('/api/expenses').json()['count'], 1)
+        Expense.objects.create(user=self.user, item_name='Bus', amount=20, category='Transport', date=date(2024, 1, 6))
+        self.assertEqual(self.client.get('/api/expenses').json()['count'], 2)
+
+        self.assertEqual(self.client.get('/api/courses/saved').json()['total'], 1)
+        self.course.title = 'Renamed'
+        self.course.save()
+        self.assertEqual(self.client.get('/api/courses/saved').json()['courses'][0]['title'], 'Renamed')
+        UserSavedCourse.objects.filter(user=self.user).delete()
+        self.assertEqual(self.client.get('/api/courses/saved').json()['total'], 0)
+
+        self.user.name = 'Renamed'
+        self.user.save()
+        self.assertEqual(self.client.get('/api/me').json()['name'], 'Renamed')
+
+    def test_query_string_is_normalized(self):
+        self.client.get('/api/expenses?category=Transport&startDate=2024-01-01')
+        with self.assertNumQueries(0):
+            self.client.get('/api/expenses?startDate=2024-01-01&category=Transport')
+        with self.assertNumQueries(2):
+            self.client.get('/api/expenses?category=Food+%26+Drinks')
+
+    def test_users_do_not_share_entries(self):
+        self.client.get('/api/expenses')
+        other = User.objects.create_user(email='other-cached@example.com')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get('/api/expenses').json()['count'], 0)
+
+
+class ValuesSerializerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='values@example.com', name='Values')
+        Course.objects.create(
+            title='Full', provider_name='Udemy', provider_slug='udemy', url='https://example.com/full',
+            price=Decimal('499.5'), currency='INR', rating=Decimal('4.7'), duration='3 hours',
+            categories=['python', 'data'], thumbnail_url='https://example.com/t.jpg',
+            description='All fields set', source_hash='values-full',
+        )
+        Course.objects.create(
+            title='Sparse', provider_name='Coursera', provider_slug='coursera',
+            url='https://example.com/sparse', source_hash='values-sparse',
+        )
+        Expense.objects.create(user=self.user, item_name='Tea', amount=Decimal('12.345'), category='Food & Drinks', date=date(2024, 2, 29))
+        Expense.objects.create(user=self.user, item_name='Bus', amount=7, category='Transport', description='Commute', date=date(2024, 3, 1))
+
+    def test_course_output_is_byte_identical(self):
+        queryset = Course.objects.order_by('title')
+        expected = render_json(CourseSerializer(queryset, many=True).data)
+        self.assertEqual(render_json(course_values.serialize(queryset)), expected)
+
+    def test_expense_output_is_byte_identical(self):
+        queryset = Expense.objects.filter(user=self.user)
+        expected = render_json(ExpenseSerializer(queryset, many=True).data)
+        self.assertEqual(render_json(expense_values.serialize(queryset)), expected)
+
+    def test_related_rows_via_prefix(self):
+        for course in Course.objects.order_by('title'):
+            UserSavedCourse.objects.create(user=self.user, course=course)
+        saved = UserSavedCourse.objects.filter(user=self.user).order_by('id')
+        expected = render_json(CourseSerializer([sc.course for sc in saved], many=True).data)
+        self.assertEqual(render_json(course_values.serialize(saved, prefix='course__')), expected)
+
+    def test_views_use_values_path(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        # user interests + one values() query for the candidates + the
+        # (cold) saved-id set
+        with self.assertNumQueries(3):
+            courses = client.get('/api/courses?limit=1').json()
+        self.assertEqual(courses['total'], 2)
+        self.assertEqual(courses['courses'][0]['title'], 'Full')
+        self.assertEqual(courses['courses'][0]['price'], '499.50')
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='sparse@example.com', name='Sparse')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        course = Course.objects.create(
+            title='Sparse Course', provider_name='Udemy', provider_slug='udemy', url='https://example.com/s',
+            price=Decimal('10'), rating=Decimal('4.5'), categories=['python'],
+            description='A long description', source_hash='sparse-course',
+        )
+        UserSavedCourse.objects.create(user=self.user, course=course)
+        Expense.objects.create(user=self.user, item_name='Tea', amount=5, category='Food & Drinks',
+                               description='Masala', date=date(2024, 1, 1))
+
+    def get_with_sql(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, ' '.join(query['sql'] for query in queries.captured_queries)
+
+    def test_courses_return_and_read_only_requested_fields(self):
+        response, sql = self.get_with_sql('/api/courses?fields=id,title,thumbnailUrl')
+        self.assertEqual(list(response.json()['courses'][0]), ['id', 'title', 'thumbnailUrl', 'isSaved'])
+        self.assertNotIn('"description"', sql)
+        # Scoring columns are still read
+        self.assertIn('"rating"', sql)
+
+    def test_saved_courses_and_expenses(self):
+        response, sql = self.get_with_sql('/api/courses/saved?fields=title,price')
+        self.assertEqual(response.json()['courses'], [{'title': 'Sparse Course', 'price': '10.00'}])
+        self.assertNotIn('"description"', sql)
+
+        response, sql = self.get_with_sql('/api/expenses?fields=item_name,amount')
+        self.assertEqual(response.json()['expenses'], [{'itemName': 'Tea', 'amount': '5.00'}])
+        self.assertEqual(response.json()['count'], 1)
+        self.assertNotIn('"description"', sql)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/courses?fields=title,sourceHash')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Unknown fields: source_hash')
+        self.assertEqual(self.client.get('/api/expenses?fields=user').status_code, 400)
+
+
+class SavedCoursesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='saver@example.com', name='Saver')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.courses = [
+            Course.objects.create(
+                title=f'Saved {i}', provider_name='Udemy', provider_slug='udemy',
+                url=f'https://example.com/saved/{i}', rating=Decimal(i), source_hash=f'saved-{i}',
+            )
+            for i in range(5)
+        ]
+
+    def saved_flags(self):
+        return {c['title']: c['isSaved'] for c in self.client.get('/api/courses').json()['courses']}
+
+    def test_is_saved_flag_uses_cached_set(self):
+        self.client.post('/api/courses/save', {'courseId': str(self.courses[0].id)}, format='json')
+        self.assertTrue(self.saved_flags()['Saved 0'])
+        self.assertFalse(self.saved_flags()['Saved 1'])
+
+        # Warm: interests + candidates only
+        with self.assertNumQueries(2):
+            self.client.get('/api/courses')
+
+        self.client.delete(f'/api/courses/save/{self.courses[0].id}')
+        self.assertFalse(self.saved_flags()['Saved 0'])
+
+    def test_save_is_idempotent(self):
+        url = '/api/courses/save'
+        self.assertEqual(self.client.post(url, {'courseId': str(self.courses[0].id)}, format='json').json()['message'],
+                         'Course saved successfully')
+        self.assertEqual(self.client.post(url, {'courseId': str(self.courses[0].id)}, format='json').json()['message'],
+                         'Course already saved')
+        self.assertEqual(UserSavedCourse.objects.filter(user=self.user).count(), 1)
+
+    def test_cursor_pagination(self):
+        start = timezone.now()
+        for i, course in enumerate(self.courses):
+            UserSavedCourse.objects.create(user=self.user, course=course, added_at=start + timedelta(seconds=i))
+
+        titles = []
+        url = '/api/courses/saved?limit=2&fields=title'
+        while url:
+            page = self.client.get(url).json()
+            self.assertEqual(page['total'], 5)
+            self.assertLessEqual(len(page['courses']), 2)
+            titles.extend(c['title'] for c in page['courses'])
+            url = page['nextCursor'] and f"/api/courses/saved?limit=2&fields=title&cursor={page['nextCursor']}"
+        self.assertEqual(titles, [f'Saved {i}' for i in reversed(range(5))])
+
+        self.assertEqual(self.client.get('/api/courses/saved?cursor=garbage').status_code, 400)
+
+    def test_bulk_save_and_unsave(self):
+        UserSavedCourse.objects.create(user=self.user, course=self.courses[0])
+        UserSavedCourse.objects.create(user=self.user, course=self.courses[1])
+        self.assertTrue(self.saved_flags()['Saved 0'])
+        missing = str(uuid.uuid4())
+
+        response = self.client.post('/api/courses/saved/bulk', {
+            'save': [str(self.courses[1].id), str(self.courses[2].id), missing],
+            'unsave': [str(self.courses[0].id)],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['saved'], [str(self.courses[2].id)])
+        self.assertEqual(body['unsaved'], [str(self.courses[0].id)])
+        self.assertEqual(body['notFound'], [missing])
+
+        saved = set(UserSavedCourse.objects.filter(user=self.user).values_list('course_id', flat=True))
+        self.assertEqual(saved, {self.courses[1].id, self.courses[2].id})
+        flags = self.saved_flags()
+        self.assertFalse(flags['Saved 0'])
+        self.assertTrue(flags['Saved 2'])
+        self.assertEqual(self.client.get('/api/courses/saved').json()['total'], 2)
+
+    def test_bulk_rejects_bad_input(self):
+        course_id = str(self.courses[0].id)
+        bulk = '/api/courses/saved/bulk'
+        self.assertEqual(self.client.post(bulk, {'save': 'x'}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(bulk, {'save': ['not-a-uuid']}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(bulk, {'save': [course_id], 'unsave': [course_id]}, format='json').status_code, 400)
+
+
+class CourseIngestTests(TestCase):
+    def record(self, i, **overrides):
+        record = {
+            'title': f'Crawled {i}', 'provider_name': 'Udemy', 'provider_slug': 'udemy',
+            'url': f'https://example.com/crawled/{i}', 'price': 499, 'currency': 'INR',
+            'rating': 4.5, 'categories': '["python"]',
+        }
+        record.update(overrides)
+        return record
+
+    def test_upserts_in_batches(self):
+        existing = Course.objects.create(
+            title='Old title', provider_name='Udemy', provider_slug='udemy',
+            url='https://example.com/crawled/0', price=Decimal('999'),
+            source_hash=source_hash('udemy', 'https://example.com/crawled/0'),
+        )
+        version = get_version(COURSES_VERSION)
+
+        sink = CourseSink(batch_size=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                sink.add(self.record(i))
+            sink.add(self.record(4, price=599))
+            sink.flush()
+
+        self.assertEqual(Course.objects.count(), 5)
+        self.assertEqual(sink.batches, 3)
+        existing.refresh_from_db()
+        self.assertEqual((existing.title, existing.price), ('Crawled 0', Decimal('499')))
+        self.assertEqual(Course.objects.get(url='https://example.com/crawled/4').price, Decimal('599'))
+        self.assertEqual(Course.objects.get(url='https://example.com/crawled/1').categories, ['python'])
+        self.assertGreater(get_version(COURSES_VERSION), version)
+
+    def test_unchanged_rows_are_not_rewritten(self):
+        sink = CourseSink()
+        sink.add(self.record(1))
+        sink.flush()
+        course = Course.objects.get()
+        version = get_version(COURSES_VERSION)
+
+        with self.assertNumQueries(1):
+            sink.add(self.record(1, duration='Only tracked fields count'))
+            sink.flush()
+        self.assertEqual((sink.written, sink.unchanged), (1, 1))
+        self.assertEqual(Course.objects.get().updated_at, course.updated_at)
+        self.assertEqual(get_version(COURSES_VERSION), version)
+
+    def test_description_change_is_written(self):
+        sink = CourseSink()
+        sink.add(self.record(1, description='Old blurb'))
+        sink.flush()
+        sink.add(self.record(1, description='New blurb'))
+        sink.flush()
+        self.assertEqual((sink.written, sink.unchanged), (2, 0))
+        course = Course.objects.get()
+        self.assertEqual(course.description, 'New blurb')
+        self.assertEqual(course.simhash, simhash('Crawled 1', 'New blurb'))
+
+    def test_migration_rehashes_existing_courses(self):
+        migration = importlib.import_module('api.migrations.0005_rehash_course_source_hash')
+        user = User.objects.create_user(email='saver@example.com', name='Saver')
+        url = 'https://example.com/crawled/1'
+        # Seeded under the old URL-only hash, then crawled again under the new one
+        seeded = Course.objects.create(title='Seeded', provider_name='Udemy', provider_slug='udemy', url=url,
+                                       source_hash=hashlib.sha256(url.encode()).hexdigest())
+        crawled = Course.objects.create(title='Crawled', provider_name='Udemy', provider_slug='udemy', url=url,
+                                        source_hash=source_hash('udemy', url))
+        other = Course.objects.create(title='Other', provider_name='Udemy', provider_slug='udemy',
+                                      url='https://example.com/crawled/2', source_hash='old-slug-hash',
+                                      cluster_id=seeded.id)
+        Course.objects.filter(id=seeded.id).update(updated_at=timezone.now() - timedelta(days=1))
+        UserSavedCourse.objects.create(user=user, course=seeded)
+        UserSavedCourse.objects.create(user=user, course=crawled)
+
+        migration.rehash_courses(apps, None)
+
+        self.assertEqual(set(Course.objects.values_list('id', flat=True)), {crawled.id, other.id})
+        other.refresh_from_db()
+        self.assertEqual(other.source_hash, source_hash('udemy', 'https://example.com/crawled/2'))
+        self.assertEqual(other.cluster_id, crawled.id)
+        self.assertEqual(list(UserSavedCourse.objects.values_list('course_id', flat=True)), [crawled.id])
+
+        sink = CourseSink()
+        sink.add(self.record(1))
+        sink.flush()
+        self.assertEqual(Course.objects.count(), 2)
+
+    def test_ingest_command(self):
+        path = os.path.join(tempfile.mkdtemp(), 'courses.jsonl')
+        with open(path, 'w') as f:
+            for i in range(3):
+                f.write(json.dumps(self.record(i)) + '\n')
+        out = StringIO()
+        call_command('ingest_courses', path, '--batch-size', '2', stdout=out)
+        self.assertIn('Upserted 3 courses in 2 batches', out.getvalue())
+        self.assertEqual(Course.objects.count(), 3)
+
+
+class NearDuplicateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='dupes@example.com', name='Dupes')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def ingest(self, *records):
+        sink = CourseSink()
+        for record in records:
+            sink.add(record)
+        sink.flush()
+
+    def record(self, provider_slug, url, title, description, rating=4.5):
+        return {
+            'title': title, 'description': description, 'provider_name': provider_slug.title(),
+            'provider_slug': provider_slug, 'url': url, 'rating': rating,
+        }
+
+    def test_simhash_distance(self):
+        original = simhash('Machine Learning A-Z: AI, Python & R', 'Learn to create ML algorithms in Python and R')
+        relisted = simhash('Machine Learning A-Z™: AI, Python & R (2024)', 'Learn to create ML algorithms in Python and R')
+        other = simhash('Java for Beginners', 'Learn Java programming from scratch')
+        self.assertLessEqual(distance(original, relisted), 3)
+        self.assertGreater(distance(original, other), 10)
+
+    def test_relistings_share_a_cluster_and_are_collapsed(self):
+        self.ingest(
+            self.record('udemy', 'https://www.udemy.com/course/web-bootcamp/',
+                        'The Complete 2024 Web Development Bootcamp', 'Become a full-stack web developer', 4.7),
+            self.record('java', 'https://example.com/java', 'Java for Beginners', 'Learn Java from scratch'),
+        )
+        # A later batch, from another provider
+        self.ingest(self.record('skillshare', 'https://www.skillshare.com/web-bootcamp-2025',
+                                'Web Development Bootcamp 2025', 'Become a full-stack web developer!', 4.0))
+
+        clusters = dict(Course.objects.values_list('provider_slug', 'cluster_id'))
+        udemy = Course.objects.get(provider_slug='udemy')
+        self.assertEqual(clusters['udemy'], udemy.id)
+        self.assertEqual(clusters['skillshare'], udemy.id)
+        self.assertNotEqual(clusters['java'], udemy.id)
+
+        titles = [c['title'] for c in self.client.get('/api/courses').json()['courses']]
+        self.assertEqual(sorted(titles), ['Java for Beginners', 'The Complete 2024 Web Development Bootcamp'])
+        response = self.client.get('/api/courses', {'duplicates': 'true'})
+        self.assertEqual(response.json()['total'], 3)
+
+    def test_large_cluster_does_not_shorten_the_page(self):
+        leader = None
+        for i in range(8):
+            course = Course.objects.create(
+                title=f'Relisting {i}', provider_name='Udemy', provider_slug='udemy', rating=Decimal('4.9'),
+                url=f'https://example.com/relisted/{i}', source_hash=f'relisted-{i}',
+            )
+            leader = leader or course
+            course.cluster_id = leader.id
+            course.save()
+        for i in range(3):
+            Course.objects.create(
+                title=f'Distinct {i}', provider_name='Udemy', provider_slug='udemy', rating=Decimal('4.0'),
+                url=f'https://example.com/distinct/{i}', source_hash=f'distinct-{i}',
+            )
+
+        page = self.client.get('/api/courses', {'limit': 2}).json()
+        self.assertEqual(len(page['courses']), 2)
+        self.assertEqual(page['total'], 4)
+        self.assertEqual(self.client.get('/api/courses', {'limit': 2, 'duplicates': 'true'}).json()['total'], 6)
+
+    def test_description_change_reclusters(self):
+        self.ingest(self.record('udemy', 'https://www.udemy.com/course/web-bootcamp/',
+                                'Web Development Bootcamp', 'Become a full-stack web developer'))
+        self.ingest(self.record('skillshare', 'https://www.skillshare.com/web-bootcamp',
+                                'Web Development Bootcamp', 'Become a full-stack web developer'))
+        udemy = Course.objects.get(provider_slug='udemy')
+        self.assertEqual(Course.objects.get(provider_slug='skillshare').cluster_id, udemy.id)
+
+        # Rewritten as a different course under the same URL
+        self.ingest(self.record('skillshare', 'https://www.skillshare.com/web-bootcamp',
+                                'Web Development Bootcamp',
+                                'Kubernetes operators, Helm charts, service meshes and cluster autoscaling '
+                                'for platform engineers running production workloads on several clouds, with '
+                                'hands-on labs covering observability, tracing, alerting, capacity planning, '
+                                'incident response, chaos testing and cost control across regions'))
+        skillshare = Course.objects.get(provider_slug='skillshare')
+        self.assertGreater(distance(skillshare.simhash, udemy.simhash), 3)
+        self.assertEqual(skillshare.cluster_id, skillshare.id)
+
+    def test_cluster_courses_command(self):
+        for i, title in enumerate(['Python for Beginners', 'Python for Beginners 2024', 'Java for Beginners']):
+            Course.objects.create(
+                title=title, description='Learn programming from scratch', provider_name='Udemy',
+                provider_slug='udemy', url=f'https://example.com/c/{i}', source_hash=f'cluster-{i}',
+                scraped_at=timezone.now() + timedelta(seconds=i),
+            )
+        call_command('cluster_courses', stdout=StringIO())
+        clusters = dict(Course.objects.values_list('title', 'cluster_id'))
+        self.assertEqual(clusters['Python for Beginners'], clusters['Python for Beginners 2024'])
+        self.assertNotEqual(clusters['Python for Beginners'], clusters['Java for Beginners'])
+
+
+class CamelCaseRendererTests(TestCase):
+    def assertSameAsStock(self, data, media_type=None):
+        from djangorestframework_camel_case.render import CamelCaseJSONRenderer as StockRenderer
+        self.assertEqual(
+            CamelCaseJSONRenderer().render(data, media_type),
+            StockRenderer().render(data, media_type),
+        )
+
+    def test_matches_stock_renderer(self):
+        from django.utils.translation import gettext_lazy
+        self.assertSameAsStock({
+            'user_id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'created_at': timezone.now().replace(microsecond=678901),
+            'date': date(2024, 2, 29),
+            'amount': Decimal('12.50'),
+            'total_2024': 0.1 + 0.2,
+            'nested_list': [{'item_name': 'Chai ☕', 'tags': ('a_b', 'c')}, None, True],
+            'line_sep': 'a\u2028b\u2029c',
+            'lazy_label': gettext_lazy('Hello'),
+            'a_1_b': {'_leading': 1, 'trailing_': 2, 'UPPER_CASE': 3},
+            'set_value': {1},
+        })
+
+    def test_falls_back_where_orjson_differs(self):
+        self.assertSameAsStock({'big_float': 1e16, 'small_float': 1e-05, 'big_int': 2 ** 70})
+        self.assertSameAsStock({1: 'int key', 'x_y': {None: 'none key'}})
+        self.assertSameAsStock({'decimal_exp': Decimal('1E+20')})
+        self.assertSameAsStock({'pretty_print': [1, 2]}, 'application/json; indent=4')
+        with self.assertRaises(ValueError):
+            CamelCaseJSONRenderer().render({'nan': float('nan')})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(CamelCaseJSONRenderer().render(None), b'')
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        _token_cache.clear()
+        _user_cache.clear()
+        self.user = User.objects.create_user(email='jwt@example.com', password='password123', name='Before')
+        self.client = APIClient()
+        tokens = generate_tokens_for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+
+    def test_repeat_requests_skip_user_lookup(self):
+        # users row + user_interests
+        with self.assertNumQueries(2):
+            self.client.get('/api/me')
+        # Neither the user nor the response needs the database again
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/me')
+        self.assertEqual(response.json()['email'], 'jwt@example.com')
+
+    def test_user_save_invalidates_cache(self):
+        self.client.get('/api/me')
+        User.objects.filter(pk=self.user.pk).update(name='Stale')
+        self.assertEqual(self.client.get('/api/me').json()['name'], 'Before')
+
+        self.user.name = 'After'
+        self.user.save()
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/me')
+        self.assertEqual(response.json()['name'], 'After')
+
+    def test_deactivated_user_is_rejected_after_save(self):
+        self.client.get('/api/me')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/me').status_code, 401)
+
+    def test_invalid_token_is_not_cached(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(self.client.get('/api/me').status_code, 401)
+        self.assertEqual(len(_token_cache), 0)
+
+
+class RefreshTokenStorageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='rt@example.com', password='password123')
+        self.client = APIClient()
+
+    def test_only_digest_is_stored_and_refresh_works(self):
+        tokens = generate_tokens_for_user(self.user)
+        stored = RefreshToken.objects.get(user=self.user)
+        self.assertEqual(len(stored.token_digest), 64)
+        self.assertEqual(stored.token_digest, RefreshToken.digest(tokens['refresh_token']))
+
+        response = self.client.post('/api/auth/refresh', {'refresh_token': tokens['refresh_token']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('accessToken', response.json())
+
+        self.client.post('/api/auth/logout', {'refresh_token': tokens['refresh_token']}, format='json')
+        self.assertFalse(RefreshToken.objects.filter(user=self.user).exists())
+
+    @override_settings(REFRESH_TOKENS_PER_USER=3)
+    def test_active_tokens_are_capped_per_user(self):
+        for _ in range(5):
+            generate_tokens_for_user(self.user)
+        self.assertEqual(RefreshToken.objects.filter(user=self.user).count(), 3)
+
+    def test_purge_command_deletes_expired_tokens_in_batches(self):
+        past = timezone.now() - timedelta(days=1)
+        for i in range(5):
+            RefreshToken.objects.create(token_digest=f'expired-{i}', user=self.user, expires_at=past)
+        RefreshToken.objects.create(
+            token_digest='live', user=self.user, expires_at=timezone.now() + timedelta(days=1),
+        )
+
+        out = StringIO()
+        call_command('purge_refresh_tokens', batch_size=2, stdout=out)
+
+        self.assertEqual(list(RefreshToken.objects.values_list('token_digest', flat=True)), ['live'])
+        self.assertIn('Deleted 5 expired refresh tokens in 3 batches', out.getvalue())
+
+
+@override_settings(REFRESH_TOKEN_STATELESS=True)
+class StatelessRefreshTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        _user_cache.clear()
+        self.user = User.objects.create_user(email='sr@example.com', password='password123')
+        self.client = APIClient()
+        self.tokens = generate_tokens_for_user(self.user)
+
+    def _refresh(self, token=None):
+        return self.client.post(
+            '/api/auth/refresh', {'refresh_token': token or self.tokens['refresh_token']}, format='json',
+        )
+
+    def test_database_is_read_only_while_cache_is_cold(self):
+        # The token row and the user
+        with self.assertNumQueries(2):
+            self.assertEqual(self._refresh().status_code, 200)
+        with self.assertNumQueries(0):
+            response = self._refresh()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('accessToken', response.json())
+
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(self._refresh().status_code, 200)
+
+    def test_deactivated_user_cannot_refresh(self):
+        self.assertEqual(self._refresh().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self._refresh().status_code, 401)
+        self.assertIsNone(_user_cache.get(str(self.user.pk)))
+
+    def test_logout_revokes_without_database_lookup(self):
+        self._refresh()
+        self.client.post('/api/auth/logout', {'refresh_token': self.tokens['refresh_token']}, format='json')
+        with self.assertNumQueries(0):
+            self.assertEqual(self._refresh().status_code, 401)
+
+    def test_revoked_token_stays_out_after_cache_loss(self):
+        self._refresh()
+        self.client.post('/api/auth/logout', {'refresh_token': self.tokens['refresh_token']}, format='json')
+        cache.clear()
+        self.assertEqual(self._refresh().status_code, 401)
+
+    @override_settings(REFRESH_TOKENS_PER_USER=1)
+    def test_pruned_tokens_are_revoked(self):
+        self._refresh()
+        generate_tokens_for_user(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._refresh().status_code, 401)
+
+    def test_bad_signature_is_rejected(self):
+        self.assertEqual(self._refresh(self.tokens['refresh_token'][:-2] + 'xx').status_code, 401)
+
+
+@override_settings(ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=1024, ARGON2_PARALLELISM=1)
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.factory = AsyncRequestFactory()
+
+    def _login(self):
+        return self.client.post(
+            '/api/auth/login', {'email': 'hash@example.com', 'password': 'password123'}, format='json',
+        )
+
+    def test_new_passwords_use_configured_argon2_costs(self):
+        user = User.objects.create_user(email='hash@example.com', password='password123')
+        self.assertTrue(user.password.startswith('argon2$argon2id$v=19$m=1024,t=1,p=1$'))
+
+    def test_login_rehashes_when_costs_change(self):
+        User.objects.create_user(email='hash@example.com', password='password123')
+        with self.settings(ARGON2_TIME_COST=2):
+            self.assertEqual(self._login().status_code, 200)
+        self.assertIn('t=2', User.objects.get(email='hash@example.com').password)
+
+    def test_login_upgrades_legacy_pbkdf2_hash(self):
+        User.objects.create(
+            email='hash@example.com',
+            password=make_password('password123', hasher='pbkdf2_sha256'),
+        )
+        self.assertEqual(self._login().status_code, 200)
+        self.assertTrue(User.objects.get(email='hash@example.com').password.startswith('argon2$'))
+
+    async def test_async_signup_and_login(self):
+        request = self.factory.post(
+            '/api/auth/signup',
+            {'name': 'Async', 'email': 'hash@example.com', 'password': 'password123'},
+            content_type='application/json',
+        )
+        response = await auth_async.signup(request)
+        self.assertEqual(response.status_code, 201)
+        user = await User.objects.aget(email='hash@example.com')
+        self.assertTrue(user.password.startswith('argon2$'))
+
+        request = self.factory.post(
+            '/api/auth/login', {'email': 'hash@example.com', 'password': 'wrong-password'},
+            content_type='application/json',
+        )
+        self.assertEqual((await auth_async.login(request)).status_code, 401)
+
+        request = self.factory.post(
+            '/api/auth/login', {'email': 'hash@example.com', 'password': 'password123'},
+            content_type='application/json',
+        )
+        response = await auth_async.login(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('accessToken', json.loads(response.content))
+
+    async def test_async_login_rehashes_when_costs_change(self):
+        await User.objects.acreate(email='hash@example.com', password=make_password('password123'))
+        with self.settings(ARGON2_MEMORY_COST=2048):
+            request = self.factory.post(
+                '/api/auth/login', {'email': 'hash@example.com', 'password': 'password123'},
+                content_type='application/json',
+            )
+            self.assertEqual((await auth_async.login(request)).status_code, 200)
+        user = await User.objects.aget(email='hash@example.com')
+        self.assertIn('m=2048', user.password)
+
+
+class GoogleStubHandler(BaseHTTPRequestHandler):
+    """Stands in for Google's token, userinfo and certs endpoints."""
+    hits = {}
+    token_delay = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except BrokenPipeError:
+            # The client gave up (read timeout test)
+            pass
+
+    def do_POST(self):
+        GoogleStubHandler.hits['token'] = GoogleStubHandler.hits.get('token', 0) + 1
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(GoogleStubHandler.token_delay)
+        self._send({'access_token': 'stub-access-token'})
+
+    def do_GET(self):
+        name = self.path.strip('/')
+        GoogleStubHandler.hits[name] = GoogleStubHandler.hits.get(name, 0) + 1
+        if name == 'userinfo':
+            self._send({'id': 'google-123', 'email': 'google@example.com', 'name': 'Google User'})
+        elif name == 'certs':
+            self._send({'key-1': 'cert'}, {'Cache-Control': 'public, max-age=600', 'Age': '100'})
+
+
+class GoogleOAuthTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), GoogleStubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{cls.server.server_port}'
+        cls.stub_settings = override_settings(
+            GOOGLE_TOKEN_URL=f'{base}/token',
+            GOOGLE_USERINFO_URL=f'{base}/userinfo',
+            GOOGLE_CERTS_URL=f'{base}/certs',
+            GOOGLE_HTTP_READ_TIMEOUT=0.5,
+        )
+        cls.stub_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stub_settings.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        cert_cache.clear()
+        GoogleStubHandler.hits = {}
+        GoogleStubHandler.token_delay = 0.0
+        self.client = APIClient()
+
+    def test_callback_creates_user_and_redirects_with_tokens(self):
+        response = self.client.get('/api/auth/google/callback', {'code': 'abc'})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/auth/callback?access=', response['Location'])
+        self.assertTrue(User.objects.filter(google_id='google-123', email='google@example.com').exists())
+
+    async def test_async_callback(self):
+        request = AsyncRequestFactory().get('/api/auth/google/callback', {'code': 'abc'})
+        response = await auth_async.google_callback(request)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('/auth/callback?access=', response['Location'])
+        self.assertTrue(await User.objects.filter(google_id='google-123').aexists())
+
+    def test_slow_token_endpoint_times_out(self):
+        GoogleStubHandler.token_delay = 1.0
+        response = self.client.get('/api/auth/google/callback', {'code': 'abc'})
+        self.assertIn('error=auth_failed', response['Location'])
+
+    def test_certs_are_cached_for_their_max_age(self):
+        self.assertEqual(cert_cache.get(), {'key-1': 'cert'})
+        cert_cache.get()
+        self.assertEqual(GoogleStubHandler.hits['certs'], 1)
+
+    def test_cache_lifetime_honors_cache_control(self):
+        self.assertEqual(cache_lifetime({'Cache-Control': 'public, max-age=600', 'Age': '100'}), 500)
+        self.assertEqual(cache_lifetime({'Cache-Control': 'no-store'}), 0)
+        self.assertEqual(cache_lifetime({}), 0)
+
+
+class GCRAThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_burst_then_steady_rate(self):
+        # 3 requests per 60s: burst of 3, then one every 20s
+        results = [gcra_acquire(cache, 'k', 1000.0, 20.0, 60.0)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+        allowed, retry_after = gcra_acquire(cache, 'k', 1000.0, 20.0, 60.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 20.0)
+
+        self.assertTrue(gcra_acquire(cache, 'k', 1020.0, 20.0, 60.0)[0])
+        self.assertFalse(gcra_acquire(cache, 'k', 1020.0, 20.0, 60.0)[0])
+
+    def test_state_is_a_single_number(self):
+        for _ in range(3):
+            gcra_acquire(cache, 'k', 1000.0, 20.0, 60.0)
+        self.assertEqual(cache.get('k'), 1060.0)
+
+    def test_throttle_reports_wait(self):
+        class ThreePerMinute(AnonGCRAThrottle):
+            rate = '3/m'
+
+        clock = [1000.0]
+        drf_request = Request(RequestFactory().get('/'))
+
+        def allow():
+            throttle = ThreePerMinute()
+            throttle.timer = lambda: clock[0]
+            return throttle.allow_request(drf_request, None), throttle.wait()
+
+        self.assertEqual([allow()[0] for _ in range(3)], [True, True, True])
+        allowed, wait = allow()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 20.0)
+
+
+class SQLiteCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, 'cache.sqlite3')
+        self.cache = SQLiteCache(self.path, {'KEY_PREFIX': 'test'})
+        reset_cache_stats()
+
+    def test_basic_operations(self):
+        self.assertIsNone(self.cache.get('missing'))
+        self.cache.set('a', {'x': 1})
+        self.assertEqual(self.cache.get('a'), {'x': 1})
+        self.assertFalse(self.cache.add('a', 2))
+        self.assertTrue(self.cache.add('b', 2))
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': {'x': 1}, 'b': 2})
+        self.assertEqual(self.cache.incr('b', 5), 7)
+        self.assertTrue(self.cache.delete('a'))
+        self.assertFalse(self.cache.has_key('a'))
+        with self.assertRaises(ValueError):
+            self.cache.incr('a')
+
+    def test_expired_entries_are_missing(self):
+        self.cache.set('a', 1, timeout=0)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertTrue(self.cache.add('a', 2))
+        self.assertEqual(self.cache.get('a'), 2)
+
+    def test_shared_between_instances_and_namespaced(self):
+        other_worker = SQLiteCache(self.path, {'KEY_PREFIX': 'test'})
+        other_namespace = SQLiteCache(self.path, {'KEY_PREFIX': 'other'})
+        self.cache.set('k', 'v')
+        self.assertEqual(other_worker.get('k'), 'v')
+        self.assertIsNone(other_namespace.get('k'))
+
+    def test_incr_is_atomic_across_connections(self):
+        self.cache.set('n', 0)
+
+        def worker():
+            for _ in range(50):
+                self.cache.incr('n')
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.get('n'), 200)
+
+    def test_gcra_acquire(self):
+        results = [gcra_acquire(self.cache, 'k', 1000.0, 20.0, 60.0)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_hit_miss_stats(self):
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.get('b')
+        self.cache.get_many(['a', 'b', 'c'])
+        self.assertEqual(cache_stats()['test'], {'hits': 2, 'misses': 3, 'hit_rate': 0.4})
+
+    def test_subsystem_aliases_do_not_collide(self):
+        caches['throttle'].set('shared', 'throttle')
+        caches['auth'].set('shared', 'auth')
+        self.assertEqual(caches['throttle'].get('shared'), 'throttle')
+        self.assertEqual(caches['auth'].get('shared'), 'auth')
+
+    def test_tests_never_use_the_configured_caches(self):
+        for alias in ('default', 'throttle', 'auth', 'versions', 'responses'):
+            self.assertIsInstance(caches[alias], InstrumentedLocMemCache)
+        self.assertEqual(caches['throttle'].key_prefix, 'throttle')
@@ -0,0 +1,99 @@
+import math
+import threading
+from django.core.cache import caches
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+try:
+    from django.core.cache.backends.redis import RedisCache
+except ImportError:  # pragma: no cover - Django < 4.0
+    RedisCache = None
+
+# Fallback for caches without an atomic primitive: serializes updates
+# within this process only
+_local_lock = threading.Lock()
+
+# KEYS[1] = throttle key; ARGV = now, emission interval, window (all ms)
+_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then tat = now end
+local new_tat = tat + interval
+if new_tat - now > window then
+    return {0, tostring(new_tat - now - window)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+return {1, '0'}
+"""
+
+
+def gcra_acquire(cache, key, now, interval, window):
+    """
+    Atomically try to admit one request under GCRA.
+
+    State is a single number per key: the theoretical arrival time (TAT)
+    of the next request. A request is admitted if, after adding one
+    emission ``interval``, the TAT stays within ``window`` of ``now``.
+    That allows bursts of up to window / interval requests and then a
+    steady rate of one per interval. All arguments are in seconds.
+    Returns ``(allowed, retry_after_seconds)``.
+    """
+    # Cache backends can provide their own atomic implementation
+    if hasattr(cache, 'gcra_acquire'):
+        return cache.gcra_acquire(key, now, interval, window)
+
+    if RedisCache is not None and isinstance(cache, RedisCache):
+        client = cache._cache.get_client(key, write=True)
+        allowed, retry_ms = client.eval(
+            _GCRA_SCRIPT, 1, cache.make_and_validate_key(key),
+            now * 1000, interval * 1000, window * 1000,
+        )
+        return bool(allowed), float(retry_ms) / 1000
+
+    with _local_lock:
+        tat = max(cache.get(key, now), now)
+        new_tat = tat + interval
+        if new_tat - now > window:
+            return False, new_tat - now - window
+        cache.set(key, new_tat, math.ceil(new_tat - now))
+        return True, 0.0
+
+
+class GCRAThrottleMixin:
+    """
+    Replace DRF's timestamp-list throttling with GCRA.
+
+    DRF's SimpleRateThrottle keeps a list of up to ``num_requests``
+    timestamps per client and re-pickles it on every request. GCRA keeps
+    one float per client and updates it atomically in the shared cache,
+    so each request costs the same at any rate and limits hold across
+    workers.
+    """
+
+    @property
+    def cache(self):
+        return caches['throttle']
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        interval = self.duration / self.num_requests
+        allowed, self.retry_after = gcra_acquire(self.cache, self.key, self.timer(), interval, self.duration)
+        return allowed
+
+    def wait(self):
+        return getattr(self, 'retry_after', None)
+
+
+class AnonGCRAThrottle(GCRAThrottleMixin, AnonRateThrottle):
+    """GCRA limit for anonymous requests, keyed by client IP ('anon' rate)."""
+
+
+class UserGCRAThrottle(GCRAThrottleMixin, UserRateThrottle):
+    """GCRA limit per user, or per IP when anonymous ('user' rate)."""
@@ -1,19 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from .views import auth, user, interests, courses, expenses
+from .views import auth, auth_async, bootstrap, user, interests, courses, expenses, typeahead
+
+# Under ASGI, login/signup/Google callback can run as async views that keep
+# password hashing and calls to Google off the request threads
+credential_views = auth_async if settings.ASYNC_AUTH_VIEWS else auth
 
 urlpatterns = [
     # Auth routes
-    path('auth/signup', auth.signup, name='signup'),
-    path('auth/login', auth.login, name='login'),
+    path('auth/signup', credential_views.signup, name='signup'),
+    path('auth/login', credential_views.login, name='login'),
     path('auth/refresh', auth.refresh_token, name='refresh_token'),
     path('auth/logout', auth.logout, name='logout'),
     path('auth/google', auth.google_auth, name='google_auth'),
-    path('auth/google/callback', auth.google_callback, name='google_callback'),
+    path('auth/google/callback', credential_views.google_callback, name='google_callback'),
     
     # User routes
     path('me', user.get_user, name='get_user'),
     path('me', user.update_user, name='update_user'),
     path('me/budget', user.update_budget, name='update_budget'),
+
+    # Dashboard load in one round trip
+    path('bootstrap', bootstrap.bootstrap, name='bootstrap'),
     
     # Interests routes
     path('interests', interests.get_interests, name='get_interests'),
@@ -24,10 +32,14 @@ urlpatterns = [
     path('courses', courses.get_courses, name='get_courses'),
     path('courses/save', courses.save_course, name='save_course'),
     path('courses/saved', courses.get_saved_courses, name='get_saved_courses'),
+    path('courses/saved/bulk', courses.bulk_save_courses, name='bulk_save_courses'),
     path('courses/save/<uuid:course_id>', courses.unsave_course, name='unsave_course'),
     
     # Expenses routes
     path('expenses', expenses.expenses, name='expenses'),
     path('expenses/<uuid:expense_id>', expenses.get_expense, name='get_expense'),
     path('expenses/<uuid:expense_id>', expenses.delete_expense, name='delete_expense'),
+
+    # Autocomplete
+    path('typeahead', typeahead.get_suggestions, name='typeahead'),
 ]
@@ -1,22 +1,124 @@
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+import re
+import threading
+import time
+import requests
+from google.auth import jwt as google_jwt
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
+_session = None
+_session_lock = threading.Lock()
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+def get_session():
+    """
+    Return the process-wide HTTP session used to talk to Google.
+
+    Reusing one pooled session keeps TLS connections to Google's endpoints
+    alive between logins instead of handshaking on every request.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=settings.GOOGLE_HTTP_POOL_SIZE,
+                    max_retries=1,
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def _timeout():
+    return (settings.GOOGLE_HTTP_CONNECT_TIMEOUT, settings.GOOGLE_HTTP_READ_TIMEOUT)
+
+
+def exchange_code(code, redirect_uri):
+    """Exchange an OAuth authorization code for Google tokens."""
+    response = get_session().post(settings.GOOGLE_TOKEN_URL, data={
+        'code': code,
+        'client_id': settings.GOOGLE_CLIENT_ID,
+        'client_secret': settings.GOOGLE_CLIENT_SECRET,
+        'redirect_uri': redirect_uri,
+        'grant_type': 'authorization_code',
+    }, timeout=_timeout())
+    return response.json()
+
+
+def fetch_user_info(access_token):
+    """Fetch the signed-in user's Google profile."""
+    response = get_session().get(
+        settings.GOOGLE_USERINFO_URL,
+        headers={'Authorization': f'Bearer {access_token}'},
+        timeout=_timeout(),
+    )
+    return response.json()
+
+
+def cache_lifetime(headers):
+    """Seconds a response may be reused according to Cache-Control and Age."""
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return 0
+    try:
+        age = int(headers.get('Age', '0'))
+    except ValueError:
+        age = 0
+    return max(int(match.group(1)) - age, 0)
+
+
+class CertCache:
+    """
+    Google's ID-token signing certificates, kept for as long as the certs
+    endpoint's Cache-Control allows (Google currently sends several hours).
+    """
+
+    def __init__(self, timer=time.monotonic):
+        self.timer = timer
+        self._certs = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._certs is not None and self.timer() < self._expires_at:
+                return self._certs
+
+            response = get_session().get(settings.GOOGLE_CERTS_URL, timeout=_timeout())
+            response.raise_for_status()
+            certs = response.json()
+            self._certs = certs
+            self._expires_at = self.timer() + cache_lifetime(response.headers)
+            return certs
+
+    def clear(self):
+        with self._lock:
+            self._certs = None
+            self._expires_at = 0.0
+
+
+cert_cache = CertCache()
+
 
 def verify_google_token(token):
     """
     Verify Google OAuth token and return user info.
     """
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            google_requests.Request(), 
-            settings.GOOGLE_CLIENT_ID
-        )
-        
+        idinfo = google_jwt.decode(token, certs=cert_cache.get(), audience=settings.GOOGLE_CLIENT_ID)
+
         if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
             raise ValueError('Wrong issuer.')
-        
+
         return {
             'google_id': idinfo['sub'],
             'email': idinfo['email'],
@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+from dataclasses import dataclass
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from rest_framework.settings import api_settings
+
+
+@dataclass(frozen=True)
+class PrecompressedPayload:
+    """
+    A rendered JSON body together with its gzip encoding and ETag.
+
+    Built once per data version so hot public endpoints can skip the ORM,
+    the serializers, the renderer and the compressor on every request.
+    """
+    body: bytes
+    gzip_body: bytes
+    etag: str
+
+
+def render_json(data):
+    """
+    Render data exactly as the default API renderer would.
+    """
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return renderer.render(data)
+
+
+def build_payload(data):
+    """
+    Render, compress and fingerprint a response body.
+    """
+    body = render_json(data)
+    return PrecompressedPayload(
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        # Weak validator: the identity and gzip bodies are equivalent
+        etag=f'W/"{hashlib.sha256(body).hexdigest()[:32]}"',
+    )
+
+
+def etag_matches(request, etag):
+    """
+    Check the request's If-None-Match header against an ETag.
+    """
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    opaque = etag.removeprefix('W/')
+    return any(candidate.strip().removeprefix('W/') == opaque for candidate in header.split(','))
+
+
+def accepts_gzip(request):
+    """
+    Check the request's Accept-Encoding header for gzip, honoring q-values.
+
+    ``gzip;q=0`` refuses gzip outright; a ``*`` entry covers gzip unless
+    gzip is listed explicitly.
+    """
+    qualities = {}
+    for entry in request.META.get('HTTP_ACCEPT_ENCODING', '').lower().split(','):
+        coding, _, params = entry.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding.strip():
+            qualities[coding.strip()] = quality
+    return qualities.get('gzip', qualities.get('x-gzip', qualities.get('*', 0.0))) > 0
+
+
+def payload_response(request, payload, cache_control):
+    """
+    Serve a precompressed payload, answering conditional requests with 304.
+    """
+    if etag_matches(request, payload.etag):
+        response = HttpResponseNotModified()
+    else:
+        if accepts_gzip(request):
+            response = HttpResponse(payload.gzip_body, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(payload.body, content_type='application/json')
+
+    response['ETag'] = payload.etag
+    response['Cache-Control'] = cache_control
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -0,0 +1,145 @@
+"""
+Bulk ingest of crawled courses.
+
+Records are buffered and written ``batch_size`` at a time with a single
+``bulk_create(update_conflicts=True)``, which Django turns into the
+database's native upsert (``ON CONFLICT`` on SQLite and Postgres,
+``ON DUPLICATE KEY`` on MySQL). bulk_create skips model signals, so the
+caches the Course signals would have invalidated are bumped once per batch
+instead.
+
+Rows whose title, description, price and rating already match the
+database are dropped before the upsert, so re-ingesting an unchanged crawl writes
+nothing and leaves ``updated_at`` alone.
+
+Each written course also gets a SimHash signature and is assigned to a
+near-duplicate cluster (see ``near_duplicates``) in the same transaction.
+"""
+import hashlib
+import json
+from decimal import Decimal
+from django.db import connections, transaction
+from django.utils import timezone
+from ..models import Course
+from .response_cache import COURSES_VERSION
+from .near_duplicates import assign_clusters, simhash
+from .typeahead import TypeaheadService
+from .versions import bump_version
+
+# Columns compared, and refreshed, when a crawled course already exists.
+# Title and description also feed the SimHash, so a change to either one
+# recomputes the signature and the cluster.
+TRACKED_FIELDS = ('title', 'description', 'price', 'rating')
+UPDATE_FIELDS = [*TRACKED_FIELDS, 'simhash', 'updated_at']
+
+
+def source_hash(provider_slug, url):
+    """
+    Deduplication key for a course. The crawler computes the same hash
+    (``CourseCrawler.generate_source_hash``), so crawled and seeded rows
+    for one course URL collide as intended.
+    """
+    return hashlib.sha256(f'{provider_slug}_{url}'.encode()).hexdigest()
+
+
+def _decimal(value):
+    return None if value is None else Decimal(str(value))
+
+
+def course_from_record(record):
+    """Build an unsaved Course from one crawler output record."""
+    categories = record.get('categories')
+    if isinstance(categories, str):
+        categories = json.loads(categories)
+    return Course(
+        simhash=simhash(record['title'], record.get('description')),
+        title=record['title'],
+        provider_name=record['provider_name'],
+        provider_slug=record['provider_slug'],
+        url=record['url'],
+        price=_decimal(record.get('price')),
+        currency=record.get('currency'),
+        rating=_decimal(record.get('rating')),
+        duration=record.get('duration'),
+        categories=categories,
+        thumbnail_url=record.get('thumbnail_url'),
+        description=record.get('description'),
+        source_hash=source_hash(record['provider_slug'], record['url']),
+        scraped_at=record.get('scraped_at') or timezone.now(),
+    )
+
+
+class CourseSink:
+    """
+    Buffer crawler records and upsert them into Course in batches.
+
+    Usage::
+
+        sink = CourseSink(batch_size=500)
+        for record in records:
+            sink.add(record)
+        sink.flush()
+    """
+
+    def __init__(self, batch_size=500, using='default'):
+        self.batch_size = max(1, batch_size)
+        self.using = using
+        self.buffer = []
+        self.written = 0
+        self.unchanged = 0
+        self.batches = 0
+
+    def add(self, record):
+        self.buffer.append(course_from_record(record))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        # One statement cannot upsert the same row twice; keep the last copy
+        courses = list({course.source_hash: course for course in self.buffer}.values())
+        self.buffer = []
+        courses = self._changed(courses)
+        if not courses:
+            return
+
+        options = {'update_conflicts': True, 'update_fields': UPDATE_FIELDS}
+        # MySQL upserts on any unique key and rejects an explicit target
+        if connections[self.using].features.supports_update_conflicts_with_target:
+            options['unique_fields'] = ['source_hash']
+
+        with transaction.atomic(using=self.using):
+            Course.objects.using(self.using).bulk_create(courses, **options)
+            # Rows that already existed keep their id, not the one generated here
+            ids = dict(
+                Course.objects.using(self.using)
+                .filter(source_hash__in=[course.source_hash for course in courses])
+                .values_list('source_hash', 'id')
+            )
+            for course in courses:
+                course.pk = ids[course.source_hash]
+                course._state.adding = False
+            assign_clusters(courses, using=self.using)
+            transaction.on_commit(self._invalidate, using=self.using)
+        self.written += len(courses)
+        self.batches += 1
+
+    def _changed(self, courses):
+        existing = {
+            row[0]: row[1:]
+            for row in Course.objects.using(self.using)
+            .filter(source_hash__in=[course.source_hash for course in courses])
+            .values_list('source_hash', *TRACKED_FIELDS)
+        }
+        changed = [
+            course for course in courses
+            if existing.get(course.source_hash) != tuple(getattr(course, name) for name in TRACKED_FIELDS)
+        ]
+        self.unchanged += len(courses) - len(changed)
+        return changed
+
+    @staticmethod
+    def _invalidate():
+        bump_version(COURSES_VERSION)
+        bump_version(TypeaheadService.GLOBAL_VERSION)
@@ -0,0 +1,133 @@
+"""
+Near-duplicate detection for courses.
+
+Each course gets a 64-bit SimHash of its normalized title and description.
+Re-listings of one course (a year added to the title, a reworded blurb, a
+different provider URL) land within a few bits of each other, while
+unrelated courses differ in about half of them.
+
+Candidates are found with an LSH bucket index instead of comparing against
+every course: the signature is split into ``BANDS`` bands, and each band
+value is one row in CourseSimhashBucket. Two signatures at most
+``MAX_DISTANCE`` bits apart (with ``MAX_DISTANCE < BANDS``) must agree on
+at least one band, so an indexed exact-match lookup on the bucket keys
+returns every possible match. Matching courses share a ``cluster_id``,
+which lets list endpoints collapse duplicates without comparing anything
+at query time.
+"""
+import hashlib
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from ..models import Course, CourseSimhashBucket
+
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+MAX_DISTANCE = 3
+
+# Title words say more about which course this is than the blurb does
+TITLE_WEIGHT = 6
+
+_MASK = (1 << SIMHASH_BITS) - 1
+_BAND_MASK = (1 << BAND_BITS) - 1
+_WORD = re.compile(r'[a-z0-9#+]+')
+# Words and years that vary between listings of the same course
+_NOISE = frozenset({
+    'a', 'an', 'and', 'the', 'of', 'to', 'for', 'in', 'on', 'with', 'from', 'your', 'you',
+    'course', 'complete', 'learn', 'new', 'updated',
+})
+_YEAR = re.compile(r'^(19|20)\d\d$')
+
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation; return the meaningful words."""
+    # Drop symbols first: NFKD would turn a trademark sign into the letters TM
+    text = ''.join(char for char in text or '' if unicodedata.category(char) != 'So')
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().lower()
+    return [word for word in _WORD.findall(text) if word not in _NOISE and not _YEAR.match(word)]
+
+
+def _features(title, description):
+    features = Counter()
+    words = normalize(title)
+    for word in words:
+        features[word] += TITLE_WEIGHT
+    for pair in zip(words, words[1:]):
+        features[' '.join(pair)] += TITLE_WEIGHT
+    for word in normalize(description):
+        features[word] += 1
+    return features
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'big')
+
+
+def simhash(title, description=None):
+    """Signed 64-bit SimHash (fits a BigIntegerField) of a course's text."""
+    weights = [0] * SIMHASH_BITS
+    for feature, weight in _features(title, description).items():
+        value = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+    signature = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            signature |= 1 << bit
+    return signature - (1 << SIMHASH_BITS) if signature >> (SIMHASH_BITS - 1) else signature
+
+
+def distance(a, b):
+    return ((a ^ b) & _MASK).bit_count()
+
+
+def bucket_keys(signature):
+    """One LSH key per band: the band number in the high bits, its value in the low."""
+    unsigned = signature & _MASK
+    return [band << BAND_BITS | (unsigned >> band * BAND_BITS) & _BAND_MASK for band in range(BANDS)]
+
+
+def assign_clusters(courses, using='default'):
+    """
+    Set ``cluster_id`` on saved courses (with ``simhash`` set) and index them.
+
+    Each course joins the cluster of its closest existing match within
+    MAX_DISTANCE bits (courses earlier in the list count as existing), or
+    starts a cluster of its own. Runs one candidate query for the whole
+    list, however long it is.
+    """
+    courses = [course for course in courses if course.simhash is not None]
+    if not courses:
+        return
+    course_ids = [course.pk for course in courses]
+    keys = {course.pk: bucket_keys(course.simhash) for course in courses}
+
+    index = defaultdict(list)
+    candidates = (
+        CourseSimhashBucket.objects.using(using)
+        .filter(key__in={key for course_keys in keys.values() for key in course_keys})
+        .exclude(course_id__in=course_ids)
+        .values_list('key', 'course_id', 'course__simhash', 'course__cluster_id')
+    )
+    for key, course_id, signature, cluster_id in candidates:
+        if signature is not None:
+            index[key].append((signature, cluster_id or course_id))
+
+    for course in courses:
+        best = None
+        for key in keys[course.pk]:
+            for signature, cluster_id in index[key]:
+                gap = distance(course.simhash, signature)
+                if gap <= MAX_DISTANCE and (best is None or gap < best[0]):
+                    best = (gap, cluster_id)
+        course.cluster_id = best[1] if best else course.pk
+        for key in keys[course.pk]:
+            index[key].append((course.simhash, course.cluster_id))
+
+    CourseSimhashBucket.objects.using(using).filter(course_id__in=course_ids).delete()
+    CourseSimhashBucket.objects.using(using).bulk_create([
+        CourseSimhashBucket(course_id=course.pk, key=key)
+        for course in courses for key in keys[course.pk]
+    ])
+    Course.objects.using(using).bulk_update(courses, ['cluster_id'])
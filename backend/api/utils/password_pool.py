@@ -0,0 +1,49 @@
+"""
+Bounded thread pool for password hashing in the async auth views.
+
+Argon2 is slow by design. Running it on a dedicated pool of
+PASSWORD_HASH_WORKERS threads means a burst of logins queues here instead
+of occupying the threads that serve every other endpoint.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix='password-hash',
+        )
+    return _executor
+
+
+def _check_and_maybe_rehash(raw_password, encoded):
+    """
+    Verify a password and, when the stored hash is outdated, compute its
+    replacement. Returns ``(valid, new_encoded_or_None)``.
+    """
+    if not check_password(raw_password, encoded):
+        return False, None
+    preferred = get_hasher()
+    try:
+        outdated = identify_hasher(encoded).algorithm != preferred.algorithm or preferred.must_update(encoded)
+    except ValueError:
+        outdated = True
+    return True, make_password(raw_password) if outdated else None
+
+
+async def acheck_password(raw_password, encoded):
+    """Async ``check_password`` that also returns an upgraded hash if needed."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), _check_and_maybe_rehash, raw_password, encoded)
+
+
+async def amake_password(raw_password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), make_password, raw_password)
@@ -0,0 +1,79 @@
+"""
+Refresh-token revocation set held in the shared cache.
+
+In stateless refresh mode a refresh token is accepted on its signature
+and expiry alone, provided its digest is not in the revocation set and it
+has been confirmed against the database once since the cache last came up.
+
+The cache can lose entries (restart, eviction), and a lost revocation
+would let a logged-out token back in. Every confirmation is therefore
+stamped with the current cache "epoch", a value created when the cache is
+first found cold. If the epoch disappears, every stamp is invalid and each
+token goes back through the database once.
+"""
+import time
+from django.core.cache import caches
+from django.utils import timezone
+
+EPOCH_KEY = 'refresh:epoch'
+
+
+def _cache():
+    return caches['auth']
+
+
+def _revoked_key(digest):
+    return f'refresh:revoked:{digest}'
+
+
+def _verified_key(digest):
+    return f'refresh:verified:{digest}'
+
+
+def _seconds_until(moment):
+    """Cache timeout covering the rest of a token's life, at least one second."""
+    return max(int((moment - timezone.now()).total_seconds()) + 1, 1)
+
+
+def current_epoch():
+    """Return the cache epoch, starting a new one if the cache is cold."""
+    cache = _cache()
+    epoch = cache.get(EPOCH_KEY)
+    if epoch is None:
+        cache.add(EPOCH_KEY, time.time_ns(), timeout=None)
+        epoch = cache.get(EPOCH_KEY)
+    return epoch
+
+
+def check(digest):
+    """
+    Return 'revoked', 'verified' or 'unknown' for a refresh token digest.
+    'unknown' means the caller must confirm the token against the database.
+    """
+    values = _cache().get_many([EPOCH_KEY, _revoked_key(digest), _verified_key(digest)])
+    if _revoked_key(digest) in values:
+        return 'revoked'
+    epoch = values.get(EPOCH_KEY)
+    if epoch is not None and values.get(_verified_key(digest)) == epoch:
+        return 'verified'
+    return 'unknown'
+
+
+def mark_verified(digest, expires_at, epoch):
+    """Record that the database vouched for this token during ``epoch``."""
+    _cache().set(_verified_key(digest), epoch, timeout=_seconds_until(expires_at))
+
+
+def revoke(digest, expires_at):
+    """Add a token to the revocation set until it would have expired anyway."""
+    cache = _cache()
+    cache.set(_revoked_key(digest), True, timeout=_seconds_until(expires_at))
+    cache.delete(_verified_key(digest))
+
+
+def revoke_many(tokens):
+    """Revoke each ``(digest, expires_at)`` pair that has not yet expired."""
+    now = timezone.now()
+    for digest, expires_at in tokens:
+        if expires_at > now:
+            revoke(digest, expires_at)
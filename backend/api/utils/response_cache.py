@@ -0,0 +1,71 @@
+"""
+Per-user cache of rendered GET responses.
+
+Entries are keyed by endpoint, user id, a hash of the normalized query
+string and the user's current generation number. Model signals bump the
+generation whenever something the user's responses are built from
+changes, so every older entry stops being addressable at once; nothing
+has to be deleted and a stale body can never be served. Endpoints that
+also render shared rows (course or interest details) list those datasets'
+versions in ``depends_on``.
+"""
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from .http_cache import build_payload, payload_response
+from .versions import bump_version, get_version
+
+COURSES_VERSION = 'courses'
+
+
+def _generation_name(user_id):
+    return f'responses:{user_id}'
+
+
+def bump_user_generation(user_id):
+    """Invalidate every cached response for one user."""
+    bump_version(_generation_name(user_id))
+
+
+def normalize_query(query_dict):
+    """Canonical form of a QueryDict: keys sorted, repeated values kept in order."""
+    return urlencode(sorted((key, values) for key, values in query_dict.lists()), doseq=True)
+
+
+def response_key(endpoint, user_id, query_dict, versions):
+    query_hash = hashlib.sha256(normalize_query(query_dict).encode()).hexdigest()[:32]
+    stamp = '.'.join(str(version) for version in versions)
+    return f'{endpoint}:{user_id}:{stamp}:{query_hash}'
+
+
+def cache_per_user(endpoint, depends_on=()):
+    """
+    Cache successful GET responses of a DRF view per user.
+
+    Apply below ``@api_view``. Only JSON responses are cached; the
+    browsable API and non-200 responses pass through untouched.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.accepted_renderer.format != 'json':
+                return view(request, *args, **kwargs)
+
+            user_id = request.user.pk
+            versions = [get_version(_generation_name(user_id))]
+            versions.extend(get_version(name) for name in depends_on)
+            key = response_key(endpoint, user_id, request.GET, versions)
+
+            cache = caches['responses']
+            payload = cache.get(key)
+            if payload is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                payload = build_payload(response.data)
+                cache.set(key, payload, settings.RESPONSE_CACHE_TTL)
+            return payload_response(request, payload, 'private, no-cache')
+        return wrapper
+    return decorator
@@ -0,0 +1,30 @@
+from django.core.cache import caches
+from ..models import UserSavedCourse
+from .versions import bump_version, get_version
+
+
+def _version_name(user_id):
+    return f'saved_courses:{user_id}'
+
+
+def saved_course_ids(user_id):
+    """
+    Return the ids (as strings) of every course the user has saved.
+
+    The set is cached under the user's saved-courses version, so one
+    lookup answers "is this saved?" for a whole course list.
+    """
+    cache = caches['responses']
+    key = f'saved_course_ids:{user_id}:{get_version(_version_name(user_id))}'
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(
+            str(course_id) for course_id in
+            UserSavedCourse.objects.filter(user_id=user_id).values_list('course_id', flat=True)
+        )
+        cache.set(key, ids)
+    return ids
+
+
+def invalidate_saved_course_ids(user_id):
+    bump_version(_version_name(user_id))
@@ -0,0 +1,376 @@
+import heapq
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from django.db.models import Count
+from ..models import Course, Expense, Interest
+from .versions import bump_version, get_version
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Casefold text and collapse punctuation/whitespace to single spaces."""
+    return ' '.join(_WORD_RE.findall(text.casefold()))
+
+
+class PrefixIndex:
+    """
+    Frequency-ranked prefix index over short strings.
+
+    Every entry is reachable from the start of each of its words, so
+    "comp" finds "React - The Complete Guide". An entry's normalized text
+    is stored once; the index itself is one sorted array of 64-bit ints,
+    each packing an entry slot with the offset of one of its words and
+    ordered by the text from that word on. A lookup is a bisect followed by
+    a contiguous scan. Weights live in a separate map, so reranking an
+    entry never touches the array.
+    """
+
+    _OFFSET_BITS = 16
+    _OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+
+    def __init__(self):
+        self._keys = array('q')
+        self._entries = {}    # slot -> [text, normalized text, kind, item_key]
+        self._weights = {}    # slot -> weight
+        self._by_item = {}    # item_key -> slot
+        self._next_slot = 0
+
+    @classmethod
+    def build(cls, items):
+        """Index ``(item_key, text, weight, kind)`` tuples with a single sort."""
+        index = cls()
+        keys = []
+        for item_key, text, weight, kind in items:
+            keys.extend(index._word_keys(index._add_entry(item_key, text, weight, kind)))
+        keys.sort(key=index._suffix)
+        index._keys = array('q', keys)
+        return index
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item_key):
+        return item_key in self._by_item
+
+    def _add_entry(self, item_key, text, weight, kind):
+        slot = self._next_slot
+        self._next_slot += 1
+        self._by_item[item_key] = slot
+        self._entries[slot] = [text, normalize(text)[:self._OFFSET_MASK], kind, item_key]
+        self._weights[slot] = weight
+        return slot
+
+    def _word_keys(self, slot):
+        normalized = self._entries[slot][1]
+        if not normalized:
+            return []
+        starts = [0] + [i + 1 for i, char in enumerate(normalized) if char == ' ']
+        return [slot << self._OFFSET_BITS | start for start in starts]
+
+    def _suffix(self, key):
+        return self._entries[key >> self._OFFSET_BITS][1][key & self._OFFSET_MASK:]
+
+    def _insert_keys(self, slot):
+        for key in self._word_keys(slot):
+            self._keys.insert(bisect_right(self._keys, self._suffix(key), key=self._suffix), key)
+
+    def _remove_keys(self, slot):
+        for key in self._word_keys(slot):
+            suffix = self._suffix(key)
+            pos = bisect_left(self._keys, suffix, key=self._suffix)
+            while pos < len(self._keys) and self._suffix(self._keys[pos]) == suffix:
+                if self._keys[pos] == key:
+                    del self._keys[pos]
+                    break
+                pos += 1
+
+    def set(self, item_key, text, weight, kind):
+        """Insert an entry, or replace its text and weight if present."""
+        slot = self._by_item.get(item_key)
+        if slot is None:
+            self._insert_keys(self._add_entry(item_key, text, weight, kind))
+            return
+
+        entry = self._entries[slot]
+        if entry[0] != text:
+            self._remove_keys(slot)
+            entry[0] = text
+            entry[1] = normalize(text)[:self._OFFSET_MASK]
+            self._insert_keys(slot)
+        entry[2] = kind
+        self._weights[slot] = weight
+
+    def weight(self, item_key):
+        slot = self._by_item.get(item_key)
+        return None if slot is None else self._weights[slot]
+
+    def set_weight(self, item_key, weight):
+        slot = self._by_item.get(item_key)
+        if slot is not None:
+            self._weights[slot] = weight
+
+    def adjust(self, item_key, delta):
+        """Change an entry's weight; returns the new weight, or None if absent."""
+        slot = self._by_item.get(item_key)
+        if slot is None:
+            return None
+        self._weights[slot] += delta
+        return self._weights[slot]
+
+    def discard(self, item_key):
+        slot = self._by_item.get(item_key)
+        if slot is None:
+            return
+        self._remove_keys(slot)
+        del self._by_item[item_key]
+        del self._entries[slot]
+        del self._weights[slot]
+
+    def discard_lightest(self):
+        """Drop the lowest-weight entry; used to keep an index within its bound."""
+        if self._entries:
+            slot = min(self._weights, key=self._weights.get)
+            self.discard(self._entries[slot][3])
+
+    def search(self, prefix, limit, kinds=None):
+        """Return up to ``limit`` (text, kind) pairs whose words start with prefix."""
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        matched = set()
+        pos = bisect_left(self._keys, prefix, key=self._suffix)
+        while pos < len(self._keys):
+            key = self._keys[pos]
+            slot = key >> self._OFFSET_BITS
+            if not self._entries[slot][1].startswith(prefix, key & self._OFFSET_MASK):
+                break
+            matched.add(slot)
+            pos += 1
+
+        if kinds is not None:
+            matched = [slot for slot in matched if self._entries[slot][2] in kinds]
+        best = heapq.nsmallest(
+            limit, matched,
+            key=lambda slot: (-self._weights[slot], len(self._entries[slot][0]), self._entries[slot][0]),
+        )
+        return [(self._entries[slot][0], self._entries[slot][2]) for slot in best]
+
+
+class _VersionedIndex:
+    __slots__ = ('version', 'index', 'refreshed')
+
+    def __init__(self, version, index):
+        self.version = version
+        self.index = index
+        self.refreshed = time.monotonic()
+
+
+class TypeaheadService:
+    """
+    Autocomplete over interest names, course titles and per-user expense items.
+
+    The global index covers interests (ranked by how many users picked them)
+    and courses (ranked by saves). Expense item names are indexed per user
+    (ranked by how often the user logged them) and held in an LRU, so memory
+    stays bounded by ``max_users * max_user_items`` entries.
+
+    Each index records the version it was built at. Writes bump the version
+    in the shared cache; when this process's copy was current it is patched
+    in place, otherwise another worker wrote in between and the index is
+    rebuilt on next use.
+
+    Popularity changes are the exception: they only reweight this process's
+    copy and never bump the version, so a save doesn't make every other
+    worker rebuild. Those workers pick the new counts up when their weights
+    are re-read from the database, at most every ``popularity_ttl`` seconds.
+    """
+
+    GLOBAL_VERSION = 'typeahead'
+
+    def __init__(self, max_users=1000, max_user_items=500, popularity_ttl=60):
+        self.max_users = max_users
+        self.max_user_items = max_user_items
+        self.popularity_ttl = popularity_ttl
+        self._lock = threading.Lock()
+        self._global = None
+        self._users = OrderedDict()
+
+    @staticmethod
+    def user_version_name(user_id):
+        return f'typeahead:{user_id}'
+
+    # Index construction
+
+    @staticmethod
+    def _global_rows():
+        interests = Interest.objects.annotate(popularity=Count('user_interests'))
+        for pk, name, popularity in interests.values_list('id', 'name', 'popularity'):
+            yield ('interest', pk), name, popularity + 1, 'interest'
+        courses = Course.objects.annotate(popularity=Count('saved_by_users'))
+        for pk, title, popularity in courses.values_list('id', 'title', 'popularity'):
+            yield ('course', pk), title, popularity + 1, 'course'
+
+    def _build_global(self):
+        return PrefixIndex.build(self._global_rows())
+
+    def _build_user(self, user_id):
+        rows = (
+            Expense.objects.filter(user_id=user_id)
+            .values('item_name')
+            .annotate(uses=Count('id'))
+            .order_by('-uses')[:self.max_user_items]
+        )
+        # Spellings of one item ("Coffee", "coffee") share an entry
+        items = {}
+        for row in rows:
+            item_key = ('expense', normalize(row['item_name']))
+            if item_key in items:
+                items[item_key][2] += row['uses']
+            else:
+                items[item_key] = [item_key, row['item_name'], row['uses'], 'expense']
+        return PrefixIndex.build(items.values())
+
+    def _refresh_popularity(self, current):
+        """Re-read popularity into ``current`` without touching its keys."""
+        weights = [(item_key, weight) for item_key, _, weight, _ in self._global_rows()]
+        with self._lock:
+            for item_key, weight in weights:
+                current.index.set_weight(item_key, weight)
+            current.refreshed = time.monotonic()
+
+    @staticmethod
+    def _add_expense_item(index, item_name, count):
+        item_key = ('expense', normalize(item_name))
+        if index.adjust(item_key, count) is None:
+            index.set(item_key, item_name, count, 'expense')
+
+    def global_index(self):
+        version = get_version(self.GLOBAL_VERSION)
+        current = self._global
+        if current is not None and current.version == version:
+            if time.monotonic() - current.refreshed >= self.popularity_ttl:
+                self._refresh_popularity(current)
+            return current.index
+
+        index = self._build_global()
+        with self._lock:
+            self._global = _VersionedIndex(version, index)
+        return index
+
+    def user_index(self, user_id):
+        version = get_version(self.user_version_name(user_id))
+        with self._lock:
+            current = self._users.get(user_id)
+            if current is not None and current.version == version:
+                self._users.move_to_end(user_id)
+                return current.index
+
+        index = self._build_user(user_id)
+        with self._lock:
+            self._users[user_id] = _VersionedIndex(version, index)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return index
+
+    def suggest(self, user_id, query, kinds, limit):
+        """Return ranked suggestions as dicts with ``text`` and ``type``."""
+        results = []
+        global_kinds = kinds & {'interest', 'course'}
+        if global_kinds:
+            index = self.global_index()
+            with self._lock:
+                results.extend(index.search(query, limit, global_kinds))
+        if 'expense' in kinds and user_id is not None:
+            index = self.user_index(user_id)
+            with self._lock:
+                results.extend(index.search(query, limit))
+
+        seen = set()
+        suggestions = []
+        for text, kind in results:
+            if (text, kind) not in seen:
+                seen.add((text, kind))
+                suggestions.append({'text': text, 'type': kind})
+        return suggestions[:limit]
+
+    # Incremental maintenance, called from model signals
+
+    def _patch(self, holder, version_name, mutate):
+        """
+        Bump a version and apply ``mutate`` to the index if it was current.
+        """
+        new_version = bump_version(version_name)
+        with self._lock:
+            current = holder()
+            if current is None:
+                return
+            if current.version == new_version - 1:
+                mutate(current.index)
+                current.version = new_version
+            # Otherwise leave it stale; the version check rebuilds it
+
+    def _patch_global(self, mutate):
+        self._patch(lambda: self._global, self.GLOBAL_VERSION, mutate)
+
+    def _patch_user(self, user_id, mutate):
+        self._patch(lambda: self._users.get(user_id), self.user_version_name(user_id), mutate)
+
+    def interest_saved(self, interest):
+        def mutate(index):
+            item_key = ('interest', interest.pk)
+            index.set(item_key, interest.name, index.weight(item_key) or 1, 'interest')
+        self._patch_global(mutate)
+
+    def course_saved(self, course):
+        def mutate(index):
+            item_key = ('course', course.pk)
+            index.set(item_key, course.title, index.weight(item_key) or 1, 'course')
+        self._patch_global(mutate)
+
+    def item_deleted(self, kind, pk):
+        self._patch_global(lambda index: index.discard((kind, pk)))
+
+    def popularity_changed(self, kind, pk, delta):
+        """Reweight this process's index in place; see the class docstring."""
+        with self._lock:
+            if self._global is not None:
+                self._global.index.adjust((kind, pk), delta)
+
+    def expense_saved(self, expense, created):
+        if not created:
+            # Edits may rename the item; rebuild rather than track the old name
+            bump_version(self.user_version_name(expense.user_id))
+            return
+
+        def mutate(index):
+            self._add_expense_item(index, expense.item_name, 1)
+            if len(index) > self.max_user_items:
+                index.discard_lightest()
+        self._patch_user(expense.user_id, mutate)
+
+    def expense_deleted(self, expense):
+        def mutate(index):
+            item_key = ('expense', normalize(expense.item_name))
+            remaining = index.adjust(item_key, -1)
+            if remaining is not None and remaining <= 0:
+                index.discard(item_key)
+        self._patch_user(expense.user_id, mutate)
+
+
+def _build_service():
+    from django.conf import settings
+    return TypeaheadService(
+        max_users=settings.TYPEAHEAD_MAX_USERS,
+        max_user_items=settings.TYPEAHEAD_MAX_USER_ITEMS,
+        popularity_ttl=settings.TYPEAHEAD_POPULARITY_TTL,
+    )
+
+
+typeahead = _build_service()
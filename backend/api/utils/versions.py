@@ -0,0 +1,36 @@
+import time
+from django.core.cache import caches
+
+
+def _version_key(name):
+    return f'version:{name}'
+
+
+def get_version(name):
+    """
+    Return the current version number for a cached dataset.
+
+    A missing key is seeded from the clock rather than 1, so an evicted
+    counter can never come back as a value some stale entry was built with.
+    """
+    cache = caches['versions']
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(name):
+    """
+    Invalidate every cached entry built from the given dataset.
+    """
+    cache = caches['versions']
+    key = _version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key was never seeded (or was evicted); start a fresh lineage
+        cache.set(key, time.time_ns(), timeout=None)
+        return cache.get(key)
@@ -2,7 +2,11 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken as JWTRefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from django.conf import settings
 from django.contrib.auth.hashers import check_password
 from django.utils import timezone
 from django.shortcuts import redirect
@@ -10,12 +14,13 @@ from datetime import timedelta
 from typing import Dict, Any
 import logging
 import os
-import requests
 from urllib.parse import urlencode
+from ..authentication import get_cached_user
 from ..models import User, RefreshToken as RefreshTokenModel
 from django.db import IntegrityError
 from ..serializers import SignupSerializer, LoginSerializer, RefreshTokenSerializer
-from ..utils.google_oauth import verify_google_token
+from ..utils import refresh_revocation
+from ..utils.google_oauth import exchange_code, fetch_user_info
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +29,14 @@ def generate_tokens_for_user(user: User) -> Dict[str, str]:
     """Generate access and refresh tokens for a user."""
     refresh = JWTRefreshToken.for_user(user)
     
-    # Store refresh token in database
+    # Store a digest of the refresh token in database
     try:
         RefreshTokenModel.objects.create(
-            token=str(refresh),
+            token_digest=RefreshTokenModel.digest(str(refresh)),
             user=user,
             expires_at=timezone.now() + timedelta(days=7)
         )
+        prune_refresh_tokens(user)
     except IntegrityError:
         # If a duplicate token happens (rare), ignore and proceed
         logger.warning("Duplicate refresh token detected; proceeding without DB insert")
@@ -47,6 +53,67 @@ def generate_tokens_for_user(user: User) -> Dict[str, str]:
     }
 
 
+def prune_refresh_tokens(user: User) -> None:
+    """Keep only the user's newest REFRESH_TOKENS_PER_USER refresh tokens."""
+    stale = list(
+        RefreshTokenModel.objects.filter(user=user)
+        .order_by('-created_at')
+        .values_list('id', 'token_digest', 'expires_at')[settings.REFRESH_TOKENS_PER_USER:]
+    )
+    if stale:
+        RefreshTokenModel.objects.filter(id__in=[row[0] for row in stale]).delete()
+        refresh_revocation.revoke_many([(digest, expires_at) for _, digest, expires_at in stale])
+
+
+def stateless_refresh(refresh_token_str: str) -> Response:
+    """
+    Issue an access token from the signed refresh token, the cached
+    revocation set and the cached user. The database is read only while
+    the caches are cold.
+    """
+    try:
+        refresh = JWTRefreshToken(refresh_token_str)
+    except TokenError:
+        return Response(
+            {'error': 'Invalid refresh token'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    digest = RefreshTokenModel.digest(refresh_token_str)
+    state = refresh_revocation.check(digest)
+
+    if state == 'revoked':
+        return Response(
+            {'error': 'Invalid refresh token'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    if state == 'unknown':
+        # Take the epoch before reading the database so a cache flush during
+        # the check can't leave a stamp on the new epoch
+        epoch = refresh_revocation.current_epoch()
+        if not RefreshTokenModel.objects.filter(token_digest=digest, expires_at__gt=timezone.now()).exists():
+            return Response(
+                {'error': 'Invalid refresh token'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        refresh_revocation.mark_verified(digest, datetime_from_epoch(refresh['exp']), epoch)
+
+    # Deactivated users keep valid refresh tokens; don't hand them new access
+    if get_cached_user(refresh[jwt_settings.USER_ID_CLAIM]) is None:
+        return Response(
+            {'error': 'Invalid refresh token'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    # Type assertion for Pylance - access_token is a valid attribute
+    access_token = str(refresh.access_token)  # type: ignore
+
+    return Response({
+        'accessToken': access_token,
+    })
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def signup(request):
@@ -183,9 +250,14 @@ def refresh_token(request):
     data: Dict[str, Any] = serializer.validated_data  # type: ignore
     refresh_token_str = data['refresh_token']
     
+    if settings.REFRESH_TOKEN_STATELESS:
+        return stateless_refresh(refresh_token_str)
+    
     # Verify token exists in database
     try:
-        token_obj = RefreshTokenModel.objects.select_related('user').get(token=refresh_token_str)
+        token_obj = RefreshTokenModel.objects.select_related('user').get(
+            token_digest=RefreshTokenModel.digest(refresh_token_str)
+        )
     except RefreshTokenModel.DoesNotExist:
         return Response(
             {'error': 'Invalid refresh token'},
@@ -237,11 +309,39 @@ def logout(request):
     refresh_token_str = data.get('refresh_token')
     
     if refresh_token_str:
-        RefreshTokenModel.objects.filter(token=refresh_token_str).delete()
+        digest = RefreshTokenModel.digest(refresh_token_str)
+        RefreshTokenModel.objects.filter(token_digest=digest).delete()
+        
+        # Record the revocation for stateless refresh; a token that doesn't
+        # decode can't be used to refresh anyway
+        try:
+            expires_at = datetime_from_epoch(JWTRefreshToken(refresh_token_str)['exp'])
+            refresh_revocation.revoke(digest, expires_at)
+        except TokenError:
+            pass
     
     return Response({'message': 'Logged out successfully'})
 
 
+def get_or_create_google_user(google_id: str, email: str, name: str) -> User:
+    """Find a user by Google id, then by email (linking the account), or create one."""
+    try:
+        return User.objects.get(google_id=google_id)
+    except User.DoesNotExist:
+        pass
+    
+    try:
+        # If no user with google_id, check if email exists
+        user = User.objects.get(email=email)
+        # Link the google account to existing user
+        user.google_id = google_id
+        user.save()
+        return user
+    except User.DoesNotExist:
+        # Create new user if neither google_id nor email exists
+        return User.objects.create(email=email, name=name, google_id=google_id)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def google_auth(request):
@@ -294,18 +394,9 @@ def google_callback(request):
     
     try:
         # Exchange code for tokens
-        google_client_id = os.getenv('GOOGLE_CLIENT_ID')
-        google_client_secret = os.getenv('GOOGLE_CLIENT_SECRET')
         google_callback_url = os.getenv('GOOGLE_CALLBACK_URL') or request.build_absolute_uri('/api/auth/google/callback')
         
-        token_response = requests.post('https://oauth2.googleapis.com/token', data={
-            'code': code,
-            'client_id': google_client_id,
-            'client_secret': google_client_secret,
-            'redirect_uri': google_callback_url,
-            'grant_type': 'authorization_code',
-        })
-        token_data: Dict[str, Any] = token_response.json()
+        token_data: Dict[str, Any] = exchange_code(code, google_callback_url)
         
         if 'error' in token_data:
             frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
@@ -318,11 +409,7 @@ def google_callback(request):
             frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
             return redirect(f"{frontend_url}/login?error=no_access_token")
         
-        user_info_response = requests.get(
-            'https://www.googleapis.com/oauth2/v2/userinfo',
-            headers={'Authorization': f'Bearer {access_token}'}
-        )
-        user_info: Dict[str, Any] = user_info_response.json()
+        user_info: Dict[str, Any] = fetch_user_info(access_token)
         
         # Find or create user
         google_id = user_info.get('id')
@@ -332,24 +419,7 @@ def google_callback(request):
             frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
             return redirect(f"{frontend_url}/login?error=invalid_user_info")
         
-        # Try to find user by google_id first, then by email
-        user = None
-        try:
-            user = User.objects.get(google_id=google_id)
-        except User.DoesNotExist:
-            try:
-                # If no user with google_id, check if email exists
-                user = User.objects.get(email=email)
-                # Link the google account to existing user
-                user.google_id = google_id
-                user.save()
-            except User.DoesNotExist:
-                # Create new user if neither google_id nor email exists
-                user = User.objects.create(
-                    email=email,
-                    name=user_info.get('name', email),
-                    google_id=google_id
-                )
+        user = get_or_create_google_user(google_id, email, user_info.get('name', email))
         
         # Generate tokens
         tokens = generate_tokens_for_user(user)
@@ -0,0 +1,199 @@
+"""
+Async login, signup and Google callback views.
+
+Served under ASGI when ASYNC_AUTH_VIEWS is enabled. They behave like the
+DRF views in ``auth.py``, but password hashing runs on the bounded pool in
+``utils.password_pool`` and calls to Google run off the event loop, so a
+login spike or a slow Google response doesn't hold request threads.
+"""
+import json
+import logging
+import os
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from djangorestframework_camel_case.util import underscoreize
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from ..models import User
+from ..serializers import LoginSerializer, SignupSerializer
+from ..utils.google_oauth import exchange_code, fetch_user_info
+from ..utils.password_pool import acheck_password, amake_password
+from .auth import generate_tokens_for_user, get_or_create_google_user
+
+logger = logging.getLogger(__name__)
+
+
+def _throttled(request):
+    """Apply the project's default throttles, as DRF would for the sync views."""
+    drf_request = Request(request)
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        if not throttle_class().allow_request(drf_request, None):
+            return True
+    return False
+
+
+async def _parse(request):
+    """Return (data, error_response) for a JSON POST request."""
+    if request.method != 'POST':
+        return None, JsonResponse(
+            {'error': f'Method "{request.method}" not allowed.'},
+            status=status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+    if await sync_to_async(_throttled)(request):
+        return None, JsonResponse(
+            {'error': 'Request was throttled.'},
+            status=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None, JsonResponse(
+            {'error': 'Malformed JSON body'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return underscoreize(data), None
+
+
+def _auth_payload(user, tokens):
+    return {
+        'user': {
+            'id': str(user.id),
+            'name': user.name,
+            'email': user.email,
+        },
+        'accessToken': tokens['access_token'],
+        'refreshToken': tokens['refresh_token'],
+    }
+
+
+async def signup(request):
+    """
+    POST /api/auth/signup (async)
+    Register a new user.
+    """
+    data, error = await _parse(request)
+    if error:
+        return error
+
+    serializer = SignupSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(
+            {'error': 'Validation failed', 'details': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    data = serializer.validated_data
+
+    if await User.objects.filter(email=data['email']).aexists():
+        return JsonResponse(
+            {'error': 'User with this email already exists'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Hash before touching the database so no row exists without a password
+    password = await amake_password(data['password'])
+    user = await User.objects.acreate(name=data['name'], email=data['email'], password=password)
+
+    tokens = await sync_to_async(generate_tokens_for_user)(user)
+    return JsonResponse(_auth_payload(user, tokens), status=status.HTTP_201_CREATED)
+
+
+async def login(request):
+    """
+    POST /api/auth/login (async)
+    Login with email and password.
+    """
+    data, error = await _parse(request)
+    if error:
+        return error
+
+    serializer = LoginSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(
+            {'error': 'Validation failed', 'details': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    data = serializer.validated_data
+
+    try:
+        user = await User.objects.aget(email=data['email'])
+    except User.DoesNotExist:
+        return JsonResponse(
+            {'error': 'Invalid credentials'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    if not user.password:
+        return JsonResponse(
+            {'error': 'Invalid credentials'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    valid, upgraded = await acheck_password(data['password'], user.password)
+    if not valid:
+        return JsonResponse(
+            {'error': 'Invalid credentials'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    if upgraded:
+        # Hasher or cost parameters changed since this hash was stored
+        user.password = upgraded
+        await user.asave(update_fields=['password'])
+
+    tokens = await sync_to_async(generate_tokens_for_user)(user)
+    return JsonResponse(_auth_payload(user, tokens))
+
+
+async def google_callback(request):
+    """
+    GET /api/auth/google/callback (async)
+    Handle Google OAuth callback.
+    """
+    frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
+    code = request.GET.get('code')
+    error = request.GET.get('error')
+
+    if error:
+        return redirect(f"{frontend_url}/login?error={error}")
+
+    if not code:
+        return redirect(f"{frontend_url}/login?error=no_code")
+
+    try:
+        google_callback_url = os.getenv('GOOGLE_CALLBACK_URL') or request.build_absolute_uri('/api/auth/google/callback')
+
+        # The pooled requests session is blocking; run it outside the loop
+        token_data = await sync_to_async(exchange_code, thread_sensitive=False)(code, google_callback_url)
+
+        if 'error' in token_data:
+            return redirect(f"{frontend_url}/login?error={token_data.get('error', 'unknown')}")
+
+        access_token = token_data.get('access_token', '')
+        if not access_token:
+            return redirect(f"{frontend_url}/login?error=no_access_token")
+
+        user_info = await sync_to_async(fetch_user_info, thread_sensitive=False)(access_token)
+
+        google_id = user_info.get('id')
+        email = user_info.get('email')
+
+        if not google_id or not email:
+            return redirect(f"{frontend_url}/login?error=invalid_user_info")
+
+        user = await sync_to_async(get_or_create_google_user)(google_id, email, user_info.get('name', email))
+        tokens = await sync_to_async(generate_tokens_for_user)(user)
+
+        return redirect(
+            f"{frontend_url}/auth/callback?access={tokens['access_token']}&refresh={tokens['refresh_token']}"
+        )
+    except Exception as e:
+        logger.error(f"Google OAuth error: {str(e)}")
+        return redirect(f"{frontend_url}/login?error=auth_failed")
+
+
+# DRF's @api_view marks its views CSRF-exempt; Django 4.2's csrf_exempt
+# decorator doesn't preserve coroutine functions, so set the flag directly
+signup.csrf_exempt = True
+login.csrf_exempt = True
@@ -0,0 +1,78 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count, Sum
+from django.utils import timezone
+from ..models import Expense, UserInterest, UserSavedCourse
+from ..utils.http_cache import build_payload, payload_response
+
+
+def month_bounds(day):
+    """Return the first day of ``day``'s month and the first day of the next."""
+    start = day.replace(day=1)
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
+
+def expense_summary(user, day):
+    """
+    Summarize a user's spending for the month containing ``day``.
+    One grouped query yields both the per-category split and the totals.
+    """
+    start, end = month_bounds(day)
+    rows = (
+        Expense.objects.filter(user=user, date__gte=start, date__lt=end)
+        .order_by()
+        .values('category')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by('-total', 'category')
+    )
+    by_category = [
+        {'category': row['category'], 'total': float(row['total']), 'count': row['count']}
+        for row in rows
+    ]
+    return {
+        'month': start.strftime('%Y-%m'),
+        'total': sum(row['total'] for row in by_category),
+        'count': sum(row['count'] for row in by_category),
+        'by_category': by_category,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bootstrap(request):
+    """
+    GET /api/bootstrap
+    Everything the dashboard needs on load: profile, interests, saved
+    course ids and this month's expense summary, in three queries.
+    """
+    user = request.user
+
+    user_interests = UserInterest.objects.filter(user=user).select_related('interest')
+    interests = [
+        {'id': ui.interest.id, 'name': ui.interest.name, 'slug': ui.interest.slug}
+        for ui in user_interests
+    ]
+    saved_course_ids = [
+        str(course_id)
+        for course_id in UserSavedCourse.objects.filter(user=user).values_list('course_id', flat=True)
+    ]
+
+    data = {
+        'profile': {
+            'id': str(user.id),
+            'name': user.name,
+            'email': user.email,
+            'budget_amount': float(user.budget_amount) if user.budget_amount else None,
+            'currency': user.currency,
+            'created_at': user.created_at.isoformat(),
+        },
+        'interests': interests,
+        'saved_course_ids': saved_course_ids,
+        'expense_summary': expense_summary(user, timezone.localdate()),
+    }
+
+    return payload_response(request, build_payload(data), 'private, no-cache')
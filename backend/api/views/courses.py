@@ -2,10 +2,56 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.db import transaction
 from django.db.models import Q
 from decimal import Decimal
+import base64
+import json
+import uuid
+from datetime import datetime
 from ..models import Course, UserSavedCourse, UserInterest
-from ..serializers import CourseSerializer
+from ..serializers import CourseSerializer, course_values
+from ..utils.response_cache import COURSES_VERSION, bump_user_generation, cache_per_user
+from ..utils.saved_courses import invalidate_saved_course_ids, saved_course_ids
+from ..utils.typeahead import typeahead
+
+# Columns the recommendation score (and the isSaved flag) read, fetched
+# even when not requested
+SCORING_FIELDS = ('id', 'price', 'rating', 'categories')
+
+# Saved-courses page size (default and maximum), and the most course ids
+# one bulk save/unsave request may carry
+SAVED_PAGE_SIZE = 20
+SAVED_MAX_PAGE_SIZE = 100
+BULK_SAVE_MAX_IDS = 100
+
+
+def unknown_fields_response(error):
+    return Response(
+        {'error': f'Unknown fields: {error}'},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def candidate_rows(queryset, window, fields, collapse_duplicates):
+    """
+    The first ``window`` rows of ``queryset`` to score. When duplicates
+    are collapsed, rows are read in ``window``-sized chunks until they
+    span ``window`` clusters, so collapsing cannot leave the page short.
+    """
+    if not collapse_duplicates:
+        return list(course_values.values(queryset[:window], fields=fields, extra=('cluster_id',)))
+    rows = []
+    clusters = set()
+    while len(clusters) < window:
+        chunk = list(course_values.values(
+            queryset[len(rows):len(rows) + window], fields=fields, extra=('cluster_id',),
+        ))
+        rows.extend(chunk)
+        clusters.update(row['cluster_id'] or row['id'] for row in chunk)
+        if len(chunk) < window:
+            break
+    return rows
 
 
 @api_view(['GET'])
@@ -14,12 +60,25 @@ def get_courses(request):
     """
     GET /api/courses
     Get course recommendations based on user interests and filters.
+    Pass ?fields=id,title,... to receive (and read) only those fields.
+    Near-duplicate listings are collapsed to their best-scoring member;
+    pass ?duplicates=true to keep them all.
+
+    Only the top ``limit * 3`` courses by rating are scored, so ``total``
+    is the size of that ranked window (counting each cluster once), not
+    the number of matching courses.
     """
+    try:
+        fields = course_values.parse_fields(request.GET.get('fields'))
+    except ValueError as e:
+        return unknown_fields_response(e)
+
     interest = request.GET.get('interest')
     max_price = request.GET.get('max_price')
     search = request.GET.get('search')
     limit = int(request.GET.get('limit', '20'))
     offset = int(request.GET.get('offset', '0'))
+    include_duplicates = request.GET.get('duplicates', '').lower() in ('1', 'true')
     
     # Get user interests
     user_interests = UserInterest.objects.filter(user=request.user).select_related('interest')
@@ -43,8 +102,15 @@ def get_courses(request):
         interest_lower = interest.lower()
         query &= Q(title__icontains=interest_lower) | Q(description__icontains=interest_lower)
     
-    # Fetch courses
-    courses = Course.objects.filter(query).order_by('-rating', '-scraped_at')[:limit * 3]
+    # Fetch courses as raw rows; only the page that is returned gets rendered
+    fetch_fields = None
+    if fields is not None:
+        fetch_fields = tuple(name for name in course_values.field_names if name in fields or name in SCORING_FIELDS)
+    window = limit * 3
+    courses = candidate_rows(
+        Course.objects.filter(query).order_by('-rating', '-scraped_at'),
+        window, fetch_fields, collapse_duplicates=not include_duplicates,
+    )
     
     # Score and rank courses
     scored_courses = []
@@ -52,9 +118,9 @@ def get_courses(request):
         score = 0
         
         # Interest match score
-        if interest_names and course.categories:
+        if interest_names and course['categories']:
             # Handle JSONField - can be list or None
-            categories_data = course.categories if course.categories else []
+            categories_data = course['categories'] if course['categories'] else []
             course_categories = [str(cat).lower() for cat in categories_data] if isinstance(categories_data, list) else []
             
             match_count = sum(1 for cat in course_categories 
@@ -62,16 +128,16 @@ def get_courses(request):
             score += match_count * 10
         
         # Rating score
-        if course.rating:
-            score += float(course.rating) * 2
+        if course['rating']:
+            score += float(course['rating']) * 2
         
         # Free course bonus
-        if not course.price:
+        if not course['price']:
             score += 5
         
         # Price penalty
-        if course.price:
-            price_penalty = min(float(course.price) / 1000, 5)
+        if course['price']:
+            price_penalty = min(float(course['price']) / 1000, 5)
             score -= price_penalty
         
         scored_courses.append({
@@ -81,12 +147,27 @@ def get_courses(request):
     
     # Sort by score and apply limit
     scored_courses.sort(key=lambda x: x['score'], reverse=True)
+
+    # Courses were clustered at ingest; keep the first of each cluster
+    if not include_duplicates:
+        seen_clusters = set()
+        unique_courses = []
+        for item in scored_courses:
+            cluster = item['course']['cluster_id'] or item['course']['id']
+            if cluster not in seen_clusters:
+                seen_clusters.add(cluster)
+                unique_courses.append(item)
+        scored_courses = unique_courses[:window]
     final_courses = [item['course'] for item in scored_courses[offset:offset + limit]]
-    
-    serializer = CourseSerializer(final_courses, many=True)
+
+    # One cached set answers isSaved for the whole page
+    saved_ids = saved_course_ids(request.user.pk)
+    data = course_values.to_representation(final_courses, fields=fields)
+    for row, item in zip(final_courses, data):
+        item['is_saved'] = str(row['id']) in saved_ids
     
     return Response({
-        'courses': serializer.data,
+        'courses': data,
         'total': len(scored_courses),
         'limit': limit,
         'offset': offset,
@@ -100,7 +181,8 @@ def save_course(request):
     POST /api/courses/save
     Save a course to user's saved courses.
     """
-    course_id = request.data.get('courseId')
+    # The camelCase parser turns JSON's courseId into course_id
+    course_id = request.data.get('courseId') or request.data.get('course_id')
     
     if not course_id:
         return Response(
@@ -116,16 +198,15 @@ def save_course(request):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Check if already saved
-    if UserSavedCourse.objects.filter(user=request.user, course=course).exists():
+    # Insert-or-fetch against the (user, course) unique constraint, so two
+    # concurrent saves cannot race between a check and the insert
+    _saved, created = UserSavedCourse.objects.get_or_create(user=request.user, course=course)
+    if not created:
         return Response(
             {'message': 'Course already saved'},
             status=status.HTTP_200_OK
         )
     
-    # Save course
-    UserSavedCourse.objects.create(user=request.user, course=course)
-    
     return Response({
         'message': 'Course saved successfully',
         'course': CourseSerializer(course).data
@@ -150,18 +231,132 @@ def unsave_course(request, course_id):
         )
 
 
+def encode_cursor(added_at, saved_id):
+    raw = json.dumps([added_at.isoformat(), saved_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (added_at, saved_id) from a cursor; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        added_at, saved_id = json.loads(raw)
+        return datetime.fromisoformat(added_at), int(saved_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_per_user('courses_saved', depends_on=(COURSES_VERSION,))
 def get_saved_courses(request):
     """
     GET /api/courses/saved
-    Get user's saved courses.
+    Get user's saved courses, newest first, a page at a time.
+    Pass ?limit= (max 100) and the previous page's nextCursor as ?cursor=.
+    Supports ?fields= like /api/courses.
     """
-    saved_courses = UserSavedCourse.objects.filter(user=request.user).select_related('course')
-    courses = [sc.course for sc in saved_courses]
-    serializer = CourseSerializer(courses, many=True)
-    
+    try:
+        fields = course_values.parse_fields(request.GET.get('fields'))
+    except ValueError as e:
+        return unknown_fields_response(e)
+
+    try:
+        limit = min(max(int(request.GET.get('limit', SAVED_PAGE_SIZE)), 1), SAVED_MAX_PAGE_SIZE)
+        cursor = request.GET.get('cursor')
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return Response(
+            {'error': 'Invalid limit or cursor'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    saved_courses = UserSavedCourse.objects.filter(user=request.user)
+    total = saved_courses.count()
+
+    # Keyset pagination on (added_at, id): each page is an index range scan
+    # no matter how deep the client has paged
+    page = saved_courses.order_by('-added_at', '-id')
+    if position:
+        added_at, saved_id = position
+        page = page.filter(Q(added_at__lt=added_at) | Q(added_at=added_at, id__lt=saved_id))
+    rows = list(course_values.values(page, prefix='course__', fields=fields, extra=('added_at', 'id'))[:limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['added_at'], rows[-1]['id'])
+
+    return Response({
+        'courses': course_values.to_representation(rows, prefix='course__', fields=fields),
+        'total': total,
+        'next_cursor': next_cursor,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_save_courses(request):
+    """
+    POST /api/courses/saved/bulk
+    Save and unsave several courses in one transaction.
+    Body: {"save": [courseId, ...], "unsave": [courseId, ...]}
+    """
+    save = request.data.get('save') or []
+    unsave = request.data.get('unsave') or []
+    if not isinstance(save, list) or not isinstance(unsave, list):
+        return Response(
+            {'error': 'save and unsave must be lists of course ids'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(save) + len(unsave) > BULK_SAVE_MAX_IDS:
+        return Response(
+            {'error': f'At most {BULK_SAVE_MAX_IDS} course ids per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        save_ids = {uuid.UUID(str(course_id)) for course_id in save}
+        unsave_ids = {uuid.UUID(str(course_id)) for course_id in unsave}
+    except ValueError:
+        return Response(
+            {'error': 'Invalid course id'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if save_ids & unsave_ids:
+        return Response(
+            {'error': 'A course cannot be saved and unsaved in the same request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    user = request.user
+    with transaction.atomic():
+        existing = set(Course.objects.filter(id__in=save_ids).values_list('id', flat=True))
+        already_saved = set(
+            UserSavedCourse.objects.filter(user=user, course_id__in=existing).values_list('course_id', flat=True)
+        )
+        created = existing - already_saved
+        # ignore_conflicts makes the insert an upsert on (user, course), so a
+        # concurrent save of the same course is absorbed rather than failing
+        UserSavedCourse.objects.bulk_create(
+            [UserSavedCourse(user=user, course_id=course_id) for course_id in created],
+            ignore_conflicts=True,
+        )
+
+        removed = set(
+            UserSavedCourse.objects.filter(user=user, course_id__in=unsave_ids).values_list('course_id', flat=True)
+        )
+        UserSavedCourse.objects.filter(user=user, course_id__in=removed).delete()
+
+    # bulk_create sends no signals, so do what the UserSavedCourse handlers
+    # would; bumping after commit also keeps readers from caching
+    # pre-commit state under the new versions
+    for course_id in created:
+        typeahead.popularity_changed('course', course_id, 1)
+    invalidate_saved_course_ids(user.pk)
+    bump_user_generation(user.pk)
+
     return Response({
-        'courses': serializer.data,
-        'total': len(courses)
+        'saved': sorted(str(course_id) for course_id in created),
+        'unsaved': sorted(str(course_id) for course_id in removed),
+        'not_found': sorted(str(course_id) for course_id in save_ids - existing),
     })
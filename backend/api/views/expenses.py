@@ -7,7 +7,8 @@ from django.db.models import Sum
 from datetime import datetime
 from decimal import Decimal
 from ..models import Expense, Course
-from ..serializers import ExpenseSerializer
+from ..serializers import ExpenseSerializer, expense_values
+from ..utils.response_cache import cache_per_user
 
 logger = logging.getLogger(__name__)
 
@@ -195,15 +196,25 @@ def search_courses_online(price_range, currency):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@cache_per_user('expenses')
 def expenses(request):
     """
-    GET /api/expenses - Get user's expenses with optional filters
+    GET /api/expenses - Get user's expenses with optional filters; ?fields=
+        limits each expense to the named fields
     POST /api/expenses - Add expense and get course recommendations if non-essential
     """
     if request.method == 'GET':
         start_date = request.GET.get('startDate')
         end_date = request.GET.get('endDate')
         category = request.GET.get('category')
+
+        try:
+            fields = expense_values.parse_fields(request.GET.get('fields'))
+        except ValueError as e:
+            return Response(
+                {'error': f'Unknown fields: {e}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         expenses_qs = Expense.objects.filter(user=request.user)
         
@@ -214,15 +225,16 @@ def expenses(request):
         if category:
             expenses_qs = expenses_qs.filter(category=category)
         
-        serializer = ExpenseSerializer(expenses_qs, many=True)
+        # values() rows rendered like ExpenseSerializer, without model instances
+        data = expense_values.serialize(expenses_qs, fields=fields)
         
         # Calculate total
         total = expenses_qs.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
         
         return Response({
-            'expenses': serializer.data,
+            'expenses': data,
             'total': float(total),
-            'count': expenses_qs.count()
+            'count': len(data)
         })
     
     # POST method
@@ -2,9 +2,35 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from django.conf import settings
 from django.utils.text import slugify
 from ..models import Interest, UserInterest
 from ..serializers import UpdateInterestsSerializer, InterestSerializer
+from ..utils.http_cache import build_payload, payload_response
+from ..utils.response_cache import cache_per_user
+from ..utils.versions import get_version
+
+INTERESTS_VERSION = 'interests'
+
+# (version, payload) for the public catalog, rebuilt only when the
+# interests version moves on
+_catalog = (None, None)
+
+
+def get_interests_payload():
+    """
+    Return the rendered interests catalog for the current interests version.
+    """
+    global _catalog
+    version = get_version(INTERESTS_VERSION)
+    cached_version, payload = _catalog
+    if cached_version == version and payload is not None:
+        return payload
+
+    interests = Interest.objects.all().order_by('name')
+    payload = build_payload(InterestSerializer(interests, many=True).data)
+    _catalog = (version, payload)
+    return payload
 
 
 @api_view(['GET'])
@@ -14,9 +40,8 @@ def get_interests(request):
     GET /api/interests
     Get all available interests (public endpoint).
     """
-    interests = Interest.objects.all().order_by('name')
-    serializer = InterestSerializer(interests, many=True)
-    return Response(serializer.data)
+    cache_control = f'public, max-age={settings.INTERESTS_CACHE_MAX_AGE}'
+    return payload_response(request, get_interests_payload(), cache_control)
 
 
 @api_view(['GET'])
@@ -34,6 +59,7 @@ def get_user_interests(request):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@cache_per_user('interests_me', depends_on=(INTERESTS_VERSION,))
 def user_interests(request):
     """
     GET /api/interests/me -> return current user's interests
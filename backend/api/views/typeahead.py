@@ -0,0 +1,50 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from ..utils.typeahead import typeahead
+
+TYPEAHEAD_KINDS = {
+    'interests': 'interest',
+    'courses': 'course',
+    'expenses': 'expense',
+}
+MAX_SUGGESTIONS = 20
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_suggestions(request):
+    """
+    GET /api/typeahead?q=<prefix>&types=interests,courses,expenses&limit=8
+    Autocomplete interest names, course titles and the user's past expense items.
+    """
+    query = request.GET.get('q', '').strip()
+    types = request.GET.get('types')
+
+    try:
+        limit = min(int(request.GET.get('limit', '8')), MAX_SUGGESTIONS)
+    except ValueError:
+        return Response(
+            {'error': 'limit must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if types:
+        requested = [t.strip() for t in types.split(',') if t.strip()]
+        unknown = [t for t in requested if t not in TYPEAHEAD_KINDS]
+        if unknown:
+            return Response(
+                {'error': f"Unknown types: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        kinds = {TYPEAHEAD_KINDS[t] for t in requested}
+    else:
+        kinds = set(TYPEAHEAD_KINDS.values())
+
+    suggestions = typeahead.suggest(request.user.id, query, kinds, limit) if query else []
+
+    return Response({
+        'query': query,
+        'suggestions': suggestions,
+    })
@@ -4,10 +4,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from ..models import UserInterest
 from ..serializers import UserSerializer, UpdateProfileSerializer, UpdateBudgetSerializer
+from ..utils.response_cache import cache_per_user
+from .interests import INTERESTS_VERSION
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_per_user('me', depends_on=(INTERESTS_VERSION,))
 def get_user(request):
     """
     GET /api/me
@@ -51,7 +51,9 @@ CREATE TABLE courses (
     categories TEXT,  -- JSON
     thumbnail_url VARCHAR(1000),
     description TEXT,
-    source_hash VARCHAR(64) UNIQUE NOT NULL,
+    source_hash VARCHAR(64) UNIQUE NOT NULL,  -- SHA-256 of '<provider_slug>_<url>'
+    simhash BIGINT,  -- SimHash of title and description (signed 64-bit)
+    cluster_id CHAR(36),  -- UUID of the near-duplicate cluster's first course
     scraped_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
@@ -60,6 +62,22 @@ CREATE TABLE courses (
 CREATE INDEX courses_provide_3e157d_idx ON courses(provider_slug);
 CREATE INDEX courses_price_56bbb6_idx ON courses(price);
 CREATE INDEX courses_rating_757d69_idx ON courses(rating);
+CREATE INDEX courses_cluster_id_472fcf73 ON courses(cluster_id);
+
+-- ====================================
+-- Table: course_simhash_buckets
+-- ====================================
+-- One row per LSH band of a course's SimHash (near-duplicate lookup)
+CREATE TABLE course_simhash_buckets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_id CHAR(36) NOT NULL,
+    key INTEGER NOT NULL,
+    FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE
+);
+
+-- Indexes for course_simhash_buckets table
+CREATE INDEX course_simhash_buckets_key_9bb15080 ON course_simhash_buckets(key);
+CREATE INDEX course_simhash_buckets_course_id_aa309d1d ON course_simhash_buckets(course_id);
 
 -- ====================================
 -- Table: expenses
@@ -89,7 +107,7 @@ CREATE INDEX expenses_categor_a6f264_idx ON expenses(category);
 CREATE TABLE refresh_tokens (
     id CHAR(36) PRIMARY KEY,  -- UUID
     user_id CHAR(36) NOT NULL,
-    token VARCHAR(500) UNIQUE NOT NULL,
+    token_digest VARCHAR(64) UNIQUE NOT NULL,  -- SHA-256 of the refresh JWT
     expires_at DATETIME NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
@@ -98,7 +116,6 @@ CREATE TABLE refresh_tokens (
 -- Indexes for refresh_tokens table
 CREATE INDEX refresh_tok_user_id_46676d_idx ON refresh_tokens(user_id);
 CREATE INDEX refresh_tok_expires_a128d9_idx ON refresh_tokens(expires_at);
-CREATE INDEX idx_refresh_token ON refresh_tokens(token);
 
 -- ====================================
 -- Table: user_interests (Junction Table)
@@ -141,3 +158,4 @@ CREATE INDEX user_saved__course__faca98_idx ON user_saved_courses(course_id);
 -- 2. users -> refresh_tokens (One-to-Many)
 -- 3. users <-> interests (Many-to-Many via user_interests)
 -- 4. users <-> courses (Many-to-Many via user_saved_courses)
+-- 5. courses -> course_simhash_buckets (One-to-Many)
@@ -115,6 +115,24 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: argon2 first; hashes made by any later entry are
+# upgraded on the user's next successful login, as are argon2 hashes made
+# with different cost parameters
+PASSWORD_HASHERS = [
+    'api.hashers.TunableArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '102400'))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '8'))
+
+# Threads the async login/signup views may use for hashing at once, and
+# whether to route /api/auth/login and /api/auth/signup to them (ASGI only)
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '4'))
+ASYNC_AUTH_VIEWS = os.getenv('ASYNC_AUTH_VIEWS', 'False') == 'True'
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -143,13 +161,15 @@ CORS_ALLOWED_ORIGINS = [
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Same output as djangorestframework_camel_case's renderer, with memoized
+    # key conversion and orjson encoding when available (api/renderers.py)
     'DEFAULT_RENDERER_CLASSES': (
-        'djangorestframework_camel_case.render.CamelCaseJSONRenderer',
+        'api.renderers.CamelCaseJSONRenderer',
         'djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer',
     ),
     'DEFAULT_PARSER_CLASSES': (
@@ -157,9 +177,11 @@ REST_FRAMEWORK = {
         'djangorestframework_camel_case.parser.CamelCaseMultiPartParser',
         'djangorestframework_camel_case.parser.CamelCaseJSONParser',
     ),
+    # GCRA throttles: one number per client in the cache instead of DRF's
+    # per-client timestamp list (see api/throttling.py)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'api.throttling.AnonGCRAThrottle',
+        'api.throttling.UserGCRAThrottle'
     ],
     # Throttle rates must use DRF's "<number>/<period>" format where
     # period is one of "s", "m", "h", or "d". The previous
@@ -175,6 +197,66 @@ REST_FRAMEWORK = {
     # 'EXCEPTION_HANDLER': 'api.utils.exception_handler.custom_exception_handler',
 }
 
+# Caches: Redis when REDIS_URL is set, otherwise a SQLite file shared by
+# every worker on the host (api/cache_backends.py). Each subsystem gets its
+# own alias and key prefix; bump CACHE_VERSION to orphan every stored key
+# after an incompatible change to what is cached. Test runs swap every
+# alias for a private in-process cache (eduwealth/test_runner.py).
+REDIS_URL = os.getenv('REDIS_URL', '')
+CACHE_VERSION = int(os.getenv('CACHE_VERSION', '1'))
+
+if REDIS_URL:
+    _cache_backend = {
+        'BACKEND': 'api.cache_backends.InstrumentedRedisCache',
+        'LOCATION': REDIS_URL,
+    }
+elif os.getenv('CACHE_BACKEND') == 'locmem':
+    _cache_backend = {
+        'BACKEND': 'api.cache_backends.InstrumentedLocMemCache',
+        'LOCATION': 'eduwealth',
+    }
+else:
+    _cache_backend = {
+        'BACKEND': 'api.cache_backends.SQLiteCache',
+        'LOCATION': os.getenv('CACHE_SQLITE_PATH', str(BASE_DIR / 'cache.sqlite3')),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '100000'))},
+    }
+
+CACHES = {
+    'default': {**_cache_backend, 'VERSION': CACHE_VERSION},
+    # GCRA throttle state
+    'throttle': {**_cache_backend, 'KEY_PREFIX': 'throttle', 'VERSION': CACHE_VERSION},
+    # Refresh-token revocation set
+    'auth': {**_cache_backend, 'KEY_PREFIX': 'auth', 'VERSION': CACHE_VERSION},
+    # Dataset version counters (interests catalog, typeahead indexes)
+    'versions': {**_cache_backend, 'KEY_PREFIX': 'versions', 'VERSION': CACHE_VERSION},
+    # Rendered per-user GET responses (api/utils/response_cache.py)
+    'responses': {**_cache_backend, 'KEY_PREFIX': 'responses', 'VERSION': CACHE_VERSION},
+}
+
+TEST_RUNNER = 'eduwealth.test_runner.LocMemCacheTestRunner'
+
+# Seconds a cached per-user response may live; entries are invalidated on
+# write regardless, so this only bounds how long idle users' entries linger
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '600'))
+
+# Seconds browsers and CDNs may reuse the public interests catalog
+INTERESTS_CACHE_MAX_AGE = int(os.getenv('INTERESTS_CACHE_MAX_AGE', '300'))
+
+# Typeahead: number of per-user expense indexes kept in memory, and the
+# distinct item names each one may hold
+TYPEAHEAD_MAX_USERS = int(os.getenv('TYPEAHEAD_MAX_USERS', '1000'))
+TYPEAHEAD_MAX_USER_ITEMS = int(os.getenv('TYPEAHEAD_MAX_USER_ITEMS', '500'))
+
+# Seconds between re-reading typeahead popularity counts from the database;
+# saves only reweight the local index, so this bounds cross-worker drift
+TYPEAHEAD_POPULARITY_TTL = int(os.getenv('TYPEAHEAD_POPULARITY_TTL', '60'))
+
+# Authenticated-user cache: seconds a decoded token / loaded user is reused,
+# and how many of each are kept per process
+AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', '60'))
+AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', '2048'))
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
@@ -203,11 +285,29 @@ SIMPLE_JWT = {
     'JTI_CLAIM': 'jti',
 }
 
+# Active refresh tokens kept per user; older sessions are signed out on login
+REFRESH_TOKENS_PER_USER = int(os.getenv('REFRESH_TOKENS_PER_USER', '10'))
+
+# Accept refresh tokens on signature + cached revocation set instead of a
+# database lookup per refresh (see api/utils/refresh_revocation.py)
+REFRESH_TOKEN_STATELESS = os.getenv('REFRESH_TOKEN_STATELESS', 'False') == 'True'
+
 # Google OAuth Settings
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', '')
 GOOGLE_CLIENT_SECRET = os.getenv('GOOGLE_CLIENT_SECRET', '')
 GOOGLE_CALLBACK_URL = os.getenv('GOOGLE_CALLBACK_URL', 'http://localhost:4000/api/auth/google/callback')
 
+# Google endpoints (overridable so tests and staging can point at a stub)
+GOOGLE_TOKEN_URL = os.getenv('GOOGLE_TOKEN_URL', 'https://oauth2.googleapis.com/token')
+GOOGLE_USERINFO_URL = os.getenv('GOOGLE_USERINFO_URL', 'https://www.googleapis.com/oauth2/v2/userinfo')
+GOOGLE_CERTS_URL = os.getenv('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v1/certs')
+
+# Outbound HTTP to Google: seconds to connect / to wait for a response,
+# and connections kept alive in the shared pool
+GOOGLE_HTTP_CONNECT_TIMEOUT = float(os.getenv('GOOGLE_HTTP_CONNECT_TIMEOUT', '3.05'))
+GOOGLE_HTTP_READ_TIMEOUT = float(os.getenv('GOOGLE_HTTP_READ_TIMEOUT', '10'))
+GOOGLE_HTTP_POOL_SIZE = int(os.getenv('GOOGLE_HTTP_POOL_SIZE', '10'))
+
 # Security Settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
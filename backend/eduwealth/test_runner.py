@@ -0,0 +1,34 @@
+"""
+Test runner that keeps tests off the real caches.
+
+Tests call ``cache.clear()``, and with the SQLite backend every alias
+shares one table, so running them against the configured caches would
+wipe the host's throttle buckets, revocation entries and version
+counters. Every alias is swapped for an in-process cache instead, with
+its key prefix and version kept.
+"""
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+def test_caches(caches):
+    return {
+        alias: {
+            **{key: value for key, value in config.items() if key in ('KEY_PREFIX', 'VERSION')},
+            'BACKEND': 'api.cache_backends.InstrumentedLocMemCache',
+            'LOCATION': 'eduwealth-tests',
+        }
+        for alias, config in caches.items()
+    }
+
+
+class LocMemCacheTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        self._test_caches = override_settings(CACHES=test_caches(settings.CACHES))
+        self._test_caches.enable()
+        super().setup_test_environment(**kwargs)
+
+    def teardown_test_environment(self, **kwargs):
+        super().teardown_test_environment(**kwargs)
+        self._test_caches.disable()
@@ -0,0 +1,8 @@
+"""
+Settings for test runners that do not go through TEST_RUNNER (pytest).
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import CACHES
+from .test_runner import test_caches
+
+CACHES = test_caches(CACHES)
@@ -5,11 +5,13 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
 from datetime import datetime
+from api.cache_backends import cache_stats
 
 def health_check(request):
     return JsonResponse({
         'status': 'ok',
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'cache': cache_stats(),
     })
 
 def api_root(request):
@@ -29,6 +31,7 @@ def api_root(request):
             'user': {
                 'profile': '/api/me',
                 'budget': '/api/me/budget',
+                'bootstrap': '/api/bootstrap',
             },
             'interests': {
                 'all': '/api/interests',
@@ -37,10 +40,12 @@ def api_root(request):
             'courses': {
                 'list': '/api/courses',
                 'saved': '/api/courses/saved',
+                'bulk': '/api/courses/saved/bulk',
             },
             'expenses': {
                 'list': '/api/expenses',
-            }
+            },
+            'typeahead': '/api/typeahead',
         },
         'frontend': 'http://localhost:3000',
         'status': 'running'
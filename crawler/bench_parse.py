@@ -0,0 +1,98 @@
+"""
+Parser throughput benchmark.
+
+Parses the HTML pages in a response store (recorded with
+``crawler.py --record``) serially and then on process pools of increasing
+size, and reports pages per second for each. With no recorded pages, or
+with --synthetic N, it generates N course pages instead.
+
+    python bench_parse.py --store responses --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from parsers import parse_page
+from response_store import ResponseStore
+
+
+def stored_pages(path: str) -> List[Tuple[str, str]]:
+    pages = []
+    for entry in ResponseStore(path):
+        content_type = entry['headers'].get('Content-Type') or entry['headers'].get('content-type') or ''
+        if entry['status'] == 200 and 'html' in content_type:
+            pages.append((entry['url'], entry['content'].decode('utf-8', errors='replace')))
+    return pages
+
+
+def synthetic_pages(count: int) -> List[Tuple[str, str]]:
+    pages = []
+    for i in range(count):
+        json_ld = json.dumps({
+            '@type': 'Course', 'name': f'Course {i}',
+            'offers': {'price': str(399 + i % 200), 'priceCurrency': 'INR'},
+            'aggregateRating': {'ratingValue': 4 + (i % 10) / 10},
+        })
+        body = ''.join(f'<div class="section"><h2>Lecture {j}</h2><p>{"Lorem ipsum " * 40}</p></div>'
+                       for j in range(60))
+        html = (
+            f'<html><head><title>Course {i}</title>'
+            f'<meta property="og:title" content="Course {i}">'
+            f'<meta property="og:description" content="Learn topic {i}">'
+            f'<meta property="og:image" content="https://img.example.com/{i}.jpg">'
+            f'<script type="application/ld+json">{json_ld}</script>'
+            f'</head><body>{body}</body></html>'
+        )
+        pages.append((f'https://www.udemy.com/course/bench-{i}/', html))
+    return pages
+
+
+def parse_serial(pages):
+    return [parse_page(url, html) for url, html in pages]
+
+
+def parse_pool(pages, workers):
+    urls, htmls = zip(*pages)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_page, urls, htmls, chunksize=max(1, len(pages) // (workers * 8))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark course page parsing')
+    parser.add_argument('--store', default=os.getenv('RESPONSE_STORE_PATH', 'responses'),
+                        help='Response store holding recorded pages')
+    parser.add_argument('--synthetic', type=int, default=0, help='Benchmark N generated pages instead')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1],
+                        help='Process pool sizes to compare')
+    args = parser.parse_args()
+
+    pages = [] if args.synthetic else stored_pages(args.store)
+    if not pages:
+        pages = synthetic_pages(args.synthetic or 2000)
+        print(f"Using {len(pages)} synthetic pages")
+    else:
+        print(f"Using {len(pages)} stored pages from {args.store}")
+    megabytes = sum(len(html) for _, html in pages) / 1e6
+
+    started = time.perf_counter()
+    expected = parse_serial(pages)
+    serial = time.perf_counter() - started
+    print(f"{'mode':<12} {'seconds':>8} {'pages/s':>9} {'MB/s':>7} {'speedup':>8}")
+    print(f"{'serial':<12} {serial:>8.2f} {len(pages) / serial:>9.0f} {megabytes / serial:>7.1f} {1:>7.1f}x")
+
+    for workers in sorted(set(args.workers)):
+        started = time.perf_counter()
+        results = parse_pool(pages, workers)
+        elapsed = time.perf_counter() - started
+        if results != expected:
+            raise SystemExit(f"{workers} workers: results differ from the serial run")
+        print(f"{f'{workers} procs':<12} {elapsed:>8.2f} {len(pages) / elapsed:>9.0f} "
+              f"{megabytes / elapsed:>7.1f} {serial / elapsed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Durable crawl frontier.
+
+URLs to crawl live in a local SQLite table with their state, attempt count
+and the earliest time they may be tried again, so a crawl that dies can be
+resumed without refetching pages it already finished. Failed fetches go
+back to ``pending`` with exponential backoff (with jitter) until
+``max_attempts`` is reached, after which they are parked as ``failed``.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+PENDING = 'pending'
+IN_PROGRESS = 'in_progress'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Frontier:
+    def __init__(self, path: str, max_attempts: int = 5, backoff_base: float = 30.0,
+                 backoff_max: float = 3600.0, clock=time.time):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_eligible REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS frontier_ready ON frontier (state, next_eligible)'
+        )
+        self.conn.commit()
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            self.conn.commit()
+            return cursor
+
+    def clear(self):
+        self._execute('DELETE FROM frontier')
+
+    def add(self, urls: Iterable[str]) -> int:
+        """Queue URLs not seen before; known URLs keep their state."""
+        now = self.clock()
+        with self._lock:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO frontier (url, state, updated_at) VALUES (?, ?, ?)',
+                ((url, PENDING, now) for url in urls),
+            )
+            self.conn.commit()
+            return self.conn.total_changes - before
+
+    def recover(self) -> int:
+        """Return URLs left in progress by a crashed run to the queue."""
+        return self._execute(
+            'UPDATE frontier SET state = ?, updated_at = ? WHERE state = ?',
+            (PENDING, self.clock(), IN_PROGRESS),
+        ).rowcount
+
+    def claim_ready(self, limit: int = 1000) -> List[str]:
+        """Mark up to ``limit`` eligible URLs in progress and return them."""
+        now = self.clock()
+        with self._lock:
+            urls = [row[0] for row in self.conn.execute(
+                'SELECT url FROM frontier WHERE state = ? AND next_eligible <= ? '
+                'ORDER BY next_eligible LIMIT ?',
+                (PENDING, now, limit),
+            )]
+            self.conn.executemany(
+                'UPDATE frontier SET state = ?, updated_at = ? WHERE url = ?',
+                ((IN_PROGRESS, now, url) for url in urls),
+            )
+            self.conn.commit()
+        return urls
+
+    def next_wait(self) -> Optional[float]:
+        """Seconds until the next pending URL becomes eligible, or None if none are pending."""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT MIN(next_eligible) FROM frontier WHERE state = ?', (PENDING,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - self.clock())
+
+    def mark_done(self, url: str):
+        self._execute(
+            'UPDATE frontier SET state = ?, last_error = NULL, updated_at = ? WHERE url = ?',
+            (DONE, self.clock(), url),
+        )
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        # Jitter keeps retries of one failing host from landing together
+        return delay * random.uniform(0.5, 1.0)
+
+    def mark_failed(self, url: str, error: str, permanent: bool = False):
+        """Schedule a retry with backoff, or park the URL once out of attempts."""
+        now = self.clock()
+        with self._lock:
+            row = self.conn.execute('SELECT attempts FROM frontier WHERE url = ?', (url,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            if permanent or attempts >= self.max_attempts:
+                state, next_eligible = FAILED, now
+            else:
+                state, next_eligible = PENDING, now + self.backoff(attempts)
+            self.conn.execute(
+                'UPDATE frontier SET state = ?, attempts = ?, next_eligible = ?, last_error = ?, '
+                'updated_at = ? WHERE url = ?',
+                (state, attempts, next_eligible, error[:500], now, url),
+            )
+            self.conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self.conn.execute('SELECT state, COUNT(*) FROM frontier GROUP BY state').fetchall()
+        counts = {PENDING: 0, IN_PROGRESS: 0, DONE: 0, FAILED: 0}
+        counts.update(rows)
+        return counts
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,181 @@
+"""
+Crawl metrics.
+
+Counters and latency histograms are kept per host and per pipeline stage
+(fetch, parse, write). A ProgressReporter prints a one-line snapshot every
+few seconds while the crawl runs, and ``write_json`` saves the full summary
+at the end so crawl schedules can be sized and slow providers spotted.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float('inf'))
+
+
+class Histogram:
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return self.max if bound == float('inf') else min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': {
+                ('+Inf' if bound == float('inf') else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS, self.counts)
+            },
+        }
+
+
+class _HostMetrics:
+    def __init__(self):
+        self.fetch = Histogram()
+        self.bytes = 0
+        self.statuses = defaultdict(int)
+        self.counts = defaultdict(int)
+
+    def to_dict(self) -> Dict:
+        return {
+            'fetch_latency': self.fetch.to_dict(),
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+            'counts': dict(self.counts),
+        }
+
+
+class CrawlMetrics:
+    """Thread-safe crawl counters, per host and per stage."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, _HostMetrics] = defaultdict(_HostMetrics)
+        self.stages: Dict[str, Histogram] = defaultdict(Histogram)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.bytes = 0
+        self.rows_written = 0
+
+    def record_fetch(self, host: str, seconds: float, status: int, nbytes: int):
+        with self._lock:
+            metrics = self.hosts[host]
+            metrics.fetch.observe(seconds)
+            metrics.bytes += nbytes
+            metrics.statuses[str(status)] += 1
+            self.stages['fetch'].observe(seconds)
+            self.bytes += nbytes
+            self.counts['fetches'] += 1
+
+    def count(self, name: str, host: Optional[str] = None, amount: int = 1):
+        """Count an outcome such as not_modified, unchanged, disallowed or fetch_errors."""
+        with self._lock:
+            self.counts[name] += amount
+            if host is not None:
+                self.hosts[host].counts[name] += amount
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage].observe(seconds)
+
+    def record_batch(self, rows: int, seconds: float, failed: int = 0):
+        """A writer flush: ``rows`` stored, ``failed`` dropped as write errors."""
+        with self._lock:
+            self.stages['write_batch'].observe(seconds)
+            self.rows_written += rows
+            self.counts['write_errors'] += failed
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def progress_line(self) -> str:
+        with self._lock:
+            elapsed = self.elapsed()
+            fetches = self.counts['fetches']
+            fetch_p95 = self.stages['fetch'].percentile(0.95) if 'fetch' in self.stages else None
+            return (
+                f"📊 {elapsed:6.0f}s | {fetches} fetched ({fetches / elapsed if elapsed else 0:.1f}/s, "
+                f"p95 {fetch_p95 or 0:.2f}s) | {self.bytes / 1e6:.1f} MB | "
+                f"304 {self.counts['not_modified']} | unchanged {self.counts['unchanged']} | "
+                f"parsed {self.counts['parsed']} | written {self.rows_written} | "
+                f"errors {self.counts['fetch_errors'] + self.counts['parse_errors'] + self.counts['write_errors']}"
+            )
+
+    def summary(self) -> Dict:
+        with self._lock:
+            elapsed = self.elapsed()
+            return {
+                'elapsed_seconds': elapsed,
+                'pages_per_second': self.counts['fetches'] / elapsed if elapsed else 0.0,
+                'bytes': self.bytes,
+                'rows_written': self.rows_written,
+                'counts': dict(self.counts),
+                'stages': {name: histogram.to_dict() for name, histogram in self.stages.items()},
+                'hosts': {host: metrics.to_dict() for host, metrics in sorted(self.hosts.items())},
+            }
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+class ProgressReporter:
+    """Print ``metrics.progress_line()`` every ``interval`` seconds until stopped."""
+
+    def __init__(self, metrics: CrawlMetrics, interval: float = 10.0):
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name='crawler-progress', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            print(self.metrics.progress_line(), flush=True)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,85 @@
+"""
+What the crawler last saw for each page.
+
+For every fetched URL we keep the HTTP validators (ETag, Last-Modified)
+and a hash of the body. A re-crawl sends them back as conditional request
+headers; a 304, or a 200 whose body hashes the same, means the page has
+not changed and needs neither parsing nor a database write.
+
+State lives in a local SQLite file so it survives between runs.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass
+class PageState:
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    fetched_at: float = 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class PageStateStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Shared by the crawler's worker threads; access is serialized
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[PageState]:
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT url, etag, last_modified, content_hash, fetched_at FROM pages WHERE url = ?',
+                (url,),
+            ).fetchone()
+        return PageState(*row) if row else None
+
+    def save(self, state: PageState):
+        state.fetched_at = time.time()
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO pages (url, etag, last_modified, content_hash, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at
+                """,
+                (state.url, state.etag, state.last_modified, state.content_hash, state.fetched_at),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,114 @@
+"""
+Course page parsers, keyed by provider slug.
+
+Parsers take ``(html, url)`` and return a course dict ready for the
+writer, or None when the page holds no course. They use lxml directly,
+which is several times faster than BeautifulSoup, and they run in worker
+processes, so they must be plain module-level functions.
+
+Providers without a dedicated parser fall back to ``default``, which
+reads OpenGraph tags and schema.org ``Course`` JSON-LD.
+"""
+
+import hashlib
+import json
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import lxml.html
+
+Parser = Callable[[str, str], Optional[Dict]]
+
+PROVIDERS = {
+    'www.udemy.com': ('Udemy', 'udemy'),
+    'www.coursera.org': ('Coursera', 'coursera'),
+}
+
+PARSERS: Dict[str, Parser] = {}
+
+
+def register(provider_slug: str):
+    def decorator(func: Parser) -> Parser:
+        PARSERS[provider_slug] = func
+        return func
+    return decorator
+
+
+def source_hash(provider_slug: str, url: str) -> str:
+    """Deduplication key for a course; must match api.utils.ingest.source_hash in the backend"""
+    return hashlib.sha256(f"{provider_slug}_{url}".encode()).hexdigest()
+
+
+def provider_for_url(url: str) -> Tuple[str, str]:
+    host = (urlparse(url).hostname or '').lower()
+    return PROVIDERS.get(host, (host, host.split('.')[-2] if '.' in host else host))
+
+
+def _document(html: str):
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml.html.document_fromstring(html.encode('utf-8'))
+
+
+def _meta(doc, *names) -> Optional[str]:
+    for name in names:
+        for content in doc.xpath('//meta[@property=$name or @name=$name]/@content', name=name):
+            if content.strip():
+                return content.strip()
+    return None
+
+
+def _json_ld_courses(doc):
+    for text in doc.xpath('//script[@type="application/ld+json"]/text()'):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if isinstance(item, dict) and item.get('@type') == 'Course':
+                yield item
+
+
+@register('default')
+def parse_generic(html: str, url: str) -> Optional[Dict]:
+    doc = _document(html)
+    title = _meta(doc, 'og:title') or (doc.findtext('.//title') or '').strip()
+    if not title:
+        return None
+
+    price = currency = rating = duration = None
+    for item in _json_ld_courses(doc):
+        offers = item.get('offers') or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        price = offers.get('price', price)
+        currency = offers.get('priceCurrency', currency)
+        rating = (item.get('aggregateRating') or {}).get('ratingValue', rating)
+        duration = item.get('timeRequired', duration)
+
+    provider_name, provider_slug = provider_for_url(url)
+    return {
+        'title': title[:500],
+        'provider_name': provider_name,
+        'provider_slug': provider_slug,
+        'url': url,
+        'price': price,
+        'currency': currency,
+        'rating': rating,
+        'duration': duration,
+        'categories': '[]',
+        'thumbnail_url': _meta(doc, 'og:image'),
+        'description': _meta(doc, 'og:description', 'description'),
+        'source_hash': source_hash(provider_slug, url),
+    }
+
+
+def parser_for(provider_slug: str) -> Parser:
+    return PARSERS.get(provider_slug, PARSERS['default'])
+
+
+def parse_page(url: str, html: str) -> Optional[Dict]:
+    """Parse one page with its provider's parser (the process-pool entry point)."""
+    return parser_for(provider_for_url(url)[1])(html, url)
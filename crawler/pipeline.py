@@ -0,0 +1,131 @@
+"""
+Fetch -> parse -> write pipeline.
+
+Each stage runs on its own workers, connected by bounded queues:
+
+- fetch: the HostScheduler's threads download pages, politely per host;
+- parse: a process pool runs the provider parsers, so CPU-bound HTML
+  parsing is not serialized behind the GIL;
+- write: one thread feeds parsed courses to the batching writer.
+
+A full queue blocks the stage feeding it, so a slow database or a busy
+parser pool throttles fetching instead of buffering pages without bound.
+
+A page whose course is written is reported by the writer's ``on_commit``;
+the pipeline reports the pages that never reach it, through
+``on_page_done`` (skipped by the fetch, or parsed but with no course on
+it) and ``on_page_failed``.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import CrawlMetrics
+from parsers import parse_page
+from scheduler import HostScheduler, Task, TaskResult, host_of
+
+_DONE = object()
+
+
+def timed_parse(url: str, html: str) -> Tuple[Optional[Dict], float]:
+    started = time.perf_counter()
+    course = parse_page(url, html)
+    return course, time.perf_counter() - started
+
+
+class Pipeline:
+    def __init__(self, scheduler: HostScheduler, writer, parse_workers: int = 4, queue_size: int = 100,
+                 on_fetch_result: Optional[Callable[[TaskResult], None]] = None,
+                 metrics: Optional[CrawlMetrics] = None,
+                 on_page_done: Optional[Callable[[str], None]] = None,
+                 on_page_failed: Optional[Callable[[str, Exception], None]] = None):
+        self.scheduler = scheduler
+        self.writer = writer
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = max(1, queue_size)
+        self.on_fetch_result = on_fetch_result
+        self.metrics = metrics or CrawlMetrics()
+        self.on_page_done = on_page_done or (lambda url: None)
+        self.on_page_failed = on_page_failed or (lambda url, error: None)
+
+    def run(self, urls: List[str], fetch: Callable[[str], Optional[str]]):
+        """
+        Crawl ``urls``. ``fetch(url)`` returns the page's HTML, or None to
+        skip it (disallowed, unchanged, ...).
+        """
+        parse_queue: queue.Queue = queue.Queue(self.queue_size)
+        write_queue: queue.Queue = queue.Queue(self.queue_size)
+        parse_thread = threading.Thread(target=self._parse_stage, args=(parse_queue, write_queue),
+                                        name='crawler-parse', daemon=True)
+        write_thread = threading.Thread(target=self._write_stage, args=(write_queue,),
+                                        name='crawler-write', daemon=True)
+        parse_thread.start()
+        write_thread.start()
+
+        def fetch_stage(url):
+            html = fetch(url)
+            if html is None:
+                self.on_page_done(url)
+            else:
+                parse_queue.put((url, html))
+
+        try:
+            tasks = [Task(url=url, run=lambda url=url: fetch_stage(url)) for url in urls]
+            self.scheduler.run(tasks, on_result=self.on_fetch_result)
+        finally:
+            parse_queue.put(_DONE)
+            parse_thread.join()
+            write_thread.join()
+            self.writer.flush()
+
+    def _parse_stage(self, parse_queue: queue.Queue, write_queue: queue.Queue):
+        # Cap pages handed to the pool so the bounded queue still pushes back
+        in_flight = threading.BoundedSemaphore(self.parse_workers * 2)
+
+        def done(future: Future, url: str):
+            in_flight.release()
+            try:
+                course, seconds = future.result()
+            except Exception as e:
+                print(f"❌ Error parsing {url}: {e}")
+                self.metrics.count('parse_errors', host_of(url))
+                self.on_page_failed(url, e)
+                return
+            self.metrics.observe('parse', seconds)
+            if course is None:
+                print(f"⚠️  No course data found: {url}")
+                self.metrics.count('no_course', host_of(url))
+                self.on_page_done(url)
+            else:
+                self.metrics.count('parsed', host_of(url))
+                write_queue.put(course)
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            while True:
+                item = parse_queue.get()
+                if item is _DONE:
+                    break
+                url, html = item
+                in_flight.acquire()
+                future = pool.submit(timed_parse, url, html)
+                future.add_done_callback(lambda future, url=url: done(future, url))
+        # Leaving the with block waited for every parse and its callback
+        write_queue.put(_DONE)
+
+    def _write_stage(self, write_queue: queue.Queue):
+        while True:
+            course = write_queue.get()
+            if course is _DONE:
+                return
+            try:
+                self.writer.add(course)
+            except Exception as e:
+                # Keep draining: a dead writer thread would leave the parse
+                # stage blocked on the full queue forever. Pages whose
+                # courses were lost stay in progress for the next run.
+                url = course.get('url', '')
+                print(f"❌ Error writing course {url}: {e}")
+                self.metrics.count('write_errors', host_of(url))
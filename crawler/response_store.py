@@ -0,0 +1,134 @@
+"""
+Content-addressed on-disk store of HTTP responses.
+
+Recording mounts a transport adapter on the crawler's requests session
+that saves every response; replay mounts one that answers every request
+from disk and never touches the network. This lets parsers be rerun
+against an earlier crawl, and the crawler run offline.
+
+Layout under ``root``::
+
+    objects/ab/abcdef...   response bodies, named by their SHA-256
+    index/12/1234ab....json   one entry per request (method + URL): status,
+                              headers and the body's hash
+
+Identical bodies are stored once however many URLs returned them.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+def _sharded(directory: str, digest: str, suffix: str = '') -> str:
+    return os.path.join(directory, digest[:2], digest + suffix)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ResponseStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.objects = os.path.join(root, 'objects')
+        self.index = os.path.join(root, 'index')
+
+    @staticmethod
+    def request_key(method: str, url: str) -> str:
+        return hashlib.sha256(f"{method.upper()} {url}".encode()).hexdigest()
+
+    def put(self, method: str, url: str, response: requests.Response):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob = _sharded(self.objects, digest)
+        if not os.path.exists(blob):
+            _write_atomic(blob, body)
+        entry = {
+            'method': method.upper(),
+            'url': url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'body': digest,
+        }
+        _write_atomic(_sharded(self.index, self.request_key(method, url), '.json'), json.dumps(entry).encode())
+
+    def get(self, method: str, url: str) -> Optional[dict]:
+        try:
+            with open(_sharded(self.index, self.request_key(method, url), '.json'), 'rb') as f:
+                entry = json.load(f)
+            with open(_sharded(self.objects, entry['body']), 'rb') as f:
+                entry['content'] = f.read()
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def __iter__(self):
+        """Yield every stored entry (with its body), e.g. to benchmark parsers."""
+        for dirpath, _, filenames in os.walk(self.index):
+            for filename in filenames:
+                with open(os.path.join(dirpath, filename), 'rb') as f:
+                    entry = json.load(f)
+                yield self.get(entry['method'], entry['url'])
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Fetch over the network and save each response to the store."""
+
+    def __init__(self, store: ResponseStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # A 304 says nothing about the body; keep the earlier recording
+        if response.status_code != 304:
+            self.store.put(request.method, request.url, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serve every request from the store; unrecorded URLs fail like a dead network."""
+
+    def __init__(self, store: ResponseStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        entry = self.store.get(request.method, request.url)
+        if entry is None:
+            raise requests.ConnectionError(f"Not recorded: {request.method} {request.url}", request=request)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        # Bodies are stored decoded, so the original encoding header no longer applies
+        response.headers.pop('Content-Encoding', None)
+        response._content = entry['content']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def mount(session: requests.Session, store: ResponseStore, replay: bool = False):
+    adapter = ReplayAdapter(store) if replay else RecordingAdapter(store)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
@@ -0,0 +1,108 @@
+"""
+Per-host robots.txt cache.
+
+Each host's robots.txt is fetched once and kept for ``ttl`` seconds, so
+checking a page costs a dictionary lookup instead of a request. Hosts
+without a robots file (4xx) are cached too, as "everything allowed". If
+the file cannot be fetched at all (network error or 5xx), the host is
+treated as fully disallowed, as RFC 9309 requires, and the fetch is
+retried after ``error_ttl``.
+
+When a host declares a ``Crawl-delay``, ``on_crawl_delay(host, delay)`` is
+called so the scheduler can slow down for that host.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+
+class RobotsUnavailable(Exception):
+    """A host's robots.txt could not be fetched, so nothing on it may be crawled yet."""
+
+
+@dataclass
+class _Entry:
+    parser: Optional[RobotFileParser]  # None: no robots file, or it was unreachable
+    expires: float
+    unreachable: bool = False
+
+
+class RobotsCache:
+    def __init__(self, session: requests.Session, user_agent: str, ttl: float = 86400,
+                 error_ttl: float = 300, on_crawl_delay: Optional[Callable[[str, float], None]] = None,
+                 clock: Callable[[], float] = time.monotonic, unreachable_allows: bool = False):
+        self.session = session
+        # Only for replaying recorded crawls, where no live host can be overloaded
+        self.unreachable_allows = unreachable_allows
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.on_crawl_delay = on_crawl_delay
+        self.clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _entry(self, scheme: str, host: str) -> _Entry:
+        entry = self._entries.get(host)
+        if entry is not None and entry.expires > self.clock():
+            return entry
+        # One fetch per host even when several workers ask at once
+        with self._host_lock(host):
+            entry = self._entries.get(host)
+            if entry is None or entry.expires <= self.clock():
+                entry = self._fetch(scheme, host)
+                self._entries[host] = entry
+            return entry
+
+    def _fetch(self, scheme: str, host: str) -> _Entry:
+        self.fetches += 1
+        robots_url = f"{scheme}://{host}/robots.txt"
+        try:
+            response = self.session.get(robots_url, timeout=10)
+        except requests.RequestException:
+            return _Entry(None, self.clock() + self.error_ttl, unreachable=True)
+        if response.status_code >= 500:
+            return _Entry(None, self.clock() + self.error_ttl, unreachable=True)
+        if response.status_code >= 400:
+            # No robots file: cache the negative result for the full TTL
+            return _Entry(None, self.clock() + self.ttl)
+
+        parser = RobotFileParser(robots_url)
+        parser.parse(response.text.splitlines())
+        delay = parser.crawl_delay(self.user_agent)
+        if delay and self.on_crawl_delay is not None:
+            self.on_crawl_delay(host, float(delay))
+        return _Entry(parser, self.clock() + self.ttl)
+
+    def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets our user agent fetch ``url``."""
+        parts = urlparse(url)
+        entry = self._entry(parts.scheme or 'https', parts.netloc.lower())
+        if entry.unreachable:
+            return self.unreachable_allows
+        return entry.parser is None or entry.parser.can_fetch(self.user_agent, url)
+
+    def unreachable(self, url: str) -> bool:
+        """Whether ``url``'s host is disallowed only because its robots.txt could not be fetched."""
+        parts = urlparse(url)
+        return self._entry(parts.scheme or 'https', parts.netloc.lower()).unreachable and not self.unreachable_allows
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        parts = urlparse(url)
+        entry = self._entry(parts.scheme or 'https', parts.netloc.lower())
+        if entry.parser is None:
+            return None
+        delay = entry.parser.crawl_delay(self.user_agent)
+        return float(delay) if delay else None
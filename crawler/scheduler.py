@@ -0,0 +1,206 @@
+"""
+Per-host politeness scheduling for the crawler.
+
+Work is grouped by host. Each host gets a token bucket (one request per
+``delay`` seconds) and at most ``max_per_host`` requests in flight, while
+different hosts run in parallel on a shared, bounded thread pool. A crawl
+therefore takes about as long as its slowest host instead of the sum of
+all of them.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``capacity`` back-to-back requests, refilled at
+    one token every ``interval`` seconds.
+    """
+
+    def __init__(self, interval: float, capacity: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = self.clock()
+            if self.interval <= 0:
+                return 0.0
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.interval)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            # Negative balance: this caller owns a future token
+            return -self._tokens * self.interval
+
+    def ready_in(self) -> float:
+        """Seconds until a token is available, without taking it."""
+        with self._lock:
+            if self.interval <= 0:
+                return 0.0
+            tokens = min(self.capacity, self._tokens + (self.clock() - self._updated) / self.interval)
+            return max(0.0, (1 - tokens) * self.interval)
+
+    def set_interval(self, interval: float):
+        with self._lock:
+            self.interval = interval
+
+
+@dataclass
+class Task:
+    url: str
+    run: Callable[[], Any]
+    context: Any = None
+
+
+@dataclass
+class TaskResult:
+    task: Task
+    value: Any = None
+    error: Optional[BaseException] = None
+    started: float = 0.0
+    finished: float = 0.0
+
+
+@dataclass
+class _Host:
+    bucket: TokenBucket
+    queue: deque = field(default_factory=deque)
+    in_flight: int = 0
+
+
+class HostScheduler:
+    """
+    Run tasks concurrently across hosts while keeping each host polite.
+
+    ``delay`` is the default spacing between requests to one host; it can
+    be raised per host (e.g. from a robots.txt Crawl-delay) with
+    ``set_delay``.
+
+    Workers are not tied to a host: each takes its next task from whichever
+    host can be sent a request now, and only waits when none can. A worker
+    never sleeps out one host's delay while others have work ready, so
+    more hosts than ``max_workers`` still proceed in parallel.
+    """
+
+    def __init__(self, delay: float, max_per_host: int = 1, max_workers: int = 8,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic):
+        self.delay = delay
+        self.max_per_host = max(1, max_per_host)
+        self.max_workers = max(1, max_workers)
+        self.sleep = sleep
+        self.clock = clock
+        self._hosts: Dict[str, _Host] = {}
+        self._lock = threading.Lock()
+        self._dispatch = threading.Condition()
+
+    def _host(self, host: str) -> _Host:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _Host(bucket=TokenBucket(self.delay, clock=self.clock))
+                self._hosts[host] = state
+            return state
+
+    def set_delay(self, host: str, delay: float):
+        """Use ``delay`` for ``host`` if it is longer than the default."""
+        self._host(host).bucket.set_interval(max(self.delay, delay))
+
+    def wait_turn(self, url: str):
+        """Block until ``url``'s host may receive another request."""
+        wait = self._host(host_of(url)).bucket.reserve()
+        if wait > 0:
+            self.sleep(wait)
+
+    def _next_task(self, hosts: deque) -> Optional[Tuple[_Host, Task]]:
+        """
+        Take a task from a host that may be sent a request now, or return
+        None once every queue is empty. Hosts are tried in turn, so none
+        is starved by a busier one.
+        """
+        while True:
+            with self._dispatch:
+                wait = None
+                for _ in range(len(hosts)):
+                    state = hosts[0]
+                    hosts.rotate(-1)
+                    if not state.queue or state.in_flight >= self.max_per_host:
+                        continue
+                    ready_in = state.bucket.ready_in()
+                    if ready_in <= 0:
+                        state.bucket.reserve()
+                        state.in_flight += 1
+                        return state, state.queue.popleft()
+                    wait = ready_in if wait is None else min(wait, ready_in)
+
+                if not any(state.queue for state in hosts):
+                    return None
+                if wait is None:
+                    # Every host with work is at max_per_host; a finishing task frees a slot
+                    self._dispatch.wait()
+                    continue
+            # No host is ready yet; wait for the earliest bucket without holding a slot
+            self.sleep(wait)
+
+    def _work(self, hosts: deque, on_result: Optional[Callable[[TaskResult], None]]) -> List[TaskResult]:
+        results = []
+        while True:
+            picked = self._next_task(hosts)
+            if picked is None:
+                return results
+            state, task = picked
+            result = TaskResult(task=task, started=self.clock())
+            try:
+                try:
+                    result.value = task.run()
+                except Exception as e:
+                    result.error = e
+                result.finished = self.clock()
+                if on_result is not None:
+                    on_result(result)
+            finally:
+                with self._dispatch:
+                    state.in_flight -= 1
+                    self._dispatch.notify_all()
+            results.append(result)
+
+    def run(self, tasks: Iterable[Task], on_result: Optional[Callable[[TaskResult], None]] = None) -> List[TaskResult]:
+        """
+        Run every task and return their results (in completion order per
+        worker). ``on_result`` is called from worker threads as each finishes.
+        """
+        by_host = defaultdict(list)
+        for task in tasks:
+            by_host[host_of(task.url)].append(task)
+
+        hosts = deque()
+        slots = 0
+        for host, host_tasks in by_host.items():
+            state = self._host(host)
+            state.queue.extend(host_tasks)
+            hosts.append(state)
+            # More workers than requests that may be in flight would only idle
+            slots += min(self.max_per_host, len(host_tasks))
+
+        results: List[TaskResult] = []
+        workers = min(self.max_workers, slots)
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            for future in [pool.submit(self._work, hosts, on_result) for _ in range(workers)]:
+                results.extend(future.result())
+        return results
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+from requests.adapters import BaseAdapter
+
+import crawler
+from crawler import CourseCrawler
+from frontier import DONE, FAILED, IN_PROGRESS, PENDING
+from robots import RobotsUnavailable
+from scheduler import Task, TaskResult
+
+PAGE = '<html><head><meta property="og:title" content="Python 101"></head></html>'
+
+
+class FakeSite(BaseAdapter):
+    """Serve canned pages; robots.txt is missing everywhere."""
+
+    def __init__(self, pages, etag=None):
+        super().__init__()
+        self.pages = pages
+        self.etag = etag
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response._content = b''
+        body = self.pages.get(request.url)
+        if body is None:
+            response.status_code = 404
+        elif self.etag and request.headers.get('If-None-Match') == self.etag:
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response._content = body.encode()
+            response.encoding = 'utf-8'
+            if self.etag:
+                response.headers['ETag'] = self.etag
+        return response
+
+    def close(self):
+        pass
+
+
+class DeadSite(BaseAdapter):
+    def send(self, request, **kwargs):
+        raise requests.ConnectionError('connection refused', request=request)
+
+    def close(self):
+        pass
+
+
+class CourseCrawlerStateTests(unittest.TestCase):
+    url = 'https://courses.example.com/python'
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.output = os.path.join(directory, 'courses.jsonl')
+        with mock.patch.object(crawler, 'CRAWL_STATE_PATH', os.path.join(directory, 'state.sqlite3')):
+            self.crawler = self.make_crawler()
+        self.addCleanup(self.crawler.close)
+
+    def make_crawler(self):
+        instance = CourseCrawler(output=self.output, parse_workers=1)
+        instance.session.mount('https://', FakeSite({self.url: PAGE}))
+        return instance
+
+    def test_page_state_waits_for_its_course_to_be_stored(self):
+        course = {'url': self.url}
+        self.assertEqual(self.crawler.fetch_page(self.url), PAGE)
+        self.assertIsNone(self.crawler.pages.get(self.url))
+
+        # The write was dropped: the page must still look changed
+        self.crawler.record_commit([], [course])
+        self.assertIsNone(self.crawler.pages.get(self.url))
+        self.assertEqual(self.crawler.fetch_page(self.url), PAGE)
+
+        self.crawler.record_commit([course], [])
+        self.assertIsNotNone(self.crawler.pages.get(self.url).content_hash)
+        self.assertIsNone(self.crawler.fetch_page(self.url))
+
+    def test_conditional_fetch_round_trip(self):
+        site = FakeSite({self.url: PAGE}, etag='"v1"')
+        self.crawler.session.mount('https://', site)
+        self.assertEqual(self.crawler.fetch_page(self.url), PAGE)
+        self.crawler.page_done(self.url)
+
+        self.assertIsNone(self.crawler.fetch_page(self.url))
+        self.assertEqual(site.requests[-1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(self.crawler.metrics.counts['not_modified'], 1)
+
+    def test_parse_failure_does_not_save_state(self):
+        self.crawler.fetch_page(self.url)
+        self.crawler.page_failed(self.url, ValueError('bad markup'))
+        self.assertIsNone(self.crawler.pages.get(self.url))
+        self.assertEqual(self.crawler.pending_pages, {})
+
+    def test_frontier_marks_done_only_after_the_write(self):
+        frontier = self.crawler.frontier
+        frontier.add([self.url])
+        frontier.claim_ready()
+        self.crawler.fetch_page(self.url)
+        self.crawler.record_fetch(TaskResult(task=Task(url=self.url, run=None)))
+        # Killed here, with the course still buffered: resume must refetch it
+        self.assertEqual(frontier.counts()[IN_PROGRESS], 1)
+
+        self.crawler.record_commit([], [{'url': self.url}])
+        self.assertEqual(frontier.counts()[PENDING], 1)
+        frontier.clock = lambda: float('inf')
+        frontier.claim_ready()
+        self.crawler.record_commit([{'url': self.url}], [])
+        self.assertEqual(frontier.counts()[DONE], 1)
+
+    def test_parse_failure_parks_the_url(self):
+        self.crawler.frontier.add([self.url])
+        self.crawler.page_failed(self.url, ValueError('bad markup'))
+        self.assertEqual(self.crawler.frontier.counts()[FAILED], 1)
+
+    def test_unreachable_robots_retries_the_page_later(self):
+        self.crawler.session.mount('https://', DeadSite())
+        self.crawler.frontier.add([self.url])
+        self.crawler.frontier.claim_ready()
+
+        with self.assertRaises(RobotsUnavailable):
+            self.crawler.fetch_allowed_page(self.url)
+        self.crawler.record_fetch(TaskResult(task=Task(url=self.url, run=None), error=RobotsUnavailable('down')))
+        self.assertEqual(self.crawler.frontier.counts()[PENDING], 1)
+
+    def test_crawl_writes_and_finishes_every_page(self):
+        empty = 'https://courses.example.com/empty'
+        self.crawler.session.mount('https://', FakeSite({self.url: PAGE, empty: '<html></html>'}))
+        self.crawler.scheduler.delay = 0
+        self.crawler.crawl_urls([self.url, empty], metrics_path=None, progress_interval=0)
+
+        with open(self.output) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(self.crawler.frontier.counts()[DONE], 2)
+        self.assertIsNotNone(self.crawler.pages.get(empty))
+
+
+if __name__ == '__main__':
+    unittest.main()
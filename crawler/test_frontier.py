@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from frontier import DONE, FAILED, IN_PROGRESS, PENDING, Frontier
+
+
+class FrontierTests(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'state.sqlite3')
+        self.now = 1000.0
+        self.frontier = self.open()
+
+    def open(self):
+        frontier = Frontier(self.path, max_attempts=3, backoff_base=10, backoff_max=25, clock=lambda: self.now)
+        self.addCleanup(frontier.close)
+        return frontier
+
+    def test_backoff_grows_and_is_capped(self):
+        for attempts, ceiling in [(1, 10), (2, 20), (3, 25), (10, 25)]:
+            delay = self.frontier.backoff(attempts)
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+
+    def test_failed_urls_wait_for_backoff_then_park(self):
+        url = 'https://a.example/1'
+        self.frontier.add([url])
+        self.assertEqual(self.frontier.claim_ready(), [url])
+
+        self.frontier.mark_failed(url, 'HTTP 503')
+        self.assertEqual(self.frontier.claim_ready(), [])
+        wait = self.frontier.next_wait()
+        self.assertTrue(5 <= wait <= 10)
+
+        self.now += wait
+        self.assertEqual(self.frontier.claim_ready(), [url])
+        self.frontier.mark_failed(url, 'HTTP 503')
+        self.now += 20
+        self.frontier.claim_ready()
+        self.frontier.mark_failed(url, 'HTTP 503')
+        self.assertEqual(self.frontier.counts()[FAILED], 1)
+        self.assertIsNone(self.frontier.next_wait())
+
+    def test_permanent_failure_parks_immediately(self):
+        self.frontier.add(['https://a.example/gone'])
+        self.frontier.mark_failed('https://a.example/gone', 'HTTP 404', permanent=True)
+        self.assertEqual(self.frontier.counts()[FAILED], 1)
+
+    def test_resume_recovers_interrupted_urls(self):
+        urls = [f'https://a.example/{i}' for i in range(3)]
+        self.frontier.add(urls)
+        self.frontier.claim_ready()
+        self.frontier.mark_done(urls[0])
+        self.frontier.close()
+
+        # The crashed run left two URLs in progress
+        resumed = self.open()
+        self.assertEqual(resumed.counts()[IN_PROGRESS], 2)
+        self.assertEqual(resumed.recover(), 2)
+        self.assertEqual(resumed.add(urls + ['https://a.example/new']), 1)
+        self.assertEqual(resumed.counts(), {PENDING: 3, IN_PROGRESS: 0, DONE: 1, FAILED: 0})
+        self.assertEqual(sorted(resumed.claim_ready()), sorted(urls[1:] + ['https://a.example/new']))
+
+    def test_clear_starts_over(self):
+        self.frontier.add(['https://a.example/1'])
+        self.frontier.clear()
+        self.assertEqual(sum(self.frontier.counts().values()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
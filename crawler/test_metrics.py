@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+from metrics import CrawlMetrics, Histogram
+
+
+class HistogramTests(unittest.TestCase):
+    def test_percentiles_use_bucket_bounds_capped_by_max(self):
+        histogram = Histogram()
+        for seconds in [0.004] * 90 + [0.2] * 9 + [12.0]:
+            histogram.observe(seconds)
+        self.assertEqual(histogram.percentile(0.5), 0.005)
+        self.assertEqual(histogram.percentile(0.95), 0.25)
+        self.assertEqual(histogram.percentile(0.99), 0.25)
+        self.assertEqual(histogram.percentile(1.0), 12.0)
+
+    def test_overflow_bucket_reports_the_max(self):
+        histogram = Histogram()
+        histogram.observe(45.0)
+        self.assertEqual(histogram.percentile(0.5), 45.0)
+        self.assertEqual(histogram.to_dict()['buckets']['+Inf'], 1)
+
+    def test_empty(self):
+        self.assertIsNone(Histogram().percentile(0.5))
+        self.assertIsNone(Histogram().to_dict()['mean'])
+
+
+class CrawlMetricsTests(unittest.TestCase):
+    def test_json_summary(self):
+        now = [100.0]
+        metrics = CrawlMetrics(clock=lambda: now[0])
+        metrics.record_fetch('a.example', 0.2, 200, 1000)
+        metrics.record_fetch('a.example', 0.4, 304, 0)
+        metrics.record_fetch('b.example', 3.0, 503, 10)
+        metrics.count('not_modified', 'a.example')
+        metrics.count('fetch_errors', 'b.example')
+        metrics.observe('parse', 0.01)
+        metrics.record_batch(2, 0.05, failed=1)
+        now[0] = 110.0
+
+        path = os.path.join(tempfile.mkdtemp(), 'metrics.json')
+        metrics.write_json(path)
+        with open(path) as f:
+            summary = json.load(f)
+
+        self.assertEqual(summary['elapsed_seconds'], 10.0)
+        self.assertAlmostEqual(summary['pages_per_second'], 0.3)
+        self.assertEqual(summary['bytes'], 1010)
+        self.assertEqual(summary['rows_written'], 2)
+        self.assertEqual(summary['counts'], {'fetches': 3, 'not_modified': 1, 'fetch_errors': 1, 'write_errors': 1})
+        self.assertEqual(summary['stages']['fetch']['count'], 3)
+        self.assertEqual(summary['stages']['write_batch']['count'], 1)
+        self.assertEqual(list(summary['hosts']), ['a.example', 'b.example'])
+        self.assertEqual(summary['hosts']['a.example']['statuses'], {'200': 1, '304': 1})
+        self.assertEqual(summary['hosts']['a.example']['fetch_latency']['p95'], 0.4)
+        self.assertEqual(summary['hosts']['b.example']['counts'], {'fetch_errors': 1})
+
+        line = metrics.progress_line()
+        self.assertIn('3 fetched', line)
+        self.assertIn('written 2', line)
+        self.assertIn('errors 2', line)
+
+
+if __name__ == '__main__':
+    unittest.main()
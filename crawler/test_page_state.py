@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+
+from page_state import PageState, PageStateStore, content_hash
+
+
+class PageStateStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'state.sqlite3')
+
+    def test_round_trip_survives_reopening(self):
+        store = PageStateStore(self.path)
+        self.assertIsNone(store.get('https://a.example/1'))
+        store.save(PageState('https://a.example/1', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT',
+                             content_hash=content_hash(b'<html>')))
+        store.close()
+
+        store = PageStateStore(self.path)
+        state = store.get('https://a.example/1')
+        self.assertEqual(state.conditional_headers(), {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+        })
+        self.assertEqual(state.content_hash, content_hash(b'<html>'))
+        self.assertGreater(state.fetched_at, 0)
+
+        state.etag = None
+        store.save(state)
+        self.assertEqual(store.get('https://a.example/1').conditional_headers(),
+                         {'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        store.close()
+
+    def test_no_validators_means_no_conditional_headers(self):
+        self.assertEqual(PageState('https://a.example/1').conditional_headers(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
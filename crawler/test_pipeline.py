@@ -0,0 +1,51 @@
+import unittest
+
+from metrics import CrawlMetrics
+from pipeline import Pipeline
+from scheduler import HostScheduler
+
+PAGE = '<html><head><title>Course {}</title></head></html>'
+
+
+class ExplodingWriter:
+    """Fails every write after the first ``good`` ones."""
+
+    def __init__(self, good):
+        self.good = good
+        self.courses = []
+        self.flushes = 0
+
+    def add(self, course):
+        if len(self.courses) >= self.good:
+            raise RuntimeError('database went away')
+        self.courses.append(course)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class PipelineTests(unittest.TestCase):
+    def run_pipeline(self, writer, urls, metrics):
+        pipeline = Pipeline(HostScheduler(0, max_per_host=4), writer, parse_workers=1, queue_size=1,
+                            metrics=metrics)
+        pipeline.run(urls, lambda url: PAGE.format(url.rsplit('/', 1)[-1]))
+
+    def test_parses_and_writes_every_page(self):
+        writer = ExplodingWriter(good=100)
+        urls = [f'https://example.com/c/{i}' for i in range(6)]
+        self.run_pipeline(writer, urls, CrawlMetrics())
+        self.assertEqual(sorted(course['url'] for course in writer.courses), sorted(urls))
+        self.assertEqual(writer.flushes, 1)
+
+    def test_write_errors_do_not_stall_the_crawl(self):
+        writer = ExplodingWriter(good=1)
+        metrics = CrawlMetrics()
+        # More pages than the bounded queues and the parse window can hold
+        self.run_pipeline(writer, [f'https://example.com/c/{i}' for i in range(12)], metrics)
+        self.assertEqual(len(writer.courses), 1)
+        self.assertEqual(metrics.counts['write_errors'], 11)
+        self.assertEqual(metrics.hosts['example.com'].counts['write_errors'], 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
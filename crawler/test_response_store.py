@@ -0,0 +1,78 @@
+import gzip
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from response_store import ResponseStore, mount
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/missing':
+            self.send_error(404)
+            return
+        body = gzip.compress(f'<html>{self.path}</html>'.encode())
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ResponseStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.store = ResponseStore(tempfile.mkdtemp())
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f'http://127.0.0.1:{self.server.server_port}'
+        self.addCleanup(self.stop_server)
+
+    def stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def session(self, replay):
+        session = requests.Session()
+        mount(session, self.store, replay=replay)
+        self.addCleanup(session.close)
+        return session
+
+    def test_record_then_replay_without_network(self):
+        recorder = self.session(replay=False)
+        recorded = recorder.get(f'{self.base}/course/1')
+        self.assertEqual(recorder.get(f'{self.base}/missing').status_code, 404)
+        self.stop_server()
+
+        player = self.session(replay=True)
+        replayed = player.get(f'{self.base}/course/1')
+        self.assertEqual(replayed.status_code, 200)
+        self.assertEqual(replayed.text, recorded.text)
+        self.assertEqual(replayed.headers['Content-Type'], 'text/html; charset=utf-8')
+        self.assertNotIn('Content-Encoding', replayed.headers)
+        self.assertEqual(player.get(f'{self.base}/missing').status_code, 404)
+        with self.assertRaises(requests.ConnectionError):
+            player.get(f'{self.base}/never-recorded')
+
+    def test_identical_bodies_are_stored_once(self):
+        body = requests.Response()
+        body.status_code, body.reason, body._content = 200, 'OK', b'<html>same</html>'
+        self.store.put('GET', 'https://a.example/1', body)
+        self.store.put('GET', 'https://a.example/2', body)
+
+        entries = sorted(list(self.store), key=lambda entry: entry['url'])
+        self.assertEqual([entry['url'] for entry in entries], ['https://a.example/1', 'https://a.example/2'])
+        self.assertEqual(entries[0]['body'], entries[1]['body'])
+        self.assertEqual(entries[0]['content'], b'<html>same</html>')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from types import SimpleNamespace
+
+import requests
+
+from robots import RobotsCache
+
+ROBOTS = """
+User-agent: *
+Crawl-delay: 7
+Disallow: /private/
+"""
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def response(status, text=''):
+    return SimpleNamespace(status_code=status, text=text)
+
+
+class RobotsCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+
+    def cache(self, responses, **kwargs):
+        self.session = FakeSession(responses)
+        return RobotsCache(self.session, 'EduWealthBot', ttl=100, error_ttl=10,
+                           clock=lambda: self.now, **kwargs)
+
+    def test_rules_and_crawl_delay_callback(self):
+        delays = []
+        robots = self.cache({'https://a.example/robots.txt': response(200, ROBOTS)},
+                            on_crawl_delay=lambda host, delay: delays.append((host, delay)))
+        self.assertTrue(robots.allowed('https://a.example/courses/1'))
+        self.assertFalse(robots.allowed('https://a.example/private/x'))
+        self.assertEqual(robots.crawl_delay('https://a.example/'), 7.0)
+        self.assertEqual(delays, [('a.example', 7.0)])
+        self.assertEqual(robots.fetches, 1)
+
+    def test_missing_robots_is_cached_for_the_full_ttl(self):
+        robots = self.cache({'https://a.example/robots.txt': response(404)})
+        for _ in range(3):
+            self.assertTrue(robots.allowed('https://a.example/page'))
+        self.now = 99
+        robots.allowed('https://a.example/page')
+        self.assertEqual(robots.fetches, 1)
+
+        self.now = 100
+        robots.allowed('https://a.example/page')
+        self.assertEqual(robots.fetches, 2)
+
+    def test_unreachable_robots_disallows_and_retries_sooner(self):
+        robots = self.cache({
+            'https://a.example/robots.txt': response(503),
+            'https://b.example/robots.txt': requests.ConnectionError('refused'),
+        })
+        self.assertFalse(robots.allowed('https://a.example/page'))
+        self.assertFalse(robots.allowed('https://b.example/page'))
+        self.assertTrue(robots.unreachable('https://a.example/page'))
+        self.now = 9
+        robots.allowed('https://a.example/page')
+        self.assertEqual(robots.fetches, 2)
+
+        self.session.responses['https://a.example/robots.txt'] = response(404)
+        self.now = 10
+        self.assertTrue(robots.allowed('https://a.example/page'))
+        self.assertFalse(robots.unreachable('https://a.example/page'))
+        self.assertEqual(robots.fetches, 3)
+        self.assertIsNone(robots.crawl_delay('https://a.example/page'))
+
+    def test_replay_may_ignore_unreachable_robots(self):
+        robots = self.cache({'https://a.example/robots.txt': requests.ConnectionError('not recorded')},
+                            unreachable_allows=True)
+        self.assertTrue(robots.allowed('https://a.example/page'))
+        self.assertFalse(robots.unreachable('https://a.example/page'))
+
+
+if __name__ == '__main__':
+    unittest.main()
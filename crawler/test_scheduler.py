@@ -0,0 +1,121 @@
+import threading
+import time
+import unittest
+
+from scheduler import HostScheduler, Task, TokenBucket, host_of
+
+
+class FakeClock:
+    """A clock that only moves when someone sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += seconds
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_spaces_requests_by_interval(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2.0, clock=clock)
+        self.assertEqual(bucket.reserve(), 0.0)
+        # Callers queue up behind each other, one interval apart
+        self.assertEqual(bucket.reserve(), 2.0)
+        self.assertEqual(bucket.reserve(), 4.0)
+
+        clock.now = 10.0
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_capacity_allows_bursts(self):
+        bucket = TokenBucket(1.0, capacity=3, clock=FakeClock())
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.0, 1.0])
+
+    def test_zero_interval_never_waits(self):
+        bucket = TokenBucket(0, clock=FakeClock())
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0] * 3)
+
+
+class HostSchedulerTests(unittest.TestCase):
+    def test_host_of(self):
+        self.assertEqual(host_of('https://WWW.Udemy.com:443/course/x'), 'www.udemy.com:443')
+
+    def test_requests_to_one_host_are_spaced(self):
+        clock = FakeClock()
+        scheduler = HostScheduler(2.0, sleep=clock.sleep, clock=clock)
+        started = []
+        tasks = [Task(url=f'https://a.example/{i}', run=lambda: started.append(clock())) for i in range(3)]
+
+        results = scheduler.run(tasks)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(started, [0.0, 2.0, 4.0])
+
+    def test_hosts_do_not_wait_for_each_other(self):
+        waits = []
+        scheduler = HostScheduler(5.0, sleep=waits.append, clock=lambda: 0.0)
+        tasks = [Task(url=f'https://{host}.example/', run=lambda: None) for host in 'abc']
+        scheduler.run(tasks)
+        self.assertEqual(waits, [])
+
+    def test_workers_move_on_to_ready_hosts(self):
+        clock = FakeClock()
+        scheduler = HostScheduler(5.0, max_workers=1, sleep=clock.sleep, clock=clock)
+        started = {}
+
+        def task(url):
+            return Task(url=url, run=lambda: started.setdefault(url, clock()))
+
+        scheduler.run([task(f'https://{host}.example/{i}') for host in 'ab' for i in range(2)])
+        # One worker, two hosts: b doesn't wait behind a's delay
+        self.assertEqual(started, {
+            'https://a.example/0': 0.0, 'https://b.example/0': 0.0,
+            'https://a.example/1': 5.0, 'https://b.example/1': 5.0,
+        })
+
+    def test_per_host_limit_holds_across_workers(self):
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def fetch():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+        scheduler = HostScheduler(0, max_per_host=2, max_workers=8)
+        results = scheduler.run([Task(url=f'https://a.example/{i}', run=fetch) for i in range(6)])
+        self.assertEqual(len(results), 6)
+        self.assertEqual(peak[0], 2)
+
+    def test_set_delay_only_slows_a_host_down(self):
+        clock = FakeClock()
+        scheduler = HostScheduler(2.0, sleep=clock.sleep, clock=clock)
+        scheduler.set_delay('slow.example', 10.0)
+        scheduler.set_delay('fast.example', 0.5)
+
+        scheduler.wait_turn('https://slow.example/1')
+        scheduler.wait_turn('https://slow.example/2')
+        self.assertEqual(clock(), 10.0)
+        scheduler.wait_turn('https://fast.example/1')
+        scheduler.wait_turn('https://fast.example/2')
+        self.assertEqual(clock(), 12.0)
+
+    def test_errors_are_returned_not_raised(self):
+        def fail():
+            raise RuntimeError('boom')
+
+        reported = []
+        results = HostScheduler(0).run([Task(url='https://a.example/', run=fail)], on_result=reported.append)
+        self.assertIsInstance(results[0].error, RuntimeError)
+        self.assertEqual(reported, results)
+
+
+if __name__ == '__main__':
+    unittest.main()
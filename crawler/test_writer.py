@@ -0,0 +1,136 @@
+import contextlib
+import json
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+import writer
+from metrics import CrawlMetrics
+from writer import BatchWriter, JsonLinesWriter
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return contextlib.nullcontext(object())
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def course(i, **overrides):
+    return {'url': f'https://example.com/c/{i}', 'source_hash': f'hash-{i}', 'title': f'Course {i}', **overrides}
+
+
+class BatchWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.statements = []
+
+        def execute_values(cur, sql, rows, template=None, page_size=100):
+            if any(row.get('title') is None for row in rows):
+                raise ValueError('null value in column "title"')
+            self.statements.append([row['url'] for row in rows])
+
+        patcher = mock.patch.object(writer, 'execute_values', execute_values)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.conn = FakeConnection()
+
+    def test_writes_one_statement_per_batch(self):
+        batch_writer = BatchWriter(self.conn, batch_size=2)
+        for i in range(5):
+            batch_writer.add(course(i))
+        # Only the last copy of a course is upserted
+        batch_writer.add(course(4, title='Course 4, updated'))
+        batch_writer.flush()
+        self.assertEqual([len(rows) for rows in self.statements], [2, 2, 1])
+        self.assertEqual((batch_writer.written, batch_writer.failed, batch_writer.batches), (5, 0, 3))
+        self.assertEqual(self.conn.commits, 3)
+
+    def test_failed_batch_is_retried_row_by_row(self):
+        batch_writer = BatchWriter(self.conn, batch_size=3)
+        for i in range(3):
+            batch_writer.add(course(i, title=None if i == 1 else f'Course {i}'))
+
+        self.assertEqual(self.statements, [[course(0)['url']], [course(2)['url']]])
+        self.assertEqual((batch_writer.written, batch_writer.failed), (2, 1))
+        # The failed batch and the failed row were both rolled back
+        self.assertEqual(self.conn.rollbacks, 2)
+
+    def test_callbacks_count_only_stored_rows(self):
+        metrics = CrawlMetrics()
+        committed = []
+        batch_writer = BatchWriter(self.conn, batch_size=3, on_batch=metrics.record_batch,
+                                   on_commit=lambda written, failed: committed.append((written, failed)))
+        for i in range(3):
+            batch_writer.add(course(i, title=None if i == 1 else f'Course {i}'))
+
+        self.assertEqual(metrics.rows_written, 2)
+        self.assertEqual(metrics.counts['write_errors'], 1)
+        [(written, failed)] = committed
+        self.assertEqual([row['url'] for row in written], [course(0)['url'], course(2)['url']])
+        self.assertEqual([row['url'] for row in failed], [course(1)['url']])
+
+
+class UpsertStatementTests(unittest.TestCase):
+    def test_each_column_is_assigned_once(self):
+        assignments = re.findall(r'(\w+) = ', writer.UPSERT_SQL.split('DO UPDATE SET')[1].split('WHERE')[0])
+        self.assertEqual(len(assignments), len(set(assignments)), assignments)
+        self.assertEqual(set(assignments), {*writer.UPDATED_COLUMNS, 'updated_at'})
+        self.assertLessEqual(set(writer.UPDATED_COLUMNS), set(writer.COLUMNS))
+
+
+@unittest.skipUnless(os.getenv('CRAWLER_TEST_DATABASE_URL'), 'set CRAWLER_TEST_DATABASE_URL to run against Postgres')
+class PostgresUpsertTests(unittest.TestCase):
+    def setUp(self):
+        import psycopg2  # type: ignore
+        self.conn = psycopg2.connect(os.environ['CRAWLER_TEST_DATABASE_URL'])
+        self.addCleanup(self.conn.close)
+        with self.conn.cursor() as cur:
+            # Shadows any real courses table for this session only
+            cur.execute("""
+                CREATE TEMP TABLE courses (
+                    id SERIAL PRIMARY KEY,
+                    title VARCHAR(500) NOT NULL, provider_name VARCHAR(100), provider_slug VARCHAR(100),
+                    url TEXT, price NUMERIC(10, 2), currency VARCHAR(10), rating NUMERIC(3, 2),
+                    duration VARCHAR(100), categories JSONB, thumbnail_url TEXT, description TEXT,
+                    source_hash VARCHAR(64) UNIQUE NOT NULL, updated_at TIMESTAMP DEFAULT NOW()
+                )
+            """)
+        self.conn.commit()
+
+    def test_upsert_inserts_then_updates(self):
+        row = {column: None for column in writer.COLUMNS}
+        row.update(course(1), categories='[]', price=499)
+        batch_writer = BatchWriter(self.conn)
+        batch_writer.add(row)
+        batch_writer.flush()
+        batch_writer.add({**row, 'description': 'New blurb'})
+        batch_writer.flush()
+
+        self.assertEqual((batch_writer.written, batch_writer.failed), (2, 0))
+        with self.conn.cursor() as cur:
+            cur.execute('SELECT COUNT(*), MAX(description) FROM courses')
+            self.assertEqual(cur.fetchone(), (1, 'New blurb'))
+
+
+class JsonLinesWriterTests(unittest.TestCase):
+    def test_appends_one_object_per_line(self):
+        path = os.path.join(tempfile.mkdtemp(), 'courses.jsonl')
+        lines_writer = JsonLinesWriter(path)
+        lines_writer.add(course(1, price=499))
+        lines_writer.close()
+        with open(path) as f:
+            self.assertEqual([json.loads(line)['price'] for line in f], [499])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Batched course writes for the crawler.
+
+BatchWriter buffers parsed courses and flushes them as one multi-row
+upsert per batch inside a single transaction, so a batch costs one round
+trip and one commit instead of one of each per course. If a batch fails,
+its rows are retried one at a time so a single bad row is reported and
+dropped without losing the rest.
+
+Both writers report, through ``on_commit(written, failed)``, which courses
+are durably stored and which were dropped, so callers only record a page
+as crawled once its course can no longer be lost.
+
+JsonLinesWriter writes courses to a file instead, for the backend's
+``ingest_courses`` command to upsert through the Django ORM on whichever
+database the backend runs.
+"""
+
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values  # type: ignore
+
+COLUMNS = (
+    'title', 'provider_name', 'provider_slug', 'url', 'price', 'currency',
+    'rating', 'duration', 'categories', 'thumbnail_url', 'description', 'source_hash',
+)
+
+# Columns refreshed when a crawled course already exists; rows where none
+# of them changed are left alone, so updated_at only moves on real changes
+UPDATED_COLUMNS = ('title', 'description', 'price', 'rating')
+
+UPSERT_SQL = f"""
+    INSERT INTO courses ({', '.join(COLUMNS)})
+    VALUES %s
+    ON CONFLICT (source_hash)
+    DO UPDATE SET
+        {', '.join(f'{column} = EXCLUDED.{column}' for column in UPDATED_COLUMNS)},
+        updated_at = NOW()
+    WHERE ({', '.join(f'courses.{column}' for column in UPDATED_COLUMNS)})
+        IS DISTINCT FROM ({', '.join(f'EXCLUDED.{column}' for column in UPDATED_COLUMNS)})
+"""
+
+ROW_TEMPLATE = '(' + ', '.join(f'%({column})s' for column in COLUMNS) + ')'
+
+
+class BatchWriter:
+    """
+    Buffer courses and upsert them ``batch_size`` at a time.
+
+    Safe to call from several crawler threads; the connection is only
+    used by one flush at a time.
+    """
+
+    def __init__(self, conn, batch_size: int = 500,
+                 on_batch: Optional[Callable[[int, float, int], None]] = None,
+                 on_commit: Optional[Callable[[List[Dict], List[Dict]], None]] = None):
+        self.conn = conn
+        self.on_batch = on_batch
+        self.on_commit = on_commit
+        self.batch_size = max(1, batch_size)
+        self.buffer: List[Dict] = []
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.write_seconds = 0.0
+        self._buffer_lock = threading.Lock()
+        self._conn_lock = threading.Lock()
+
+    def add(self, course: Dict):
+        with self._buffer_lock:
+            self.buffer.append(course)
+            if len(self.buffer) < self.batch_size:
+                return
+            batch, self.buffer = self.buffer, []
+        self._write(batch)
+
+    def flush(self):
+        with self._buffer_lock:
+            batch, self.buffer = self.buffer, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[Dict]):
+        # A multi-row ON CONFLICT cannot touch the same row twice, so keep
+        # only the last copy of each course
+        rows = list({course['source_hash']: course for course in batch}.values())
+        with self._conn_lock:
+            started = time.perf_counter()
+            try:
+                self._upsert(rows)
+                written, failed = rows, []
+            except Exception as e:
+                print(f"⚠️  Batch of {len(rows)} failed ({e}); retrying rows individually")
+                written, failed = self._write_rows_individually(rows)
+            self.written += len(written)
+            self.failed += len(failed)
+            seconds = time.perf_counter() - started
+            self.batches += 1
+            self.write_seconds += seconds
+        if self.on_batch is not None:
+            self.on_batch(len(written), seconds, len(failed))
+        if self.on_commit is not None:
+            self.on_commit(written, failed)
+
+    def _upsert(self, rows: List[Dict]):
+        try:
+            with self.conn.cursor() as cur:
+                execute_values(cur, UPSERT_SQL, rows, template=ROW_TEMPLATE, page_size=len(rows))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def _write_rows_individually(self, rows: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        written, failed = [], []
+        for row in rows:
+            try:
+                self._upsert([row])
+                written.append(row)
+            except Exception as e:
+                failed.append(row)
+                print(f"❌ Error saving course {row.get('url')}: {e}")
+        return written, failed
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.written / self.write_seconds if self.write_seconds else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.written} rows written, {self.failed} failed in {self.batches} batches "
+                f"({self.rows_per_second:.0f} rows/s)")
+
+    def close(self):
+        self.flush()
+
+
+class JsonLinesWriter:
+    """Append courses to a JSON Lines file, one object per line."""
+
+    def __init__(self, path: str, on_batch: Optional[Callable[[int, float, int], None]] = None,
+                 on_commit: Optional[Callable[[List[Dict], List[Dict]], None]] = None):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        self.on_batch = on_batch
+        self.on_commit = on_commit
+        self.written = 0
+        self._unflushed: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, course: Dict):
+        line = json.dumps(course, ensure_ascii=False, default=str)
+        with self._lock:
+            self.file.write(line + '\n')
+            self.written += 1
+            self._unflushed.append(course)
+
+    def flush(self):
+        with self._lock:
+            started = time.perf_counter()
+            self.file.flush()
+            rows, self._unflushed = self._unflushed, []
+        if not rows:
+            return
+        if self.on_batch is not None:
+            self.on_batch(len(rows), time.perf_counter() - started, 0)
+        if self.on_commit is not None:
+            self.on_commit(rows, [])
+
+    def summary(self) -> str:
+        return f"{self.written} courses written to {self.path}"
+
+    def close(self):
+        self.flush()
+        self.file.close()